@@ -6,6 +6,12 @@ from disease_surveillance_dashboard.access_control.api.views import (
     RoleViewSet,
     UserRoleViewSet,
 )
+from disease_surveillance_dashboard.analytics.api.views import CaseCountViewSet
+from disease_surveillance_dashboard.analytics.api.views import EpiCurveViewSet
+from disease_surveillance_dashboard.analytics.api.views import MapAggregateViewSet
+from disease_surveillance_dashboard.cases.api.views import CaseReportViewSet
+from disease_surveillance_dashboard.exports.api.views import ExportJobViewSet
+from disease_surveillance_dashboard.sync.api.views import SyncViewSet
 from disease_surveillance_dashboard.users.api.views import UserViewSet
 
 router = DefaultRouter() if settings.DEBUG else SimpleRouter()
@@ -13,8 +19,14 @@ router = DefaultRouter() if settings.DEBUG else SimpleRouter()
 router.register("users", UserViewSet)
 router.register("access-control/roles", RoleViewSet)
 router.register("access-control/user-roles", UserRoleViewSet)
+router.register("cases", CaseReportViewSet)
+router.register("exports", ExportJobViewSet)
+router.register("analytics/case-counts", CaseCountViewSet, basename="case-count")
+router.register("analytics/epicurve", EpiCurveViewSet, basename="epicurve")
+router.register("analytics/map", MapAggregateViewSet, basename="map-aggregate")
 router.register("diseases", DiseaseViewSet, basename="disease")
 router.register("locations", LocationViewSet, basename="location")
+router.register("sync", SyncViewSet, basename="sync")
 
 app_name = "api"
-urlpatterns = router.urls
\ No newline at end of file
+urlpatterns = router.urls
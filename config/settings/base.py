@@ -4,7 +4,10 @@
 import ssl
 from pathlib import Path
 
+from datetime import timedelta
+
 import environ
+from celery.schedules import crontab
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent.parent
 # disease_surveillance_dashboard/
@@ -47,7 +50,24 @@ LOCALE_PATHS = [str(BASE_DIR / "locale")]
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 DATABASES = {"default": env.db("DATABASE_URL")}
-DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Write requests to the API get a transaction from AtomicWriteMixin
+# (disease_surveillance_dashboard/utils/mixins.py); reads run without one.
+DATABASES["default"]["ATOMIC_REQUESTS"] = False
+# "psycopg" keeps a connection pool in each worker process, "pgbouncer"
+# suits an external transaction-mode pooler, "none" connects per request.
+DATABASE_POOL = env("DJANGO_DATABASE_POOL", default="psycopg")
+if DATABASE_POOL == "psycopg":
+    # https://docs.djangoproject.com/en/dev/ref/databases/#connection-pool
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": env.int("DJANGO_DATABASE_POOL_MIN_SIZE", default=2),
+        "max_size": env.int("DJANGO_DATABASE_POOL_MAX_SIZE", default=16),
+        "timeout": env.int("DJANGO_DATABASE_POOL_TIMEOUT", default=10),
+    }
+elif DATABASE_POOL == "pgbouncer":
+    # https://docs.djangoproject.com/en/dev/ref/databases/#transaction-pooling-server-side-cursors
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+    # Prepared statements do not survive moving between server connections.
+    DATABASES["default"].setdefault("OPTIONS", {})["prepare_threshold"] = None
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -69,6 +89,7 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
     # "django.contrib.humanize", # Handy template tags
     "django.contrib.admin",
+    "django.contrib.postgres",
     "django.forms",
 ]
 THIRD_PARTY_APPS = [
@@ -88,6 +109,10 @@ THIRD_PARTY_APPS = [
 LOCAL_APPS = [
     "disease_surveillance_dashboard.users",
     "disease_surveillance_dashboard.access_control",
+    "disease_surveillance_dashboard.analytics",
+    "disease_surveillance_dashboard.cases",
+    "disease_surveillance_dashboard.exports",
+    "disease_surveillance_dashboard.sync",
     "reference_data",
     
 ]
@@ -302,6 +327,26 @@ CELERY_TASK_TIME_LIMIT = 5 * 60
 CELERY_TASK_SOFT_TIME_LIMIT = 60
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-schedule
+# The database scheduler copies these entries into its periodic tasks on start.
+CELERY_BEAT_SCHEDULE = {
+    "maintain-case-partitions": {
+        "task": "disease_surveillance_dashboard.cases.tasks.maintain_case_partitions",
+        "schedule": crontab(minute=15, hour=2),
+    },
+    "update-case-count-rollups": {
+        "task": "disease_surveillance_dashboard.analytics.tasks.update_case_count_rollups",
+        "schedule": timedelta(seconds=env.int("ANALYTICS_ROLLUP_INTERVAL_SECONDS", default=30)),
+    },
+    "detect-outbreaks": {
+        "task": "disease_surveillance_dashboard.analytics.tasks.detect_outbreaks",
+        "schedule": crontab(minute=0, hour=3),
+    },
+    "compact-sync-changes": {
+        "task": "disease_surveillance_dashboard.sync.tasks.compact_sync_changes",
+        "schedule": crontab(minute=45, hour=3),
+    },
+}
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-send-task-events
 CELERY_WORKER_SEND_TASK_EVENTS = True
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std-setting-task_send_sent_event
@@ -338,6 +383,8 @@ REST_FRAMEWORK = {
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "disease_surveillance_dashboard.utils.pagination.KeysetPagination",
+    "PAGE_SIZE": env.int("DJANGO_API_PAGE_SIZE", default=100),
 }
 
 # django-cors-headers - https://github.com/adamchainz/django-cors-headers#setup
@@ -354,3 +401,34 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Case report partitions (see disease_surveillance_dashboard/cases/partitions.py)
+CASES_PARTITION_MONTHS = env.int("CASES_PARTITION_MONTHS", default=1)
+CASES_PARTITIONS_AHEAD = env.int("CASES_PARTITIONS_AHEAD", default=3)
+# 0 keeps every partition attached.
+CASES_RETENTION_MONTHS = env.int("CASES_RETENTION_MONTHS", default=0)
+CASES_ARCHIVE_SCHEMA = env("CASES_ARCHIVE_SCHEMA", default="case_archive")
+# Rows fetched from the server-side cursor, and encoded, per export chunk.
+CASES_EXPORT_CHUNK_SIZE = env.int("CASES_EXPORT_CHUNK_SIZE", default=2000)
+# Live case counts (see disease_surveillance_dashboard/cases/live.py); an empty
+# URL turns them off.
+CASES_LIVE_REDIS_URL = env("CASES_LIVE_REDIS_URL", default=REDIS_URL)
+CASES_LIVE_INTERVAL = env.float("CASES_LIVE_INTERVAL", default=1.0)
+CASES_LIVE_SEND_TIMEOUT = env.float("CASES_LIVE_SEND_TIMEOUT", default=10.0)
+CASES_LIVE_MAX_SUBSCRIPTIONS = env.int("CASES_LIVE_MAX_SUBSCRIPTIONS", default=200)
+# Columnar exports (see disease_surveillance_dashboard/exports/columnar.py)
+EXPORTS_PARQUET_ROW_GROUP_SIZE = env.int("EXPORTS_PARQUET_ROW_GROUP_SIZE", default=1024 * 1024)
+EXPORTS_TASK_SOFT_TIME_LIMIT = env.int("EXPORTS_TASK_SOFT_TIME_LIMIT", default=15 * 60)
+# Case count rollups (see disease_surveillance_dashboard/analytics/rollups.py)
+ANALYTICS_ROLLUP_BATCH_SIZE = env.int("ANALYTICS_ROLLUP_BATCH_SIZE", default=50000)
+# Longest time a transaction inserting case reports may take to commit.
+ANALYTICS_ROLLUP_SETTLE_SECONDS = env.int("ANALYTICS_ROLLUP_SETTLE_SECONDS", default=30)
+# Outbreak detection (see disease_surveillance_dashboard/analytics/detection.py)
+ANALYTICS_DETECTION_YEARS = env.int("ANALYTICS_DETECTION_YEARS", default=5)
+# Complete weeks evaluated per run; later runs revise alerts for late reports.
+ANALYTICS_DETECTION_WEEKS = env.int("ANALYTICS_DETECTION_WEEKS", default=2)
+# Offline delta sync (see disease_surveillance_dashboard/sync/changes.py)
+SYNC_PAGE_SIZE = env.int("SYNC_PAGE_SIZE", default=1000)
+SYNC_MAX_PAGE_SIZE = env.int("SYNC_MAX_PAGE_SIZE", default=10000)
+# Async read views (see disease_surveillance_dashboard/utils/asyncviews.py)
+# run blocking work on the event loop's thread pool unless this is set.
+ASYNC_VIEWS_THREAD_SENSITIVE = env.bool("ASYNC_VIEWS_THREAD_SENSITIVE", default=False)
@@ -34,5 +34,16 @@ TEMPLATES[0]["OPTIONS"]["debug"] = True  # type: ignore[index]
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#media-url
 MEDIA_URL = "http://media.testserver/"
+# https://docs.djangoproject.com/en/dev/ref/settings/#storages
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Keep async views' queries on the thread holding the test transaction.
+ASYNC_VIEWS_THREAD_SENSITIVE = True
+# No Redis in tests; the live count tests provide their own.
+CASES_LIVE_REDIS_URL = ""
@@ -1,13 +1,148 @@
-async def websocket_application(scope, receive, send):
+"""
+Websocket endpoint for live case counts.
+
+Clients authenticate with their API token (``?token=<key>``) or, from the
+dashboard pages, with their session cookie, and then send JSON messages::
+
+    {"action": "subscribe", "disease": 1, "location": 5}
+    {"action": "unsubscribe", "disease": 1, "location": 5}
+
+Each subscription is acknowledged (or refused with an ``error`` message),
+and new cases then arrive as ``counts`` messages holding, per followed
+channel, the number of new reports by report date. See
+``disease_surveillance_dashboard/cases/live.py``.
+"""
+
+import asyncio
+import json
+import logging
+from importlib import import_module
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import aget_user
+from django.http import parse_cookie
+from rest_framework.authtoken.models import Token
+
+from disease_surveillance_dashboard.cases.live import LiveCounts
+
+logger = logging.getLogger(__name__)
+
+# Close codes: https://www.iana.org/assignments/websocket/websocket.xhtml
+CLOSE_TRY_AGAIN_LATER = 1013
+CLOSE_UNAUTHORIZED = 4401
+ACTIONS = ("subscribe", "unsubscribe")
+
+
+def _headers(scope) -> dict[str, str]:
+    return {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in scope["headers"]
+    }
+
+
+def _same_origin(headers: dict[str, str]) -> bool:
+    # Cookies are sent on cross-site websocket handshakes too.
+    origin = headers.get("origin")
+    if origin is None:
+        return True
+    return (
+        urlsplit(origin).netloc == headers.get("host")
+        or origin in settings.CSRF_TRUSTED_ORIGINS
+    )
+
+
+async def authenticate(scope):
+    """Return the active user a websocket handshake authenticates, or None."""
+    headers = _headers(scope)
+    key = parse_qs(scope["query_string"].decode("latin-1")).get("token")
+    if key:
+        token = await Token.objects.select_related("user").filter(key=key[0]).afirst()
+        user = token.user if token else None
+    elif _same_origin(headers):
+        cookies = parse_cookie(headers.get("cookie", ""))
+        engine = import_module(settings.SESSION_ENGINE)
+        session = engine.SessionStore(cookies.get(settings.SESSION_COOKIE_NAME))
+        user = await aget_user(SimpleNamespace(session=session))
+    else:
+        user = None
+    if user is None or not user.is_authenticated or not user.is_active:
+        return None
+    return user
+
+
+def _channel(message) -> tuple[int, int] | None:
+    ids = (message.get("disease"), message.get("location"))
+    if all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+        return ids
+    return None
+
+
+async def _handle(live: LiveCounts, text: str) -> None:
+    if text == "ping":
+        await live.send_text("pong!")
+        return
+    try:
+        message = json.loads(text)
+    except ValueError:
+        message = None
+    if not isinstance(message, dict) or message.get("action") not in ACTIONS:
+        await live.send_json({"type": "error", "detail": "Unknown message."})
+        return
+    channel = _channel(message)
+    if channel is None:
+        detail = "Expected integer disease and location ids."
+        await live.send_json({"type": "error", "detail": detail})
+        return
+    disease, location = channel
+    reply = {"disease": disease, "location": location}
+    if message["action"] == "unsubscribe":
+        await live.unsubscribe(disease, location)
+        await live.send_json({"type": "unsubscribed", **reply})
+    elif error := await live.subscribe(disease, location):
+        await live.send_json({"type": "error", "detail": error, **reply})
+    else:
+        await live.send_json({"type": "subscribed", **reply})
+
+
+async def _receive(receive, live: LiveCounts) -> None:
     while True:
         event = await receive()
+        if event["type"] == "websocket.disconnect":
+            return
+        if event["type"] == "websocket.receive" and event.get("text") is not None:
+            await _handle(live, event["text"])
 
-        if event["type"] == "websocket.connect":
-            await send({"type": "websocket.accept"})
 
-        if event["type"] == "websocket.disconnect":
-            break
+async def websocket_application(scope, receive, send):
+    event = await receive()
+    if event["type"] != "websocket.connect":
+        return
+    user = await authenticate(scope)
+    if user is None:
+        # Closing before accepting rejects the handshake with a 403.
+        await send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+        return
+    await send({"type": "websocket.accept"})
 
-        if event["type"] == "websocket.receive":
-            if event["text"] == "ping":
-                await send({"type": "websocket.send", "text": "pong!"})
+    live = LiveCounts(user, send)
+    tasks = [
+        asyncio.create_task(live.run()),
+        asyncio.create_task(_receive(receive, live)),
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await live.close()
+    error = done.pop().exception()
+    if isinstance(error, TimeoutError):
+        # The client stopped reading; its updates would only pile up.
+        logger.info("Closing the websocket of user %s: not reading", user.pk)
+        await send({"type": "websocket.close", "code": CLOSE_TRY_AGAIN_LATER})
+    elif error is not None:
+        raise error
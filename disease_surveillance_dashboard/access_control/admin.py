@@ -19,8 +19,10 @@ class RoleAdmin(admin.ModelAdmin):
 class UserRoleAdmin(admin.ModelAdmin):
     """Admin interface for UserRole model."""
 
-    list_display = ["user", "role", "assigned_at"]
+    list_display = ["user", "role", "location", "assigned_at"]
+    list_select_related = ["user", "role", "location"]
     list_filter = ["role"]
+    raw_id_fields = ["location"]
     search_fields = ["user__email", "user__full_name"]
     ordering = ["-assigned_at"]
     readonly_fields = ["assigned_at"]
@@ -0,0 +1,38 @@
+from ..roles import arequest_grants
+from ..roles import scope_q
+from ..roles import scope_token
+
+
+class LocationScopedMixin:
+    """
+    Limit a viewset's rows to the locations the user's roles cover.
+
+    The filter is added to ``get_queryset`` as an indexed id/path-prefix
+    predicate, so out-of-scope rows never leave the database. ``scope_field``
+    is the lookup path to ``Location`` (``""`` for locations themselves).
+    Views building their own querysets call ``get_scope_q`` instead. The
+    scope is folded into read cache keys and ETags; list this mixin before
+    ``ConditionalGetMixin`` and ``CachedReadMixin``.
+    """
+
+    scope_field = "location"
+
+    def get_scope_q(self):
+        """Return the scope filter, or None when the user is not scoped."""
+        return scope_q(self.request, self.scope_field)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        scope = self.get_scope_q()
+        return queryset if scope is None else queryset.filter(scope)
+
+    async def ainitial(self, request, *args, **kwargs):
+        # Load the grants on the loop; the sync scope lookups then reuse them.
+        await super().ainitial(request, *args, **kwargs)
+        await arequest_grants(request)
+
+    def get_read_cache_variant(self, request) -> str:
+        return f"{super().get_read_cache_variant(request)}{scope_token(request)}"
+
+    def get_etag_variant(self, request) -> list[str]:
+        return [*super().get_etag_variant(request), scope_token(request)]
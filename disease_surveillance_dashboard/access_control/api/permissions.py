@@ -0,0 +1,43 @@
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.permissions import BasePermission
+
+from ..roles import has_role
+
+
+class HasRole(BasePermission):
+    """
+    Allow users holding any of the view's ``required_roles``.
+
+    Superusers always pass. Role sets come from :mod:`..roles`, so checking
+    costs no queries once the shared cache is warm and nothing after the
+    first check of a request.
+
+    Usage::
+
+        class OutbreakViewSet(ModelViewSet):
+            permission_classes = [HasRole]
+            required_roles = ["EPIDEMIOLOGIST", "ADMIN"]
+    """
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        if user.is_superuser:
+            return True
+        return has_role(request, *getattr(view, "required_roles", ()))
+
+
+class IsAdminOrReadOnly(BasePermission):
+    """
+    Allow reads to authenticated users and writes to staff only.
+
+    Used where writes grant access, e.g. role assignments: letting users
+    edit them would let them widen their own location scope.
+    """
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        return request.method in SAFE_METHODS or user.is_staff
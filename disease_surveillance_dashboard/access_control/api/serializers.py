@@ -21,5 +21,13 @@ class UserRoleSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = UserRole
-        fields = ["id", "user", "user_email", "role", "role_detail", "assigned_at"]
+        fields = [
+            "id",
+            "user",
+            "user_email",
+            "role",
+            "role_detail",
+            "location",
+            "assigned_at",
+        ]
         read_only_fields = ["assigned_at"]
@@ -1,28 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from disease_surveillance_dashboard.utils.mixins import AtomicWriteMixin
+from disease_surveillance_dashboard.utils.mixins import ConditionalGetMixin
+from disease_surveillance_dashboard.utils.pagination import KeysetPagination
+
+from ..bulk import bulk_assign_roles
+from ..matrix import role_matrix
 from ..models import Role
 from ..models import UserRole
+from .permissions import IsAdminOrReadOnly
 from .serializers import RoleSerializer
 from .serializers import UserRoleSerializer
 
+User = get_user_model()
+
+USER_ROLE_BULK_MAX_PAIRS = 10000
+
+
+class RoleMatrixPagination(KeysetPagination):
+    """Large pages of users, so a directory loads in one or two requests."""
+
+    page_size = 10000
+    max_page_size = 20000
+
+    def get_ordering(self, request, queryset, view):
+        return ("id",)
 
-class RoleViewSet(ModelViewSet):
+
+class RoleViewSet(AtomicWriteMixin, ConditionalGetMixin, ModelViewSet):
     """ViewSet for Role model."""
 
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
+    permission_classes = [IsAdminOrReadOnly]
+    pagination_ordering = "role_name"
     filterset_fields = ["role_name"]
     search_fields = ["role_name", "description"]
 
 
-class UserRoleViewSet(ModelViewSet):
+class UserRoleViewSet(AtomicWriteMixin, ConditionalGetMixin, ModelViewSet):
     """ViewSet for UserRole model with custom endpoint for user roles."""
 
     queryset = UserRole.objects.select_related("user", "role")
     serializer_class = UserRoleSerializer
+    permission_classes = [IsAdminOrReadOnly]
+    etag_models = [UserRole, Role, User]
+    pagination_ordering = ["-assigned_at", "-id"]
     filterset_fields = ["user", "role"]
     search_fields = ["user__email", "user__full_name", "role__role_name"]
 
@@ -54,3 +84,60 @@ class UserRoleViewSet(ModelViewSet):
         )
         serializer = self.get_serializer(user_roles, many=True)
         return Response(serializer.data)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAdminUser])
+    def matrix(self, request):
+        """
+        Return the users x roles matrix, one compact row per user.
+
+        Usage: GET /access-control/user-roles/matrix/?page_size=<n>
+
+        Each row is ``{"id", "email", "full_name", "roles", "locations"}``
+        where ``roles[i]`` is held at ``locations[i]`` (null for unscoped).
+        ``role_names`` maps the role ids to their names. Pages hold up to
+        10,000 users by default and are each built by one aggregate query.
+        """
+        return self._conditional(request, self._matrix)
+
+    def _matrix(self, request):
+        paginator = RoleMatrixPagination()
+        rows = paginator.paginate_queryset(role_matrix(), request, view=self)
+        response = paginator.get_paginated_response(rows)
+        response.data["role_names"] = dict(
+            Role.objects.order_by().values_list("id", "role_name"),
+        )
+        return response
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAdminUser])
+    def bulk(self, request):
+        """
+        Assign and revoke many roles in one request.
+
+        Usage: POST /access-control/user-roles/bulk/ with
+        {"assign": [{"user": 1, "role": 2, "location": 3}, ...],
+        "revoke": [{"user": 4, "role": 2}, ...]}
+
+        Revocations run first; ``location`` defaults to null (unscoped).
+        Existing assignments and missing revocations are counted, not errors.
+        """
+        if not isinstance(request.data, dict):
+            msg = "Expected an object with assign and/or revoke lists."
+            raise ParseError(msg)
+        lists = {}
+        for op in ("assign", "revoke"):
+            pairs = request.data.get(op, [])
+            if not isinstance(pairs, list):
+                msg = f"{op} must be a list."
+                raise ParseError(msg)
+            if len(pairs) > USER_ROLE_BULK_MAX_PAIRS:
+                msg = f"At most {USER_ROLE_BULK_MAX_PAIRS} pairs per list."
+                raise ParseError(msg)
+            lists[op] = pairs
+        try:
+            report = bulk_assign_roles(**lists)
+        except IntegrityError:
+            return Response(
+                {"detail": "Users, roles or locations changed meanwhile; retry."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(report)
@@ -8,3 +8,7 @@ class AccessControlConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "disease_surveillance_dashboard.access_control"
     verbose_name = _("Access Control")
+
+    def ready(self):
+        """Connect signal handlers."""
+        from . import signals  # noqa: F401, PLC0415
@@ -0,0 +1,159 @@
+"""Bulk assignment and revocation of roles."""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db import transaction
+
+from disease_surveillance_dashboard.sync.changes import record_changes
+from disease_surveillance_dashboard.utils.cache import bump_table_version
+from reference_data.models import Location
+
+from .models import Role
+from .models import UserRole
+from .roles import bump_user_roles
+
+User = get_user_model()
+
+# Conflicts with existing assignments (NULL locations included) are skipped.
+ASSIGN_SQL = """
+    WITH inserted AS (
+        INSERT INTO user_roles (user_id, role_id, location_id, assigned_at)
+        SELECT user_id, role_id, location_id, now()
+          FROM unnest(%s::bigint[], %s::bigint[], %s::bigint[])
+               AS assigned (user_id, role_id, location_id)
+        ON CONFLICT DO NOTHING
+        RETURNING id, user_id
+    )
+    SELECT coalesce(array_agg(id), '{}'), coalesce(array_agg(user_id), '{}')
+      FROM inserted
+"""
+REVOKE_SQL = """
+    WITH deleted AS (
+        DELETE FROM user_roles AS assignment
+         USING unnest(%s::bigint[], %s::bigint[], %s::bigint[])
+               AS revoked (user_id, role_id, location_id)
+         WHERE assignment.user_id = revoked.user_id
+           AND assignment.role_id = revoked.role_id
+           AND assignment.location_id IS NOT DISTINCT FROM revoked.location_id
+        RETURNING assignment.id, assignment.user_id
+    )
+    SELECT coalesce(array_agg(id), '{}'), coalesce(array_agg(user_id), '{}')
+      FROM deleted
+"""
+ASSIGN = "assign"
+REVOKE = "revoke"
+
+
+def _pk(value, *, required=True):
+    if value is None and not required:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int):
+        msg = "Incorrect type. Expected pk value."
+        raise ValueError(msg)  # noqa: TRY004
+    return value
+
+
+def clean_assignment(record):
+    """Return ``((user, role, location), errors)`` for one raw pair."""
+    if not isinstance(record, dict):
+        return None, {"non_field_errors": ["Expected an object."]}
+    values, errors = [], {}
+    for field, required in (("user", True), ("role", True), ("location", False)):
+        try:
+            values.append(_pk(record.get(field), required=required))
+        except ValueError as exc:
+            errors[field] = [str(exc)]
+    if errors:
+        return None, errors
+    return tuple(values), None
+
+
+def _missing(triples):
+    """Return the ids among ``triples`` that do not exist, per field."""
+    missing = {}
+    for index, (field, model) in enumerate(
+        (("user", User), ("role", Role), ("location", Location)),
+    ):
+        ids = {triple[index] for triple in triples} - {None}
+        missing[field] = ids - set(
+            model.objects.filter(pk__in=ids).values_list("pk", flat=True),
+        )
+    return missing
+
+
+def _columns(triples):
+    return [list(column) for column in zip(*triples, strict=True)] or [[], [], []]
+
+
+def bulk_assign_roles(assign=(), revoke=(), max_errors=1000):
+    """
+    Revoke then assign lists of ``{"user", "role", "location"}`` pairs.
+
+    Assignments are one ``INSERT ... ON CONFLICT DO NOTHING`` and revocations
+    one ``DELETE ... USING unnest(...)``, whatever the number of pairs; pairs
+    naming missing users, roles or locations are reported by their position,
+    like malformed ones.
+    """
+    report = {
+        "received": 0,
+        "assigned": 0,
+        "unchanged": 0,
+        "revoked": 0,
+        "not_assigned": 0,
+        "error_count": 0,
+        "errors": [],
+    }
+
+    def error(op, index, errors):
+        report["error_count"] += 1
+        if len(report["errors"]) < max_errors:
+            report["errors"].append({"op": op, "index": index, "errors": errors})
+
+    cleaned = {ASSIGN: {}, REVOKE: {}}
+    for op, records in ((ASSIGN, assign), (REVOKE, revoke)):
+        for index, record in enumerate(records):
+            report["received"] += 1
+            values, errors = clean_assignment(record)
+            if errors:
+                error(op, index, errors)
+            else:
+                # Repeated pairs count once.
+                cleaned[op].setdefault(values, index)
+    missing = _missing(cleaned[ASSIGN])
+    for values, index in list(cleaned[ASSIGN].items()):
+        errors = {
+            field: [f'Invalid pk "{pk}" - object does not exist.']
+            for field, pk in zip(("user", "role", "location"), values, strict=True)
+            if pk in missing[field]
+        }
+        if errors:
+            del cleaned[ASSIGN][values]
+            error(ASSIGN, index, errors)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(REVOKE_SQL, _columns(cleaned[REVOKE]))
+        revoked, revoked_users = cursor.fetchone()
+        cursor.execute(ASSIGN_SQL, _columns(cleaned[ASSIGN]))
+        assigned, assigned_users = cursor.fetchone()
+        # Foreign keys are deferred; surface a concurrently deleted row here.
+        connection.check_constraints(table_names=[UserRole._meta.db_table])  # noqa: SLF001
+        report["revoked"], report["assigned"] = len(revoked), len(assigned)
+
+        # Bulk writes skip model signals, so log changes and invalidate
+        # caches by hand.
+        record_changes(
+            UserRole,
+            [*revoked, *assigned],
+            [*revoked_users, *assigned_users],
+        )
+        users = {*revoked_users, *assigned_users}
+
+        def bump():
+            bump_table_version(UserRole)
+            bump_user_roles(*users)
+
+        bump()
+        transaction.on_commit(bump)
+    report["unchanged"] = len(cleaned[ASSIGN]) - report["assigned"]
+    report["not_assigned"] = len(cleaned[REVOKE]) - report["revoked"]
+    return report
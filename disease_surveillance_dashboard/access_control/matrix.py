@@ -0,0 +1,39 @@
+"""Users x roles matrix aggregated in SQL."""
+
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Q
+
+User = get_user_model()
+
+_ORDER = ("user_roles__role_id", "user_roles__location_id")
+_ASSIGNED = Q(user_roles__isnull=False)
+
+
+def role_matrix():
+    """
+    Return one row per user with their assignments as parallel arrays.
+
+    ``roles[i]`` is scoped to ``locations[i]`` (``None`` when unscoped); both
+    arrays are sorted the same way and empty for users without roles. The
+    assignments are folded by ``ARRAY_AGG ... GROUP BY`` the user, so a page
+    of any size is a single query.
+    """
+    return (
+        User.objects.order_by()
+        .values("id", "email", "full_name")
+        .annotate(
+            roles=ArrayAgg(
+                "user_roles__role_id",
+                filter=_ASSIGNED,
+                order_by=_ORDER,
+                default=[],
+            ),
+            locations=ArrayAgg(
+                "user_roles__location_id",
+                filter=_ASSIGNED,
+                order_by=_ORDER,
+                default=[],
+            ),
+        )
+    )
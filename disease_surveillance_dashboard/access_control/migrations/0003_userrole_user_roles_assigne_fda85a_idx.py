@@ -0,0 +1,19 @@
+# Generated by Django 5.2.10 on 2026-10-17 18:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('access_control', '0002_rename_roles_role_n_idx_roles_role_na_cfef50_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userrole',
+            index=models.Index(fields=['assigned_at', 'id'], name='user_roles_assigne_fda85a_idx'),
+        ),
+    ]
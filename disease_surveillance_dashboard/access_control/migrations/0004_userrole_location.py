@@ -0,0 +1,30 @@
+# Generated by Django 5.2.10 on 2026-10-17 19:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('access_control', '0003_userrole_user_roles_assigne_fda85a_idx'),
+        ('reference_data', '0007_location_hierarchy'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='userrole',
+            name='unique_user_role',
+        ),
+        migrations.AddField(
+            model_name='userrole',
+            name='location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='role_assignments', to='reference_data.location', verbose_name='Location'),
+        ),
+        migrations.AddConstraint(
+            model_name='userrole',
+            constraint=models.UniqueConstraint(fields=('user', 'role', 'location'), name='unique_user_role_location', nulls_distinct=False),
+        ),
+    ]
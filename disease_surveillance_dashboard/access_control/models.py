@@ -44,6 +44,16 @@ class UserRole(models.Model):
         related_name="user_assignments",
         verbose_name=_("Role"),
     )
+    # Limits the role to this location and everything under it; unscoped
+    # assignments cover every location.
+    location = models.ForeignKey(
+        "reference_data.Location",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="role_assignments",
+        verbose_name=_("Location"),
+    )
     assigned_at = models.DateTimeField(_("Assigned At"), auto_now_add=True)
 
     class Meta:
@@ -53,15 +63,19 @@ class UserRole(models.Model):
         ordering = ["-assigned_at"]
         constraints = [
             models.UniqueConstraint(
-                fields=["user", "role"],
-                name="unique_user_role",
+                fields=["user", "role", "location"],
+                name="unique_user_role_location",
+                nulls_distinct=False,
             ),
         ]
         indexes = [
             models.Index(fields=["user", "role"]),
             models.Index(fields=["role"]),
+            models.Index(fields=["assigned_at", "id"]),
         ]
 
     def __str__(self) -> str:
         """Return user role assignment as string representation."""
+        if self.location_id:
+            return f"{self.user.email} - {self.role.role_name} ({self.location})"
         return f"{self.user.email} - {self.role.role_name}"
@@ -0,0 +1,196 @@
+"""
+Role lookups for permission checks and location scoping.
+
+A user's grants (role names and location scope) are loaded once per request
+and cached across workers under the user's role-assignment version, so role
+checks cost no queries once the cache is warm. ``UserRole`` writes bump that
+version (signals.py). The roles and locations table versions are part of the
+key too, because the cached names and paths come from those tables.
+"""
+
+import hashlib
+from typing import NamedTuple
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from disease_surveillance_dashboard.utils.cache import aget_versions
+from disease_surveillance_dashboard.utils.cache import bump_version
+from disease_surveillance_dashboard.utils.cache import get_versions
+from disease_surveillance_dashboard.utils.cache import table_version_name
+from reference_data.hierarchy import paths_q
+from reference_data.models import Location
+
+from .models import Role
+from .models import UserRole
+
+ROLE_CACHE_TIMEOUT = 24 * 60 * 60
+UNSCOPED = "all"
+
+
+class Grants(NamedTuple):
+    """What a user's role assignments allow."""
+
+    roles: frozenset[str]
+    # (id, path) of the locations the roles are limited to, or None when
+    # nothing limits them: some assignment is unscoped. Users without
+    # assignments have an empty scope and see no locations.
+    scope: tuple[tuple[int, str], ...] | None
+
+
+NO_GRANTS = Grants(frozenset(), ())
+
+
+def user_roles_version_name(user_id: int) -> str:
+    """Return the version namespace of ``user_id``'s role assignments."""
+    return f"user-roles:{user_id}"
+
+
+def bump_user_roles(*user_ids: int) -> None:
+    """Invalidate the cached grants of ``user_ids``."""
+    if user_ids:
+        bump_version(*(user_roles_version_name(user_id) for user_id in user_ids))
+
+
+def _grant_rows(user_id: int):
+    return UserRole.objects.filter(user_id=user_id).values_list(
+        "role__role_name",
+        "location_id",
+        "location__path",
+    )
+
+
+def _grants_from_rows(rows) -> Grants:
+    roles = frozenset(role for role, _, _ in rows)
+    if any(location is None for _, location, _ in rows):
+        return Grants(roles, None)
+    scope = {(location, path) for _, location, path in rows}
+    return Grants(roles, tuple(sorted(scope)))
+
+
+def _query_grants(user_id: int) -> Grants:
+    return _grants_from_rows(list(_grant_rows(user_id)))
+
+
+def _grants_version_names(user_id: int) -> list[str]:
+    return [
+        user_roles_version_name(user_id),
+        table_version_name(Role),
+        table_version_name(Location),
+    ]
+
+
+def _grants_key(user_id: int, names: list[str], versions: dict[str, str]) -> str:
+    return "grants:{}:{}".format(
+        user_id,
+        ":".join(versions[name] for name in names),
+    )
+
+
+def load_grants(user_id: int) -> Grants:
+    """Return the grants of ``user_id``, from the shared cache if current."""
+    names = _grants_version_names(user_id)
+    key = _grants_key(user_id, names, get_versions(names))
+    grants = cache.get(key)
+    if grants is None:
+        grants = _query_grants(user_id)
+        cache.set(key, grants, timeout=ROLE_CACHE_TIMEOUT)
+    return grants
+
+
+async def aload_grants(user_id: int) -> Grants:
+    """Async :func:`load_grants`, querying through the async ORM on a miss."""
+    names = _grants_version_names(user_id)
+    key = _grants_key(user_id, names, await aget_versions(names))
+    grants = await cache.aget(key)
+    if grants is None:
+        grants = _grants_from_rows([row async for row in _grant_rows(user_id)])
+        await cache.aset(key, grants, timeout=ROLE_CACHE_TIMEOUT)
+    return grants
+
+
+def load_role_names(user_id: int) -> frozenset[str]:
+    """Return the role names of ``user_id``."""
+    return load_grants(user_id).roles
+
+
+def request_grants(request) -> Grants:
+    """
+    Return the grants of the requesting user.
+
+    The result is kept on the underlying ``HttpRequest``, so later checks in
+    the same request, whether from DRF or plain Django code, are free.
+    Superusers are never scoped.
+    """
+    http_request = getattr(request, "_request", request)
+    grants = getattr(http_request, "_grants", None)
+    if grants is None:
+        user = request.user
+        if not user.is_authenticated:
+            grants = NO_GRANTS
+        else:
+            grants = _user_grants(user, load_grants(user.pk))
+        http_request._grants = grants  # noqa: SLF001
+    return grants
+
+
+async def arequest_grants(request) -> Grants:
+    """Async :func:`request_grants`; ``request.user`` must be resolved."""
+    http_request = getattr(request, "_request", request)
+    grants = getattr(http_request, "_grants", None)
+    if grants is None:
+        user = request.user
+        if not user.is_authenticated:
+            grants = NO_GRANTS
+        else:
+            grants = _user_grants(user, await aload_grants(user.pk))
+        http_request._grants = grants  # noqa: SLF001
+    return grants
+
+
+def _user_grants(user, grants: Grants) -> Grants:
+    # Superusers are never scoped.
+    return grants._replace(scope=None) if user.is_superuser else grants
+
+
+def user_grants(user) -> Grants:
+    """Return the grants of ``user`` outside a request, e.g. in tasks."""
+    return _user_grants(user, load_grants(user.pk))
+
+
+async def auser_grants(user) -> Grants:
+    """Async :func:`user_grants`, e.g. for websocket connections."""
+    return _user_grants(user, await aload_grants(user.pk))
+
+
+def request_role_names(request) -> frozenset[str]:
+    """Return the role names of the requesting user."""
+    return request_grants(request).roles
+
+
+def has_role(request, *role_names: str) -> bool:
+    """Return whether the requesting user holds any of ``role_names``."""
+    return not request_role_names(request).isdisjoint(role_names)
+
+
+def scope_q(request, field: str = "location") -> Q | None:
+    """
+    Return the filter limiting rows to the user's locations, or None.
+
+    ``field`` is the lookup path from the filtered model to ``Location``;
+    pass ``""`` to filter locations themselves. The predicate is an id list
+    plus path prefixes, which the locations indexes answer directly.
+    """
+    scope = request_grants(request).scope
+    if scope is None:
+        return None
+    return paths_q(scope, f"{field}__" if field else "")
+
+
+def scope_token(request) -> str:
+    """Return a cache key part identifying the user's location scope."""
+    scope = request_grants(request).scope
+    if scope is None:
+        return UNSCOPED
+    digest = hashlib.sha256(repr(scope).encode())
+    return digest.hexdigest()[:16]
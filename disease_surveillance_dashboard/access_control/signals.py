@@ -0,0 +1,43 @@
+"""Signal handlers keeping access control cache versions current."""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from disease_surveillance_dashboard.utils.cache import bump_table_version
+
+from .models import Role
+from .models import UserRole
+from .roles import bump_user_roles
+
+User = get_user_model()
+
+
+def _bump(model) -> None:
+    """Bump now and again after commit, see reference_data.signals."""
+    bump_table_version(model)
+    transaction.on_commit(lambda: bump_table_version(model))
+
+
+@receiver([post_save, post_delete], sender=Role)
+@receiver([post_save, post_delete], sender=UserRole)
+def bump_access_control_version(sender, **kwargs):
+    """Invalidate cached role data after a write."""
+    _bump(sender)
+
+
+@receiver([post_save, post_delete], sender=UserRole)
+def bump_user_roles_version(sender, instance, **kwargs):
+    """Invalidate the cached role set of the assignment's user."""
+    bump_user_roles(instance.user_id)
+    transaction.on_commit(lambda: bump_user_roles(instance.user_id))
+
+
+@receiver([post_save, post_delete], sender=User)
+def bump_user_version(sender, update_fields=None, **kwargs):
+    """Invalidate payloads embedding user data, ignoring login bookkeeping."""
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    _bump(sender)
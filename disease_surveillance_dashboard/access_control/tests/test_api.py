@@ -1,11 +1,16 @@
 """Tests for access control API endpoints."""
 
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from reference_data.models import Location
+
 from ..models import Role
 from ..models import UserRole
+from ..roles import load_role_names
 
 User = get_user_model()
 
@@ -31,7 +36,7 @@ class RoleAPITestCase(APITestCase):
         """Test retrieving list of roles."""
         response = self.client.get(self.api_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_role_create(self):
         """Test creating a new role."""
@@ -74,7 +79,7 @@ class UserRoleAPITestCase(APITestCase):
         """Test retrieving list of user roles."""
         response = self.client.get(self.api_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_user_role_create(self):
         """Test creating a new user role assignment."""
@@ -100,4 +105,270 @@ class UserRoleAPITestCase(APITestCase):
         """Test user roles endpoint without user_id parameter."""
         url = f"{self.api_url}user_roles/"
         response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+class TransactionScopeTestCase(APITestCase):
+    """Test cases for running only write requests in transactions."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="writer@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.api_url = "/api/v1/access-control/roles/"
+
+    def _statements(self, method, *args, **kwargs):
+        # Inside the test transaction, request transactions are savepoints.
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(*args, **kwargs)
+        return response, [q["sql"].split()[0] for q in ctx.captured_queries]
+
+    def test_reads_run_outside_transactions(self):
+        """Test that a list request opens no transaction."""
+        response, statements = self._statements("get", self.api_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("SAVEPOINT", statements)
+
+    def test_writes_are_atomic(self):
+        """Test that creates commit and rejected writes roll back."""
+        response, statements = self._statements(
+            "post",
+            self.api_url,
+            {"role_name": "ANALYST"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(statements[0], "SAVEPOINT")
+        self.assertEqual(statements[-2:], ["INSERT", "RELEASE"])
+        response, statements = self._statements(
+            "post",
+            self.api_url,
+            {"role_name": "ANALYST"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(statements[-2:], ["ROLLBACK", "RELEASE"])
+
+
+class ConditionalGetTestCase(APITestCase):
+    """Test cases for ETag / Last-Modified handling on list endpoints."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="poller@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.role = Role.objects.create(role_name="ADMIN")
+        self.api_url = "/api/v1/access-control/roles/"
+
+    def test_unchanged_collection_returns_304(self):
+        """Test that a matching If-None-Match short-circuits the list."""
+        response = self.client.get(self.api_url)
+        etag = response.headers["ETag"]
+        self.assertIn("Last-Modified", response.headers)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.api_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.headers["ETag"], etag)
+        selects = [q for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(selects, [])
+
+    def test_write_changes_etag(self):
+        """Test that saving a role invalidates the previous ETag."""
+        etag = self.client.get(self.api_url).headers["ETag"]
+        self.role.description = "Updated"
+        self.role.save()
+
+        response = self.client.get(self.api_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_user_role_etag_tracks_role_changes(self):
+        """Test that the nested role detail is covered by the ETag."""
+        UserRole.objects.create(user=self.user, role=self.role)
+        url = "/api/v1/access-control/user-roles/"
+        etag = self.client.get(url).headers["ETag"]
+        self.role.role_name = "SUPERVISOR"
+        self.role.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_query_string_changes_etag(self):
+        """Test that different representations get different ETags."""
+        etag = self.client.get(self.api_url).headers["ETag"]
+        other = self.client.get(f"{self.api_url}?format=json").headers["ETag"]
+        self.assertNotEqual(etag, other)
+
+
+class UserRoleBulkAPITestCase(APITestCase):
+    """Test cases for bulk role assignment and revocation."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.admin = User.objects.create_user(
+            email="admin@example.com",
+            password="testpass123",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.officer = User.objects.create(email="officer@example.com")
+        self.verifier = Role.objects.create(role_name="VERIFIER")
+        self.analyst = Role.objects.create(role_name="ANALYST")
+        self.accra = Location.objects.create(district_name="Accra")
+        UserRole.objects.create(user=self.officer, role=self.verifier)
+        self.api_url = "/api/v1/access-control/user-roles/bulk/"
+
+    def test_assign_and_revoke_summary(self):
+        """Test counts for new, existing, repeated and invalid pairs."""
+        officer, analyst = self.officer.id, self.analyst.id
+        load_role_names(officer)
+        data = {
+            "assign": [
+                {"user": officer, "role": analyst},
+                {"user": officer, "role": analyst},
+                {"user": officer, "role": analyst, "location": self.accra.id},
+                {"user": self.admin.id, "role": self.verifier.id},
+                {"user": officer, "role": 999999},
+                {"user": "x", "role": analyst},
+            ],
+            "revoke": [
+                {"user": officer, "role": self.verifier.id},
+                {"user": self.admin.id, "role": analyst},
+            ],
+        }
+        response = self.client.post(self.api_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        summary = {k: v for k, v in response.data.items() if k != "errors"}
+        self.assertEqual(
+            summary,
+            {
+                "received": 8,
+                "assigned": 3,
+                "unchanged": 0,
+                "revoked": 1,
+                "not_assigned": 1,
+                "error_count": 2,
+            },
+        )
+        self.assertEqual(
+            sorted((e["index"], *e["errors"]) for e in response.data["errors"]),
+            [(4, "role"), (5, "user")],
+        )
+        self.assertEqual(load_role_names(officer), {"ANALYST"})
+        self.assertEqual(UserRole.objects.filter(user=self.officer).count(), 2)
+
+    def test_existing_assignments_are_unchanged(self):
+        """Test that re-assigning is idempotent."""
+        data = {"assign": [{"user": self.officer.id, "role": self.verifier.id}]}
+        response = self.client.post(self.api_url, data, format="json")
+        self.assertEqual(response.data["unchanged"], 1)
+        self.assertEqual(UserRole.objects.count(), 1)
+
+    def test_query_count_is_constant(self):
+        """Test that thousands of pairs take a handful of statements."""
+        users = User.objects.bulk_create(
+            User(email=f"user{i}@example.com") for i in range(2000)
+        )
+        data = {
+            "assign": [
+                {"user": user.id, "role": role.id}
+                for user in users
+                for role in (self.verifier, self.analyst)
+            ],
+        }
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.api_url, data, format="json")
+        self.assertEqual(response.data["assigned"], 4000)
+        self.assertLess(len(ctx.captured_queries), 15)
+
+    def test_requires_staff(self):
+        """Test that only staff may bulk assign."""
+        self.client.force_authenticate(user=self.officer)
+        response = self.client.post(self.api_url, {"assign": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_rejects_oversized_lists(self):
+        """Test the per-list pair limit."""
+        data = {"revoke": [{"user": 1, "role": 1}] * 10001}
+        response = self.client.post(self.api_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+
+class UserRoleMatrixAPITestCase(APITestCase):
+    """Test cases for the users x roles matrix."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.admin = User.objects.create_user(
+            email="admin@example.com",
+            password="testpass123",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.officer = User.objects.create(email="officer@example.com")
+        self.verifier = Role.objects.create(role_name="VERIFIER")
+        self.analyst = Role.objects.create(role_name="ANALYST")
+        self.accra = Location.objects.create(district_name="Accra")
+        UserRole.objects.create(user=self.officer, role=self.verifier)
+        UserRole.objects.create(
+            user=self.officer,
+            role=self.analyst,
+            location=self.accra,
+        )
+        self.api_url = "/api/v1/access-control/user-roles/matrix/"
+
+    def test_matrix_rows(self):
+        """Test that each user is one row of parallel role/location arrays."""
+        response = self.client.get(self.api_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = {row["id"]: row for row in response.data["results"]}
+        self.assertEqual(rows[self.admin.id]["roles"], [])
+        self.assertEqual(
+            sorted(
+                zip(
+                    rows[self.officer.id]["roles"],
+                    rows[self.officer.id]["locations"],
+                    strict=True,
+                ),
+            ),
+            sorted([(self.verifier.id, None), (self.analyst.id, self.accra.id)]),
+        )
+        self.assertEqual(
+            response.data["role_names"],
+            {self.verifier.id: "VERIFIER", self.analyst.id: "ANALYST"},
+        )
+
+    def test_matrix_pages_by_user(self):
+        """Test keyset paging over users."""
+        response = self.client.get(self.api_url, {"page_size": 1})
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]],
+            [self.admin.id],
+        )
+        response = self.client.get(response.data["next"])
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]],
+            [self.officer.id],
+        )
+
+    def test_matrix_is_conditional(self):
+        """Test that an unchanged matrix returns 304 and assignments change it."""
+        etag = self.client.get(self.api_url).headers["ETag"]
+        response = self.client.get(self.api_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        UserRole.objects.create(user=self.admin, role=self.analyst)
+        response = self.client.get(self.api_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_requires_staff(self):
+        """Test that only staff may read the matrix."""
+        self.client.force_authenticate(user=self.officer)
+        response = self.client.get(self.api_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
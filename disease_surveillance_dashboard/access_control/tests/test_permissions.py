@@ -0,0 +1,115 @@
+"""Tests for cached role lookups and the HasRole permission."""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+from rest_framework.views import APIView
+
+from ..api.permissions import HasRole
+from ..models import Role
+from ..models import UserRole
+from ..roles import has_role
+from ..roles import load_role_names
+
+User = get_user_model()
+
+
+class VerifierView(APIView):
+    """View checking the role twice, like a view with object permissions."""
+
+    permission_classes = [HasRole]
+    required_roles = ["VERIFIER", "ADMIN"]
+
+    def get(self, request):
+        return Response({"admin": has_role(request, "ADMIN")})
+
+
+class RoleResolverTestCase(TestCase):
+    """Test cases for loading and caching role sets."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create(email="verifier@example.com")
+        self.verifier = Role.objects.create(role_name="VERIFIER")
+        self.admin = Role.objects.create(role_name="ADMIN")
+        UserRole.objects.create(user=self.user, role=self.verifier)
+
+    def test_cached_after_first_load(self):
+        """Test that a warm cache answers without queries."""
+        self.assertEqual(load_role_names(self.user.id), {"VERIFIER"})
+        with self.assertNumQueries(0):
+            self.assertEqual(load_role_names(self.user.id), {"VERIFIER"})
+
+    def test_assignment_writes_invalidate(self):
+        """Test that assigning and revoking roles reach the cache."""
+        load_role_names(self.user.id)
+        assignment = UserRole.objects.create(user=self.user, role=self.admin)
+        self.assertEqual(load_role_names(self.user.id), {"VERIFIER", "ADMIN"})
+        assignment.delete()
+        self.assertEqual(load_role_names(self.user.id), {"VERIFIER"})
+
+    def test_role_rename_invalidates(self):
+        """Test that renaming a role reaches cached role sets."""
+        load_role_names(self.user.id)
+        self.verifier.role_name = "REVIEWER"
+        self.verifier.save()
+        self.assertEqual(load_role_names(self.user.id), {"REVIEWER"})
+
+    def test_other_users_stay_cached(self):
+        """Test that one user's assignments leave other users cached."""
+        other = User.objects.create(email="other@example.com")
+        load_role_names(self.user.id)
+        UserRole.objects.create(user=other, role=self.admin)
+        with self.assertNumQueries(0):
+            load_role_names(self.user.id)
+
+
+class HasRolePermissionTestCase(TestCase):
+    """Test cases for the HasRole permission class."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create(email="verifier@example.com")
+        self.role = Role.objects.create(role_name="VERIFIER")
+
+    def _request(self, user=None):
+        request = self.factory.get("/")
+        if user:
+            force_authenticate(request, user=user)
+        return request
+
+    def _allowed(self, user=None):
+        # Checked directly: a denied view call would mark the test
+        # transaction for rollback under ATOMIC_REQUESTS.
+        view = VerifierView()
+        request = view.initialize_request(self._request(user))
+        return HasRole().has_permission(request, view)
+
+    def _get(self, user):
+        return VerifierView.as_view()(self._request(user))
+
+    def test_requires_role(self):
+        """Test that only holders of a required role get in."""
+        self.assertFalse(self._allowed(self.user))
+        UserRole.objects.create(user=self.user, role=self.role)
+        response = self._get(self.user)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"admin": False})
+
+    def test_anonymous_and_superuser(self):
+        """Test that anonymous users are refused and superusers pass."""
+        self.assertFalse(self._allowed())
+        superuser = User.objects.create(email="root@example.com", is_superuser=True)
+        self.assertTrue(self._allowed(superuser))
+
+    def test_role_checks_cost_no_queries(self):
+        """Test that every check of a request after warm-up is query-free."""
+        UserRole.objects.create(user=self.user, role=self.role)
+        self._get(self.user)
+        with self.assertNumQueries(0):
+            response = self._get(self.user)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
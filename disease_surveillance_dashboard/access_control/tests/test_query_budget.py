@@ -0,0 +1,109 @@
+"""Query budgets of the access control API and admin list views."""
+
+import itertools
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from disease_surveillance_dashboard.utils.testing import assert_constant_queries
+from reference_data.models import Location
+
+from ..models import Role
+from ..models import UserRole
+
+User = get_user_model()
+
+_sequence = itertools.count()
+
+
+def add_assignments(count=5):
+    """Create ``count`` users, roles and scoped assignments between them."""
+    for _ in range(count):
+        n = next(_sequence)
+        UserRole.objects.create(
+            user=User.objects.create(email=f"budget{n}@example.com"),
+            role=Role.objects.create(role_name=f"ROLE_{n}"),
+            location=Location.objects.create(district_name=f"District {n}"),
+        )
+
+
+class AccessControlAPIQueryBudgetTestCase(APITestCase):
+    """Test that API list views run a constant number of queries."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="auditor@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        add_assignments()
+
+    def test_role_list(self):
+        """Test the role list."""
+        assert_constant_queries(
+            lambda: self.client.get("/api/v1/access-control/roles/"),
+            add_assignments,
+            budget=1,
+        )
+
+    def test_user_role_list(self):
+        """Test the assignment list with embedded user and role details."""
+        assert_constant_queries(
+            lambda: self.client.get("/api/v1/access-control/user-roles/"),
+            add_assignments,
+            budget=1,
+        )
+
+    def test_user_roles_action(self):
+        """Test the per-user assignment list."""
+
+        def grow():
+            for role in Role.objects.exclude(user_assignments__user=self.user)[:5]:
+                UserRole.objects.create(user=self.user, role=role)
+
+        url = f"/api/v1/access-control/user-roles/user_roles/?user_id={self.user.id}"
+        assert_constant_queries(lambda: self.client.get(url), grow, budget=1)
+
+    def test_user_role_matrix(self):
+        """Test that the users x roles matrix pages in one aggregate query."""
+        self.user.is_staff = True
+        self.user.save()
+        assert_constant_queries(
+            lambda: self.client.get("/api/v1/access-control/user-roles/matrix/"),
+            add_assignments,
+            budget=2,
+        )
+
+
+class AccessControlAdminQueryBudgetTestCase(TestCase):
+    """Test that admin changelists run a constant number of queries."""
+
+    def setUp(self):
+        """Set up test data."""
+        admin = User.objects.create_superuser(
+            email="admin@example.com",
+            password="testpass123",
+        )
+        self.client.force_login(admin)
+        add_assignments()
+
+    def test_role_changelist(self):
+        """Test the role changelist."""
+        assert_constant_queries(
+            lambda: self.client.get(
+                reverse("admin:access_control_role_changelist"),
+            ),
+            add_assignments,
+        )
+
+    def test_user_role_changelist(self):
+        """Test the assignment changelist, which shows users and locations."""
+        assert_constant_queries(
+            lambda: self.client.get(
+                reverse("admin:access_control_userrole_changelist"),
+            ),
+            add_assignments,
+        )
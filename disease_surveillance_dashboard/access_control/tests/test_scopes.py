@@ -0,0 +1,154 @@
+"""Tests for location-scoped role assignments."""
+
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from disease_surveillance_dashboard.analytics.models import WeeklyCaseCount
+from disease_surveillance_dashboard.analytics.models import WeeklyCaseTotal
+from disease_surveillance_dashboard.cases.models import CaseReport
+from reference_data.models import Disease
+from reference_data.models import Location
+
+from ..models import Role
+from ..models import UserRole
+from ..roles import load_grants
+
+User = get_user_model()
+
+
+class ScopedAssignmentTestCase(TestCase):
+    """Test cases for scoped assignments and the cached grants."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create(email="officer@example.com")
+        self.role = Role.objects.create(role_name="DISTRICT_OFFICER")
+        self.accra = Location.objects.create(district_name="Accra")
+
+    def test_unscoped_assignment_is_unique(self):
+        """Test that NULL locations collide in the natural key."""
+        UserRole.objects.create(user=self.user, role=self.role)
+        with self.assertRaises(IntegrityError):
+            UserRole.objects.create(user=self.user, role=self.role)
+
+    def test_scope_follows_assignments(self):
+        """Test that grants are scoped only while every assignment is."""
+        self.assertIsNone(load_grants(self.user.id).scope)
+        UserRole.objects.create(user=self.user, role=self.role, location=self.accra)
+        self.assertEqual(
+            load_grants(self.user.id).scope,
+            ((self.accra.id, self.accra.path),),
+        )
+        UserRole.objects.create(user=self.user, role=self.role)
+        self.assertIsNone(load_grants(self.user.id).scope)
+
+    def test_scope_follows_location_moves(self):
+        """Test that cached paths are refreshed when the hierarchy changes."""
+        UserRole.objects.create(user=self.user, role=self.role, location=self.accra)
+        load_grants(self.user.id)
+        region = Location.objects.create(
+            district_name="Greater Accra",
+            level=Location.Level.REGION,
+        )
+        self.accra.parent = region
+        self.accra.save()
+        self.assertEqual(
+            load_grants(self.user.id).scope,
+            ((self.accra.id, f"{region.id}/{self.accra.id}/"),),
+        )
+
+
+class ScopedViewsTestCase(APITestCase):
+    """Test cases for scoping case, rollup and location endpoints."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.officer = User.objects.create_user(
+            email="officer@example.com",
+            password="testpass123",
+        )
+        self.analyst = User.objects.create_user(
+            email="analyst@example.com",
+            password="testpass123",
+        )
+        self.cholera = Disease.objects.create(disease_name="Cholera")
+        self.accra = Location.objects.create(district_name="Accra")
+        self.osu = Location.objects.create(district_name="Accra", area_name="Osu")
+        self.tema = Location.objects.create(district_name="Tema")
+        UserRole.objects.create(
+            user=self.officer,
+            role=Role.objects.create(role_name="DISTRICT_OFFICER"),
+            location=self.accra,
+        )
+        week = datetime.date(2024, 3, 4)
+        for location, count in [(self.osu, 2), (self.tema, 5)]:
+            CaseReport.objects.create(
+                disease=self.cholera,
+                location=location,
+                reported_by=self.analyst,
+                report_date=week,
+            )
+            WeeklyCaseCount.objects.create(
+                disease=self.cholera,
+                location=location,
+                week_start=week,
+                count=count,
+            )
+        WeeklyCaseTotal.objects.create(disease=self.cholera, week_start=week, count=7)
+
+    def _get(self, user, url, params=None):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_cases_are_scoped(self):
+        """Test that officers only list cases under their district."""
+        response = self._get(self.officer, "/api/v1/cases/")
+        self.assertEqual(
+            [case["location"] for case in response.data["results"]],
+            [self.osu.id],
+        )
+        response = self._get(self.analyst, "/api/v1/cases/")
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_rollups_are_scoped_and_cached_per_scope(self):
+        """Test that scoped and unscoped users never share cached counts."""
+        url = "/api/v1/analytics/case-counts/"
+        params = {"start": "2024-03-01", "end": "2024-03-31"}
+        response = self._get(self.analyst, url, params)
+        self.assertEqual(response.data, [{"period": "2024-03-04", "count": 7}])
+        etag = response.headers["ETag"]
+        self.client.force_authenticate(user=self.officer)
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{"period": "2024-03-04", "count": 2}])
+
+    def test_locations_are_scoped(self):
+        """Test that officers only see their district's subtree."""
+        response = self._get(self.officer, "/api/v1/locations/")
+        self.assertEqual(
+            {location["id"] for location in response.data["results"]},
+            {self.accra.id, self.osu.id},
+        )
+        response = self._get(
+            self.officer,
+            "/api/v1/locations/autocomplete/",
+            {"q": "tema"},
+        )
+        self.assertEqual(response.data["results"], [])
+
+    def test_map_is_scoped(self):
+        """Test that map aggregates only count the officer's locations."""
+        response = self._get(
+            self.officer,
+            "/api/v1/analytics/map/",
+            {"disease": self.cholera.id, "from": "2024-03-01", "to": "2024-03-31"},
+        )
+        self.assertEqual(response.data["region"], [self.accra.id])
+        self.assertEqual(response.data["count"], [2])
@@ -0,0 +1 @@
+"""Analytics app holding pre-aggregated case counts."""
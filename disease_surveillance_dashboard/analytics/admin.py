@@ -0,0 +1,31 @@
+from django.contrib import admin
+
+from .models import OutbreakAlert
+from .models import RollupState
+
+
+@admin.register(RollupState)
+class RollupStateAdmin(admin.ModelAdmin):
+    """Admin interface for RollupState model."""
+
+    list_display = ["name", "high_water_mark", "updated_at"]
+    readonly_fields = ["updated_at"]
+
+
+@admin.register(OutbreakAlert)
+class OutbreakAlertAdmin(admin.ModelAdmin):
+    """Admin interface for OutbreakAlert model."""
+
+    list_display = [
+        "week_start",
+        "disease",
+        "location",
+        "method",
+        "observed",
+        "expected",
+        "score",
+    ]
+    list_filter = ["method", "week_start"]
+    list_select_related = ["disease", "location"]
+    raw_id_fields = ["disease", "location"]
+    readonly_fields = ["created_at"]
@@ -0,0 +1 @@
+"""API package for analytics app."""
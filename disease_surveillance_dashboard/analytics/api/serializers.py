@@ -0,0 +1,124 @@
+import datetime
+
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from ..epicurve import BINS
+from ..epicurve import MIN_POINTS
+from ..maps import LEVELS
+
+MAX_RANGE_DAYS = 5 * 366
+DEFAULT_RANGE_DAYS = 26 * 7
+MAX_POINTS = 5000
+
+
+def validate_range(attrs, start="start", end="end"):
+    """Default to the last 26 weeks and cap the range at five years."""
+    last = attrs.setdefault(end, timezone.localdate())
+    first = attrs.setdefault(start, last - datetime.timedelta(days=DEFAULT_RANGE_DAYS))
+    if first > last:
+        raise serializers.ValidationError({start: _("Must not be after end.")})
+    if (last - first).days > MAX_RANGE_DAYS:
+        raise serializers.ValidationError(
+            {start: _("The range is limited to five years.")},
+        )
+    return attrs
+
+
+class CaseCountQuerySerializer(serializers.Serializer):
+    """Query parameters of the case count endpoint."""
+
+    interval = serializers.ChoiceField(choices=["day", "week"], default="week")
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    disease = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=100,
+    )
+    location = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=1000,
+    )
+    group_by = serializers.ChoiceField(choices=["none", "disease"], default="none")
+
+    def validate(self, attrs):
+        """Default to the last 26 weeks and cap the range."""
+        return validate_range(attrs)
+
+
+class CaseCountSerializer(serializers.Serializer):
+    """One period of a case count series."""
+
+    period = serializers.DateField()
+    disease = serializers.IntegerField(required=False)
+    count = serializers.IntegerField(source="total")
+
+
+class WindowQuerySerializer(serializers.Serializer):
+    """Date window given as ``from`` and ``to`` query parameters."""
+
+    def get_fields(self):
+        """Add ``from`` and ``to``, which cannot be declared as attributes."""
+        fields = super().get_fields()
+        fields["from"] = serializers.DateField(required=False)
+        fields["to"] = serializers.DateField(required=False)
+        return fields
+
+    def validate(self, attrs):
+        """Default to the last 26 weeks and cap the range."""
+        return validate_range(attrs, start="from", end="to")
+
+
+class EpiCurveQuerySerializer(WindowQuerySerializer):
+    """Query parameters of the epidemic curve endpoint."""
+
+    disease = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=100,
+    )
+    location = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=1000,
+    )
+    bin = serializers.ChoiceField(choices=BINS, default="week")
+    max_points = serializers.IntegerField(
+        required=False,
+        min_value=MIN_POINTS,
+        max_value=MAX_POINTS,
+    )
+
+
+class EpiCurveSerializer(serializers.Serializer):
+    """One disease's epidemic curve as parallel period and count arrays."""
+
+    disease = serializers.IntegerField()
+    period = serializers.ListField(child=serializers.DateField())
+    count = serializers.ListField(child=serializers.IntegerField())
+
+
+class MapQuerySerializer(WindowQuerySerializer):
+    """Query parameters of the map aggregate endpoint."""
+
+    disease = serializers.IntegerField(min_value=1)
+    level = serializers.ChoiceField(choices=LEVELS, default="district")
+
+
+class MapAggregateSerializer(serializers.Serializer):
+    """Per-region counts and rates per 100,000 residents, as parallel arrays."""
+
+    disease = serializers.IntegerField()
+    level = serializers.CharField()
+    start = serializers.DateField()
+    end = serializers.DateField()
+    region = serializers.ListField(child=serializers.IntegerField())
+    name = serializers.ListField(child=serializers.CharField())
+    count = serializers.ListField(child=serializers.IntegerField())
+    population = serializers.ListField(
+        child=serializers.IntegerField(allow_null=True),
+    )
+    rate = serializers.ListField(child=serializers.FloatField(allow_null=True))
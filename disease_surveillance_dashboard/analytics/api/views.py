@@ -0,0 +1,236 @@
+import datetime
+
+from django.db.models import F
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+from rest_framework import mixins
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from disease_surveillance_dashboard.access_control.api.mixins import LocationScopedMixin
+from disease_surveillance_dashboard.utils.asyncviews import AsyncReadMixin
+from disease_surveillance_dashboard.utils.mixins import CachedReadMixin
+from disease_surveillance_dashboard.utils.mixins import ConditionalGetMixin
+from reference_data.hierarchy import subtree_q
+from reference_data.models import Location
+
+from ..cache import awindow_versions
+from ..cache import map_cache
+from ..cache import rollup_cache
+from ..cache import window_version_names
+from ..cache import window_versions
+from ..epicurve import bin_periods
+from ..epicurve import build_series
+from ..maps import map_aggregate
+from ..models import DailyCaseCount
+from ..models import DailyCaseTotal
+from ..models import WeeklyCaseCount
+from ..models import WeeklyCaseTotal
+from .serializers import CaseCountQuerySerializer
+from .serializers import CaseCountSerializer
+from .serializers import EpiCurveQuerySerializer
+from .serializers import EpiCurveSerializer
+from .serializers import MapAggregateSerializer
+from .serializers import MapQuerySerializer
+
+# (per-location model, all-locations model, period field) per interval.
+ROLLUPS = {
+    "day": (DailyCaseCount, DailyCaseTotal, "day"),
+    "week": (WeeklyCaseCount, WeeklyCaseTotal, "week_start"),
+}
+
+
+class CaseCountViewSet(
+    LocationScopedMixin,
+    ConditionalGetMixin,
+    CachedReadMixin,
+    AsyncReadMixin,
+    mixins.ListModelMixin,
+    GenericViewSet,
+):
+    """
+    Case count series read from the daily or weekly rollup tables.
+
+    Usage: GET /api/analytics/case-counts/?interval=week&start=2024-01-01
+    &end=2024-06-30&disease=<id>&location=<id>&group_by=disease
+
+    A location filter covers the location and everything under it.
+    """
+
+    serializer_class = CaseCountSerializer
+    pagination_class = None
+    etag_models = [DailyCaseCount, WeeklyCaseCount, DailyCaseTotal, WeeklyCaseTotal]
+    read_cache = rollup_cache
+
+    def get_queryset(self):
+        """Aggregate the rollup rows matching the query parameters."""
+        query = CaseCountQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        by_location, total, field = ROLLUPS[params["interval"]]
+        scope = self.get_scope_q()
+        # Without a location filter or scope the much smaller totals table
+        # suffices.
+        model = by_location if params.get("location") or scope is not None else total
+        start = params["start"]
+        if params["interval"] == "week":
+            start -= datetime.timedelta(days=start.weekday())
+
+        queryset = model.objects.filter(
+            **{f"{field}__gte": start, f"{field}__lte": params["end"]},
+        )
+        if params.get("disease"):
+            queryset = queryset.filter(disease__in=params["disease"])
+        if params.get("location"):
+            queryset = queryset.filter(
+                location__in=Location.objects.filter(subtree_q(params["location"])),
+            )
+        if scope is not None:
+            queryset = queryset.filter(scope)
+        group = ["disease"] if params["group_by"] == "disease" else []
+        return (
+            queryset.values(*group, period=F(field))
+            .annotate(total=Sum("count"))
+            .order_by("period", *group)
+        )
+
+
+class EpiCurveViewSet(
+    LocationScopedMixin,
+    ConditionalGetMixin,
+    CachedReadMixin,
+    AsyncReadMixin,
+    mixins.ListModelMixin,
+    GenericViewSet,
+):
+    """
+    Epidemic curves binned by day, week or month, one series per disease.
+
+    Usage: GET /api/analytics/epicurve/?disease=<id>&location=<id>
+    &from=2020-01-01&to=2024-12-31&bin=day&max_points=500
+
+    Each series is returned as parallel ``period``/``count`` arrays with
+    empty bins filled in; ``max_points`` downsamples every series with LTTB.
+    Monthly bins are summed from the daily rollups. A location filter covers
+    the location and everything under it.
+    """
+
+    serializer_class = EpiCurveSerializer
+    pagination_class = None
+    etag_models = [DailyCaseCount, WeeklyCaseCount, DailyCaseTotal, WeeklyCaseTotal]
+    read_cache = rollup_cache
+
+    def get_queryset(self):
+        """Build the binned series from the matching rollup rows."""
+        query = EpiCurveQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        bin_size = params["bin"]
+        by_location, total, field = ROLLUPS["week" if bin_size == "week" else "day"]
+        scope = self.get_scope_q()
+        model = by_location if params.get("location") or scope is not None else total
+        periods = bin_periods(params["from"], params["to"], bin_size)
+
+        queryset = model.objects.filter(
+            **{f"{field}__gte": periods[0].item(), f"{field}__lte": params["to"]},
+        )
+        if params.get("disease"):
+            queryset = queryset.filter(disease__in=params["disease"])
+        if params.get("location"):
+            queryset = queryset.filter(
+                location__in=Location.objects.filter(subtree_q(params["location"])),
+            )
+        if scope is not None:
+            queryset = queryset.filter(scope)
+        period = TruncMonth(field) if bin_size == "month" else F(field)
+        rows = (
+            queryset.values("disease", period=period)
+            .annotate(total=Sum("count"))
+            .order_by()
+            .values_list("disease", "period", "total")
+        )
+        return build_series(
+            rows,
+            periods,
+            diseases=params.get("disease", ()),
+            max_points=params.get("max_points"),
+        )
+
+
+class MapAggregateListMixin:
+    """``list`` answering with the single map aggregate object."""
+
+    def list(self, request, *args, **kwargs):
+        params = self.get_query_params()
+        aggregate = map_aggregate(
+            params["disease"],
+            params["from"],
+            params["to"],
+            params["level"],
+            scope=self.get_scope_q(),
+        )
+        serializer = self.get_serializer(
+            {
+                "disease": params["disease"],
+                "level": params["level"],
+                "start": params["from"],
+                "end": params["to"],
+                **aggregate,
+            },
+        )
+        return Response(serializer.data)
+
+
+class MapAggregateViewSet(
+    LocationScopedMixin,
+    ConditionalGetMixin,
+    CachedReadMixin,
+    AsyncReadMixin,
+    MapAggregateListMixin,
+    GenericViewSet,
+):
+    """
+    Case counts and incidence per location at one level for a disease and window.
+
+    Usage: GET /api/analytics/map/?disease=<id>&from=2024-01-01&to=2024-03-31
+    &level=district
+
+    ``level`` is country, region, district or area; regions are location ids
+    with their names alongside.
+
+    Results are cached per query and invalidated only when rollup counts in
+    one of the window's months change, or when locations change.
+    """
+
+    serializer_class = MapAggregateSerializer
+    pagination_class = None
+    read_cache = map_cache
+
+    def get_query_params(self) -> dict:
+        """Return the validated query parameters."""
+        if not hasattr(self, "_query_params"):
+            query = MapQuerySerializer(data=self.request.query_params)
+            query.is_valid(raise_exception=True)
+            self._query_params = query.validated_data
+        return self._query_params
+
+    def get_version_names(self, request) -> list[str]:
+        """Track the window's rollup months and the locations table."""
+        params = self.get_query_params()
+        return [
+            *super().get_version_names(request),
+            *window_version_names(params["from"], params["to"]),
+        ]
+
+    def get_etag_models(self):
+        return [Location]
+
+    def get_read_cache_key(self, request) -> str:
+        params = self.get_query_params()
+        versions = window_versions(params["from"], params["to"])
+        return f"{super().get_read_cache_key(request)}#{versions}"
+
+    async def aget_read_cache_key(self, request) -> str:
+        params = self.get_query_params()
+        versions = await awindow_versions(params["from"], params["to"])
+        return f"{super().get_read_cache_key(request)}#{versions}"
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class AnalyticsConfig(AppConfig):
+    """App configuration for Analytics."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "disease_surveillance_dashboard.analytics"
+    verbose_name = _("Analytics")
@@ -0,0 +1,59 @@
+import datetime
+import hashlib
+
+from disease_surveillance_dashboard.utils.cache import VersionedCache
+from disease_surveillance_dashboard.utils.cache import aget_versions
+from disease_surveillance_dashboard.utils.cache import get_versions
+from disease_surveillance_dashboard.utils.cache import table_version_name
+from reference_data.models import Location
+
+from .models import DailyCaseCount
+
+# Besides the table versions, rollup counts carry one version per month,
+# bumped for the months a batch touched, so results over a date window stay
+# cached while new reports land in other months. A rebuild bumps this one,
+# which every window includes.
+REBUILD_VERSION_NAME = "rollup-rebuild"
+
+# All rollup tables are bumped together (rollups.bump_rollup_versions), so
+# the daily table's version covers results built from any of them.
+rollup_cache = VersionedCache(table_version_name(DailyCaseCount), maxsize=1024)
+
+# Map aggregates also depend on location names and populations; the
+# month versions are part of each key (window_versions).
+map_cache = VersionedCache(table_version_name(Location), maxsize=512)
+
+
+def month_version_name(month: datetime.date) -> str:
+    """Return the version namespace of the rollup counts of ``month``."""
+    return f"rollup-month:{month:%Y-%m}"
+
+
+def window_version_names(start: datetime.date, end: datetime.date) -> list[str]:
+    """Return the version namespaces covering rollups from start to end."""
+    names = [REBUILD_VERSION_NAME]
+    index = start.year * 12 + start.month - 1
+    while index <= end.year * 12 + end.month - 1:
+        names.append(month_version_name(datetime.date(index // 12, index % 12 + 1, 1)))
+        index += 1
+    return names
+
+
+def _digest(names: list[str], versions: dict[str, str]) -> str:
+    digest = hashlib.sha256()
+    for name in names:
+        digest.update(versions[name].encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
+
+
+def window_versions(start: datetime.date, end: datetime.date) -> str:
+    """Return a token that changes whenever rollups from start to end change."""
+    names = window_version_names(start, end)
+    return _digest(names, get_versions(names))
+
+
+async def awindow_versions(start: datetime.date, end: datetime.date) -> str:
+    """Async :func:`window_versions`."""
+    names = window_version_names(start, end)
+    return _digest(names, await aget_versions(names))
@@ -0,0 +1,295 @@
+"""
+Aberration detection over the weekly case count rollups.
+
+Every disease x location series is one row of a counts matrix (series x
+weeks). Each method computes its statistic for all series at once with
+array operations; only the CUSUM recursion and the Farrington seasonal
+baseline step through the weeks, never through the series.
+
+Methods, all on weekly counts:
+
+* EARS C1/C2: standardized excess over the mean of the previous 7 weeks
+  (C2 skips the two most recent weeks); alarm above 3.
+* EARS C3: sum of the last three C2 excesses over 1; alarm above 2.
+* CUSUM: one-sided cumulative sum of C2-standardized counts with
+  reference value k = 0.5; alarm above h = 4.
+* Farrington-style: quasi-Poisson upper bound from the same weeks
+  (+/- 3) of previous years, on the 2/3-power scale, without the trend
+  term and reweighting of the full algorithm; alarm when the count exceeds
+  the bound and the last four weeks hold at least 5 cases.
+"""
+
+import datetime
+from typing import NamedTuple
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutbreakAlert
+
+EARS_WINDOW = 7
+EARS_C1_THRESHOLD = 3.0
+EARS_C2_THRESHOLD = 3.0
+EARS_C3_THRESHOLD = 2.0
+# Keeps a flat or sparse baseline from turning one or two cases into a huge
+# z-score: with the floor, a series averaging under one case a week needs
+# about four to alarm.
+SD_FLOOR = 1.0
+CUSUM_K = 0.5
+CUSUM_H = 4.0
+WEEKS_PER_YEAR = 52
+FARRINGTON_HALF_WINDOW = 3
+FARRINGTON_Z = 2.326  # one-sided 99%
+FARRINGTON_MIN_RECENT = 5
+FARRINGTON_RECENT_WEEKS = 4
+# Series evaluated together; small blocks keep the temporaries in memory
+# that is already mapped and in cache.
+SERIES_BLOCK = 2048
+
+# One row per series, its weeks packed as (week index, count) int4 pairs:
+# far fewer rows to fetch and decode than one per rollup row.
+WEEKLY_SERIES_SQL = """
+    SELECT disease_id,
+           location_id,
+           string_agg(
+               int4send(((week_start - %(start)s::date) / 7)::integer)
+               || int4send(count),
+               ''::bytea
+           )
+      FROM weekly_case_counts
+     WHERE week_start >= %(start)s
+       AND week_start < %(end)s
+     GROUP BY disease_id, location_id
+"""
+_WEEK_COUNT = np.dtype([("week", ">i4"), ("count", ">i4")])
+_FETCH_SIZE = 2000
+
+
+class SeriesMatrix(NamedTuple):
+    """Weekly counts of every disease x location series."""
+
+    diseases: np.ndarray
+    locations: np.ndarray
+    start: datetime.date
+    counts: np.ndarray
+
+    def week_start(self, column: int) -> datetime.date:
+        return self.start + datetime.timedelta(weeks=column)
+
+
+class Detection(NamedTuple):
+    """Statistic, baseline and alarms of one method, all shaped like counts."""
+
+    method: str
+    score: np.ndarray
+    expected: np.ndarray
+    threshold: float
+    alarm: np.ndarray
+
+
+def load_weekly_matrix(start: datetime.date, end: datetime.date) -> SeriesMatrix:
+    """
+    Load weekly rollup counts for weeks in [start, end) into a dense matrix.
+
+    Only series with at least one case in the range appear.
+    """
+    diseases, locations, payloads = [], [], []
+    with connection.cursor() as cursor:
+        cursor.execute(WEEKLY_SERIES_SQL, {"start": start, "end": end})
+        while rows := cursor.fetchmany(_FETCH_SIZE):
+            for disease, location, payload in rows:
+                diseases.append(disease)
+                locations.append(location)
+                payloads.append(payload)
+
+    pairs = np.frombuffer(b"".join(payloads), dtype=_WEEK_COUNT)
+    series = np.repeat(
+        np.arange(len(payloads)),
+        [len(payload) // _WEEK_COUNT.itemsize for payload in payloads],
+    )
+    counts = np.zeros((len(payloads), (end - start).days // 7), dtype=np.int32)
+    counts[series, pairs["week"]] = pairs["count"]
+    return SeriesMatrix(
+        np.array(diseases, dtype=np.int64),
+        np.array(locations, dtype=np.int64),
+        start,
+        counts,
+    )
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum of each ``window`` consecutive columns, aligned on the last one."""
+    padded = np.zeros((values.shape[0], values.shape[1] + 1))
+    np.cumsum(values, axis=1, out=padded[:, 1:])
+    return padded[:, window:] - padded[:, :-window]
+
+
+def baseline(
+    counts: np.ndarray,
+    window: int,
+    lag: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return mean and standard deviation of the ``window`` weeks ending
+    ``lag`` weeks before each week; NaN where the history is too short.
+    """
+    series, weeks = counts.shape
+    mean = np.full((series, weeks), np.nan)
+    sd = np.full((series, weeks), np.nan)
+    first = window + lag - 1
+    if weeks <= first:
+        return mean, sd
+    total = _window_sums(counts, window)[:, : weeks - first]
+    squares = _window_sums(counts * counts, window)[:, : weeks - first]
+    mean[:, first:] = total / window
+    variance = (squares - total * total / window) / (window - 1)
+    sd[:, first:] = np.sqrt(np.clip(variance, 0, None))
+    return mean, sd
+
+
+def _shift(values: np.ndarray, weeks: int) -> np.ndarray:
+    shifted = np.full(values.shape, np.nan)
+    shifted[:, weeks:] = values[:, :-weeks]
+    return shifted
+
+
+def ears(counts: np.ndarray) -> list[Detection]:
+    """EARS C1, C2 and C3 for every series and week."""
+    c1_mean, c1_sd = baseline(counts, EARS_WINDOW, lag=1)
+    c2_mean, c2_sd = baseline(counts, EARS_WINDOW, lag=3)
+    c1 = (counts - c1_mean) / np.maximum(c1_sd, SD_FLOOR)
+    c2 = (counts - c2_mean) / np.maximum(c2_sd, SD_FLOOR)
+    excess = np.clip(c2 - 1, 0, None)
+    c3 = excess + _shift(excess, 1) + _shift(excess, 2)
+    return [
+        Detection("ears_c1", c1, c1_mean, EARS_C1_THRESHOLD, c1 > EARS_C1_THRESHOLD),
+        Detection("ears_c2", c2, c2_mean, EARS_C2_THRESHOLD, c2 > EARS_C2_THRESHOLD),
+        Detection("ears_c3", c3, c2_mean, EARS_C3_THRESHOLD, c3 > EARS_C3_THRESHOLD),
+    ]
+
+
+def cusum(counts: np.ndarray) -> Detection:
+    """One-sided CUSUM of C2-standardized counts."""
+    mean, sd = baseline(counts, EARS_WINDOW, lag=3)
+    z = np.nan_to_num((counts - mean) / np.maximum(sd, SD_FLOOR))
+    score = np.empty_like(z)
+    running = np.zeros(z.shape[0])
+    for week in range(z.shape[1]):
+        running = np.maximum(0.0, running + z[:, week] - CUSUM_K)
+        score[:, week] = running
+    return Detection("cusum", score, mean, CUSUM_H, score > CUSUM_H)
+
+
+def farrington(counts: np.ndarray, years: int) -> Detection:
+    """
+    Farrington-style upper bound from the same season of previous years.
+
+    The score is count / bound, so the alarm threshold is 1.
+    """
+    series, weeks = counts.shape
+    offsets = np.array(
+        [
+            -WEEKS_PER_YEAR * year + shift
+            for year in range(1, years + 1)
+            for shift in range(-FARRINGTON_HALF_WINDOW, FARRINGTON_HALF_WINDOW + 1)
+        ],
+    )
+    expected = np.full((series, weeks), np.nan)
+    bound = np.full((series, weeks), np.nan)
+    minimum = 2 * FARRINGTON_HALF_WINDOW + 1
+    for week in range(weeks):
+        columns = week + offsets
+        columns = columns[columns >= 0]
+        if len(columns) < minimum:
+            continue
+        history = counts[:, columns]
+        mu = history.mean(axis=1)
+        variance = history.var(axis=1, ddof=1)
+        dispersion = np.ones(series)
+        np.divide(variance, mu, out=dispersion, where=mu > 0)
+        dispersion = np.maximum(dispersion, 1.0)
+        spread = np.sqrt(dispersion * np.cbrt(mu) * (1 + 1 / len(columns)))
+        expected[:, week] = mu
+        bound[:, week] = (mu ** (2 / 3) + FARRINGTON_Z * (2 / 3) * spread) ** 1.5
+
+    recent = np.full((series, weeks), np.nan)
+    recent[:, FARRINGTON_RECENT_WEEKS - 1 :] = _window_sums(
+        counts,
+        FARRINGTON_RECENT_WEEKS,
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = counts / bound
+    alarm = (counts > bound) & (recent >= FARRINGTON_MIN_RECENT)
+    return Detection("farrington", score, expected, 1.0, alarm)
+
+
+def detect(counts: np.ndarray, years: int) -> list[Detection]:
+    """Run every method over ``counts``."""
+    counts = np.asarray(counts, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return [*ears(counts), cusum(counts), farrington(counts, years)]
+
+
+def find_alerts(matrix: SeriesMatrix, years: int, weeks: int, min_count: int = 2):
+    """
+    Yield alert field dicts for the last ``weeks`` columns of ``matrix``.
+
+    Weeks with fewer than ``min_count`` cases never alarm.
+    """
+    total = matrix.counts.shape[1]
+    first = max(total - weeks, 0)
+    for block in range(0, len(matrix.counts), SERIES_BLOCK):
+        counts = matrix.counts[block : block + SERIES_BLOCK]
+        recent = counts[:, first:] >= min_count
+        for detection in detect(counts, years):
+            alarm = detection.alarm[:, first:] & recent
+            for row, column in zip(*np.nonzero(alarm), strict=True):
+                week = first + int(column)
+                yield {
+                    "disease_id": int(matrix.diseases[block + row]),
+                    "location_id": int(matrix.locations[block + row]),
+                    "week_start": matrix.week_start(week),
+                    "method": detection.method,
+                    "observed": int(counts[row, week]),
+                    "expected": float(np.nan_to_num(detection.expected[row, week])),
+                    "score": float(min(detection.score[row, week], 1e9)),
+                    "threshold": detection.threshold,
+                }
+
+
+def run_detection(today: datetime.date | None = None) -> dict:
+    """
+    Evaluate the last ``ANALYTICS_DETECTION_WEEKS`` complete weeks.
+
+    The baseline spans ``ANALYTICS_DETECTION_YEARS`` years before them.
+    Alerts of the evaluated weeks are upserted; those that no longer alarm,
+    e.g. after late reports were counted, are removed.
+    """
+    years = settings.ANALYTICS_DETECTION_YEARS
+    evaluated = settings.ANALYTICS_DETECTION_WEEKS
+    today = today or timezone.localdate()
+    end = today - datetime.timedelta(days=today.weekday())
+    weeks = years * WEEKS_PER_YEAR + FARRINGTON_HALF_WINDOW + evaluated
+    matrix = load_weekly_matrix(end - datetime.timedelta(weeks=weeks), end)
+    alerts = [
+        OutbreakAlert(**fields) for fields in find_alerts(matrix, years, evaluated)
+    ]
+    with transaction.atomic():
+        OutbreakAlert.objects.bulk_create(
+            alerts,
+            batch_size=2000,
+            update_conflicts=True,
+            unique_fields=["disease", "location", "week_start", "method"],
+            update_fields=["observed", "expected", "score", "threshold"],
+        )
+        removed, _ = (
+            OutbreakAlert.objects.filter(
+                week_start__gte=end - datetime.timedelta(weeks=evaluated),
+            )
+            .exclude(pk__in=[alert.pk for alert in alerts])
+            .delete()
+        )
+    return {"series": len(matrix.counts), "alerts": len(alerts), "removed": removed}
@@ -0,0 +1,112 @@
+"""
+Epidemic curves: rollup counts binned by day, week or month.
+
+Each series is dense over the requested range (empty bins count 0) and can be
+downsampled to a point budget with Largest-Triangle-Three-Buckets, which
+keeps peaks and troughs that plain striding or averaging would flatten.
+"""
+
+import datetime
+
+import numpy as np
+
+BINS = ("day", "week", "month")
+# LTTB always keeps the first and last points.
+MIN_POINTS = 3
+
+
+def bin_start(day: datetime.date, bin_size: str) -> datetime.date:
+    """Return the first day of the bin containing ``day``."""
+    if bin_size == "week":
+        return day - datetime.timedelta(days=day.weekday())
+    if bin_size == "month":
+        return day.replace(day=1)
+    return day
+
+
+def bin_periods(
+    start: datetime.date,
+    end: datetime.date,
+    bin_size: str,
+) -> np.ndarray:
+    """Return the first days of the bins from ``start``'s through ``end``'s."""
+    first = np.datetime64(bin_start(start, bin_size), "D")
+    last = np.datetime64(bin_start(end, bin_size), "D")
+    if bin_size == "month":
+        step = np.timedelta64(1, "M")
+        first, last = first.astype("datetime64[M]"), last.astype("datetime64[M]")
+        return np.arange(first, last + step, step).astype("datetime64[D]")
+    step = np.timedelta64(7 if bin_size == "week" else 1, "D")
+    return np.arange(first, last + step, step)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """
+    Return the indices of ``points`` samples of (x, y) chosen by LTTB.
+
+    The first and last samples are always kept; each bucket in between
+    contributes the sample forming the largest triangle with the previous
+    pick and the mean of the next bucket.
+    """
+    n = len(x)
+    if points >= n or points < MIN_POINTS:
+        return np.arange(n)
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    # points - 2 buckets over the samples between the first and the last.
+    edges = np.linspace(1, n - 1, points - 1).astype(np.intp)
+    edges = np.append(edges, n)
+    selected = np.empty(points, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(points - 2):
+        low, high = edges[bucket], edges[bucket + 1]
+        following = slice(high, edges[bucket + 2])
+        next_x, next_y = x[following].mean(), y[following].mean()
+        area = np.abs(
+            (x[previous] - next_x) * (y[low:high] - y[previous])
+            - (x[previous] - x[low:high]) * (next_y - y[previous]),
+        )
+        previous = low + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def build_series(
+    rows,
+    periods: np.ndarray,
+    diseases=(),
+    max_points: int | None = None,
+) -> list[dict]:
+    """
+    Turn (disease, period, count) rows into one columnar series per disease.
+
+    ``periods`` are the bin starts of the range. Every disease in
+    ``diseases`` gets a series, even without rows.
+    """
+    rows = list(rows)
+    row_diseases = np.array([row[0] for row in rows], dtype=np.int64)
+    row_periods = np.array([row[1] for row in rows], dtype="datetime64[D]")
+    ids, series_index = np.unique(
+        np.concatenate([np.array(diseases, dtype=np.int64), row_diseases]),
+        return_inverse=True,
+    )
+    counts = np.zeros((len(ids), len(periods)), dtype=np.int64)
+    counts[
+        series_index[len(diseases) :],
+        np.searchsorted(periods, row_periods),
+    ] = [row[2] for row in rows]
+
+    labels = periods.astype(str)
+    x = periods.astype(np.int64)
+    series = []
+    for disease, curve in zip(ids.tolist(), counts, strict=True):
+        keep = lttb(x, curve, max_points) if max_points else slice(None)
+        series.append(
+            {
+                "disease": disease,
+                "period": labels[keep].tolist(),
+                "count": curve[keep].tolist(),
+            },
+        )
+    return series
@@ -0,0 +1,31 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from disease_surveillance_dashboard.analytics.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recount the daily and weekly case count rollups from case reports."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Only recount from this date (YYYY-MM-DD); default is everything.",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            try:
+                since = datetime.date.fromisoformat(options["since"])
+            except ValueError as exc:
+                msg = f"Invalid --since date: {exc}"
+                raise CommandError(msg) from exc
+        result = rebuild_rollups(since)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rollups rebuilt through case report {result['high_water_mark']}.",
+            ),
+        )
@@ -0,0 +1,148 @@
+"""
+Choropleth aggregates: case counts and incidence per location at one level.
+
+A window is summed from the weekly rollups for its whole Monday-Sunday
+weeks and from the daily rollups for the days around them, so long windows
+read a seventh of the rows. Counts roll up the location hierarchy through
+the materialized paths. Only regions with cases are returned.
+"""
+
+import datetime
+from collections import Counter
+
+from django.db.models import Q
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+
+from reference_data.models import Location
+
+from .models import DailyCaseCount
+from .models import WeeklyCaseCount
+
+LEVELS = tuple(Location.Level.values)
+RATE_PER = 100_000
+
+
+def split_window(start: datetime.date, end: datetime.date):
+    """
+    Split [start, end] into whole weeks and the days outside them.
+
+    Returns ``(weeks, days)``: the first and last week starts (or None) and a
+    list of inclusive day ranges.
+    """
+    first_week = start + datetime.timedelta(days=-start.weekday() % 7)
+    last_sunday = end - datetime.timedelta(days=(end.weekday() + 1) % 7)
+    last_week = last_sunday - datetime.timedelta(days=6)
+    if first_week > last_week:
+        return None, [(start, end)]
+    days = []
+    if start < first_week:
+        days.append((start, first_week - datetime.timedelta(days=1)))
+    if last_sunday < end:
+        days.append((last_sunday + datetime.timedelta(days=1), end))
+    return (first_week, last_week), days
+
+
+def window_rollups(disease_id: int, start, end, scope=None) -> list:
+    """
+    Return the weekly and daily rollup querysets covering the window.
+
+    ``scope`` is an optional filter on the rollups, e.g. the user's location
+    scope.
+    """
+    weeks, days = split_window(start, end)
+    parts = []
+    if weeks:
+        parts.append(
+            WeeklyCaseCount.objects.filter(
+                disease_id=disease_id,
+                week_start__range=weeks,
+            ),
+        )
+    if days:
+        in_days = Q()
+        for day_range in days:
+            in_days |= Q(day__range=day_range)
+        parts.append(DailyCaseCount.objects.filter(in_days, disease_id=disease_id))
+    if scope is not None:
+        parts = [queryset.filter(scope) for queryset in parts]
+    return parts
+
+
+def region_counts(disease_id: int, start, end, level: str, scope=None) -> Counter:
+    """
+    Return case counts per location at ``level``.
+
+    Counts of locations below the level roll up to their ancestor at it;
+    counts recorded above the level are left out.
+    """
+    rank = LEVELS.index(level)
+    counts = Counter()
+    below = Counter()
+    paths = {}
+    for queryset in window_rollups(disease_id, start, end, scope):
+        rows = (
+            queryset.values("location", "location__level", "location__path")
+            .annotate(total=Sum("count"))
+            .order_by()
+            .values_list("location", "location__level", "location__path", "total")
+        )
+        for location, location_level, path, total in rows:
+            if location_level == level:
+                counts[location] += total
+            elif LEVELS.index(location_level) > rank:
+                below[location] += total
+                paths[location] = path
+
+    # Ancestors are few, so finding those at the level is one small query.
+    ancestors = {
+        location: [int(part) for part in paths[location].split("/")[:-2]]
+        for location in below
+    }
+    at_level = set(
+        Location.objects.filter(
+            id__in={a for chain in ancestors.values() for a in chain},
+            level=level,
+        ).values_list("id", flat=True),
+    )
+    for location, total in below.items():
+        for ancestor in ancestors[location]:
+            if ancestor in at_level:
+                counts[ancestor] += total
+                break
+    return counts
+
+
+def region_details(regions) -> dict:
+    """
+    Return the name and population of each region.
+
+    A region's own population wins over the sum of its children's.
+    """
+    return {
+        region: (area_name or district_name, total)
+        for region, district_name, area_name, total in Location.objects.filter(
+            id__in=regions,
+        )
+        .values("id", "district_name", "area_name", "population")
+        .annotate(total=Coalesce("population", Sum("children__population")))
+        .order_by()
+        .values_list("id", "district_name", "area_name", "total")
+    }
+
+
+def map_aggregate(disease_id: int, start, end, level: str, scope=None) -> dict:
+    """Return regions with their names, counts, populations and rates as columns."""
+    counts = region_counts(disease_id, start, end, level, scope)
+    regions = sorted(region for region, count in counts.items() if count)
+    details = region_details(regions)
+    columns = {"region": regions, "name": [], "count": [], "population": [], "rate": []}
+    for region in regions:
+        (name, population), count = details[region], counts[region]
+        columns["name"].append(name)
+        columns["count"].append(count)
+        columns["population"].append(population)
+        columns["rate"].append(
+            round(count * RATE_PER / population, 3) if population else None,
+        )
+    return columns
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.10 on 2026-10-17 18:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('reference_data', '0005_name_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Name')),
+                ('high_water_mark', models.BigIntegerField(default=0, help_text='Highest case report id already counted', verbose_name='High Water Mark')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Rollup State',
+                'verbose_name_plural': 'Rollup States',
+                'db_table': 'rollup_state',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyCaseCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Count')),
+                ('day', models.DateField(verbose_name='Day')),
+                ('disease', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reference_data.disease', verbose_name='Disease')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reference_data.location', verbose_name='Location')),
+            ],
+            options={
+                'verbose_name': 'Daily Case Count',
+                'verbose_name_plural': 'Daily Case Counts',
+                'db_table': 'daily_case_counts',
+                'indexes': [models.Index(fields=['disease', 'day'], include=('location', 'count'), name='daily_count_disease_idx'), models.Index(fields=['location', 'day'], include=('disease', 'count'), name='daily_count_location_idx')],
+                'constraints': [models.UniqueConstraint(fields=('disease', 'location', 'day'), name='unique_daily_case_count')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyCaseTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Count')),
+                ('day', models.DateField(verbose_name='Day')),
+                ('disease', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reference_data.disease', verbose_name='Disease')),
+            ],
+            options={
+                'verbose_name': 'Daily Case Total',
+                'verbose_name_plural': 'Daily Case Totals',
+                'db_table': 'daily_case_totals',
+                'constraints': [models.UniqueConstraint(fields=('disease', 'day'), name='unique_daily_case_total')],
+            },
+        ),
+        migrations.CreateModel(
+            name='WeeklyCaseCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Count')),
+                ('week_start', models.DateField(help_text='Monday of the ISO week', verbose_name='Week Start')),
+                ('disease', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reference_data.disease', verbose_name='Disease')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reference_data.location', verbose_name='Location')),
+            ],
+            options={
+                'verbose_name': 'Weekly Case Count',
+                'verbose_name_plural': 'Weekly Case Counts',
+                'db_table': 'weekly_case_counts',
+                'indexes': [models.Index(fields=['disease', 'week_start'], include=('location', 'count'), name='weekly_count_disease_idx'), models.Index(fields=['location', 'week_start'], include=('disease', 'count'), name='weekly_count_location_idx')],
+                'constraints': [models.UniqueConstraint(fields=('disease', 'location', 'week_start'), name='unique_weekly_case_count')],
+            },
+        ),
+        migrations.CreateModel(
+            name='WeeklyCaseTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Count')),
+                ('week_start', models.DateField(help_text='Monday of the ISO week', verbose_name='Week Start')),
+                ('disease', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reference_data.disease', verbose_name='Disease')),
+            ],
+            options={
+                'verbose_name': 'Weekly Case Total',
+                'verbose_name_plural': 'Weekly Case Totals',
+                'db_table': 'weekly_case_totals',
+                'constraints': [models.UniqueConstraint(fields=('disease', 'week_start'), name='unique_weekly_case_total')],
+            },
+        ),
+    ]
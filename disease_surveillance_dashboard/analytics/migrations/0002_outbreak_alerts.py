@@ -0,0 +1,38 @@
+# Generated by Django 5.2.10 on 2026-10-17 19:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('reference_data', '0005_name_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutbreakAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_start', models.DateField(verbose_name='Week Start')),
+                ('method', models.CharField(choices=[('ears_c1', 'EARS C1'), ('ears_c2', 'EARS C2'), ('ears_c3', 'EARS C3'), ('cusum', 'CUSUM'), ('farrington', 'Farrington')], max_length=20, verbose_name='Method')),
+                ('observed', models.PositiveIntegerField(verbose_name='Observed')),
+                ('expected', models.FloatField(verbose_name='Expected')),
+                ('score', models.FloatField(help_text='Detection statistic; an alert has score above threshold', verbose_name='Score')),
+                ('threshold', models.FloatField(verbose_name='Threshold')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('disease', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbreak_alerts', to='reference_data.disease', verbose_name='Disease')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbreak_alerts', to='reference_data.location', verbose_name='Location')),
+            ],
+            options={
+                'verbose_name': 'Outbreak Alert',
+                'verbose_name_plural': 'Outbreak Alerts',
+                'db_table': 'outbreak_alerts',
+                'ordering': ['-week_start', '-id'],
+                'indexes': [models.Index(fields=['week_start', 'id'], name='outbreak_al_week_st_b68ff9_idx')],
+                'constraints': [models.UniqueConstraint(fields=('disease', 'location', 'week_start', 'method'), name='unique_outbreak_alert')],
+            },
+        ),
+    ]
@@ -0,0 +1,231 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class CaseCount(models.Model):
+    """Number of case reports per disease, location and period."""
+
+    disease = models.ForeignKey(
+        "reference_data.Disease",
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Disease"),
+    )
+    location = models.ForeignKey(
+        "reference_data.Location",
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Location"),
+    )
+    count = models.PositiveIntegerField(_("Count"), default=0)
+
+    class Meta:
+        abstract = True
+
+
+class DailyCaseCount(CaseCount):
+    """Case reports per disease and location on each report date."""
+
+    day = models.DateField(_("Day"))
+
+    class Meta:
+        db_table = "daily_case_counts"
+        verbose_name = _("Daily Case Count")
+        verbose_name_plural = _("Daily Case Counts")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["disease", "location", "day"],
+                name="unique_daily_case_count",
+            ),
+        ]
+        # Covering, so aggregates are answered by index-only scans.
+        indexes = [
+            models.Index(
+                fields=["disease", "day"],
+                include=["location", "count"],
+                name="daily_count_disease_idx",
+            ),
+            models.Index(
+                fields=["location", "day"],
+                include=["disease", "count"],
+                name="daily_count_location_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """Return disease, location, day and count as string representation."""
+        return f"{self.disease_id}/{self.location_id} {self.day}: {self.count}"
+
+
+class WeeklyCaseCount(CaseCount):
+    """Case reports per disease and location in each ISO week."""
+
+    week_start = models.DateField(
+        _("Week Start"),
+        help_text=_("Monday of the ISO week"),
+    )
+
+    class Meta:
+        db_table = "weekly_case_counts"
+        verbose_name = _("Weekly Case Count")
+        verbose_name_plural = _("Weekly Case Counts")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["disease", "location", "week_start"],
+                name="unique_weekly_case_count",
+            ),
+        ]
+        # Covering, so aggregates are answered by index-only scans.
+        indexes = [
+            models.Index(
+                fields=["disease", "week_start"],
+                include=["location", "count"],
+                name="weekly_count_disease_idx",
+            ),
+            models.Index(
+                fields=["location", "week_start"],
+                include=["disease", "count"],
+                name="weekly_count_location_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """Return disease, location, week and count as string representation."""
+        return f"{self.disease_id}/{self.location_id} {self.week_start}: {self.count}"
+
+
+class CaseTotal(models.Model):
+    """Number of case reports per disease and period across all locations."""
+
+    disease = models.ForeignKey(
+        "reference_data.Disease",
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Disease"),
+    )
+    count = models.PositiveIntegerField(_("Count"), default=0)
+
+    class Meta:
+        abstract = True
+
+
+class DailyCaseTotal(CaseTotal):
+    """Case reports per disease on each report date, all locations."""
+
+    day = models.DateField(_("Day"))
+
+    class Meta:
+        db_table = "daily_case_totals"
+        verbose_name = _("Daily Case Total")
+        verbose_name_plural = _("Daily Case Totals")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["disease", "day"],
+                name="unique_daily_case_total",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """Return disease, day and count as string representation."""
+        return f"{self.disease_id} {self.day}: {self.count}"
+
+
+class WeeklyCaseTotal(CaseTotal):
+    """Case reports per disease in each ISO week, all locations."""
+
+    week_start = models.DateField(
+        _("Week Start"),
+        help_text=_("Monday of the ISO week"),
+    )
+
+    class Meta:
+        db_table = "weekly_case_totals"
+        verbose_name = _("Weekly Case Total")
+        verbose_name_plural = _("Weekly Case Totals")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["disease", "week_start"],
+                name="unique_weekly_case_total",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """Return disease, week and count as string representation."""
+        return f"{self.disease_id} {self.week_start}: {self.count}"
+
+
+class RollupState(models.Model):
+    """Progress of an incremental rollup through the case reports table."""
+
+    name = models.CharField(_("Name"), max_length=100, unique=True)
+    high_water_mark = models.BigIntegerField(
+        _("High Water Mark"),
+        default=0,
+        help_text=_("Highest case report id already counted"),
+    )
+    updated_at = models.DateTimeField(_("Updated At"), auto_now=True)
+
+    class Meta:
+        db_table = "rollup_state"
+        verbose_name = _("Rollup State")
+        verbose_name_plural = _("Rollup States")
+
+    def __str__(self) -> str:
+        """Return name and high-water mark as string representation."""
+        return f"{self.name} @ {self.high_water_mark}"
+
+
+class OutbreakAlert(models.Model):
+    """A week in which a disease series at a location exceeded its threshold."""
+
+    class Method(models.TextChoices):
+        EARS_C1 = "ears_c1", _("EARS C1")
+        EARS_C2 = "ears_c2", _("EARS C2")
+        EARS_C3 = "ears_c3", _("EARS C3")
+        CUSUM = "cusum", _("CUSUM")
+        FARRINGTON = "farrington", _("Farrington")
+
+    disease = models.ForeignKey(
+        "reference_data.Disease",
+        on_delete=models.CASCADE,
+        related_name="outbreak_alerts",
+        verbose_name=_("Disease"),
+    )
+    location = models.ForeignKey(
+        "reference_data.Location",
+        on_delete=models.CASCADE,
+        related_name="outbreak_alerts",
+        verbose_name=_("Location"),
+    )
+    week_start = models.DateField(_("Week Start"))
+    method = models.CharField(_("Method"), max_length=20, choices=Method.choices)
+    observed = models.PositiveIntegerField(_("Observed"))
+    expected = models.FloatField(_("Expected"))
+    score = models.FloatField(
+        _("Score"),
+        help_text=_("Detection statistic; an alert has score above threshold"),
+    )
+    threshold = models.FloatField(_("Threshold"))
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+
+    class Meta:
+        db_table = "outbreak_alerts"
+        verbose_name = _("Outbreak Alert")
+        verbose_name_plural = _("Outbreak Alerts")
+        ordering = ["-week_start", "-id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["disease", "location", "week_start", "method"],
+                name="unique_outbreak_alert",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["week_start", "id"]),
+        ]
+
+    def __str__(self) -> str:
+        """Return method, series and week as string representation."""
+        return (
+            f"{self.get_method_display()}: {self.disease_id}/{self.location_id} "
+            f"week of {self.week_start}"
+        )
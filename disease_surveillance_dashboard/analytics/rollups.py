@@ -0,0 +1,201 @@
+"""
+Incremental daily and weekly case count rollups.
+
+Case reports are append-only, so the rollups only need to add the reports
+created since the last run. Progress is a high-water mark on the report id,
+kept in :class:`RollupState`. Ids are assigned before a transaction commits,
+so a run only advances past ids created at least
+``ANALYTICS_ROLLUP_SETTLE_SECONDS`` ago; any transaction that inserts
+reports must finish within that time.
+"""
+
+import datetime
+from functools import partial
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+
+from disease_surveillance_dashboard.utils.cache import bump_version
+from disease_surveillance_dashboard.utils.cache import table_version_name
+
+from .cache import REBUILD_VERSION_NAME
+from .cache import month_version_name
+from .models import DailyCaseCount
+from .models import DailyCaseTotal
+from .models import RollupState
+from .models import WeeklyCaseCount
+from .models import WeeklyCaseTotal
+
+STATE_NAME = "case_counts"
+# Each rollup model and the field holding its period.
+ROLLUP_PERIODS = {
+    DailyCaseCount: "day",
+    WeeklyCaseCount: "week_start",
+    DailyCaseTotal: "day",
+    WeeklyCaseTotal: "week_start",
+}
+
+SETTLED_BOUND_SQL = """
+    SELECT max(id)
+      FROM case_reports
+     WHERE id > %(low)s
+       AND created_at < clock_timestamp() - make_interval(secs => %(settle)s)
+"""
+
+# The id closing a batch of %(size)s reports; ids have gaps, so a batch is
+# bounded by row count rather than by an id span.
+BATCH_BOUND_SQL = """
+    SELECT id
+      FROM case_reports
+     WHERE id > %(low)s
+     ORDER BY id
+    OFFSET %(size)s - 1
+     LIMIT 1
+"""
+
+# Adds the reports with ids in (low, high] and report dates in
+# [since, until) to every rollup in one statement, and returns the months
+# whose counts changed.
+ACCUMULATE_SQL = """
+    WITH batch AS MATERIALIZED (
+        SELECT disease_id, location_id, report_date
+          FROM case_reports
+         WHERE id > %(low)s
+           AND id <= %(high)s
+           AND report_date >= %(since)s
+           AND report_date < %(until)s
+    ), daily AS (
+        INSERT INTO daily_case_counts AS rollup (disease_id, location_id, day, count)
+        SELECT disease_id, location_id, report_date, count(*)
+          FROM batch
+         GROUP BY 1, 2, 3
+        ON CONFLICT (disease_id, location_id, day)
+        DO UPDATE SET count = rollup.count + EXCLUDED.count
+    ), weekly AS (
+        INSERT INTO weekly_case_counts AS rollup
+               (disease_id, location_id, week_start, count)
+        SELECT disease_id, location_id, date_trunc('week', report_date)::date, count(*)
+          FROM batch
+         GROUP BY 1, 2, 3
+        ON CONFLICT (disease_id, location_id, week_start)
+        DO UPDATE SET count = rollup.count + EXCLUDED.count
+    ), daily_total AS (
+        INSERT INTO daily_case_totals AS rollup (disease_id, day, count)
+        SELECT disease_id, report_date, count(*)
+          FROM batch
+         GROUP BY 1, 2
+        ON CONFLICT (disease_id, day)
+        DO UPDATE SET count = rollup.count + EXCLUDED.count
+    ), weekly_total AS (
+        INSERT INTO weekly_case_totals AS rollup (disease_id, week_start, count)
+        SELECT disease_id, date_trunc('week', report_date)::date, count(*)
+          FROM batch
+         GROUP BY 1, 2
+        ON CONFLICT (disease_id, week_start)
+        DO UPDATE SET count = rollup.count + EXCLUDED.count
+    )
+    SELECT DISTINCT date_trunc('month', report_date)::date
+      FROM batch
+"""
+
+ALL_DATES = (datetime.date.min, datetime.date.max)
+
+
+def bump_rollup_versions(months=(), *, rebuilt: bool = False) -> None:
+    """
+    Invalidate caches built from the rollup tables.
+
+    ``months`` are the first days of the months whose counts changed, for
+    caches keyed by month (:func:`..cache.window_versions`); ``rebuilt``
+    invalidates every month at once.
+    """
+    names = [table_version_name(model) for model in ROLLUP_PERIODS]
+    names += [month_version_name(month) for month in months]
+    if rebuilt:
+        names.append(REBUILD_VERSION_NAME)
+    bump_version(*names)
+
+
+def _settled_bound(cursor, low: int) -> int | None:
+    cursor.execute(
+        SETTLED_BOUND_SQL,
+        {"low": low, "settle": settings.ANALYTICS_ROLLUP_SETTLE_SECONDS},
+    )
+    return cursor.fetchone()[0]
+
+
+def _accumulate(cursor, low, high, since, until) -> list[datetime.date]:
+    cursor.execute(
+        ACCUMULATE_SQL,
+        {"low": low, "high": high, "since": since, "until": until},
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _locked_state(*, wait: bool) -> RollupState | None:
+    RollupState.objects.get_or_create(name=STATE_NAME)
+    return (
+        RollupState.objects.select_for_update(skip_locked=not wait)
+        .filter(name=STATE_NAME)
+        .first()
+    )
+
+
+def update_rollups(max_batches: int | None = None) -> dict:
+    """
+    Add settled, not yet counted case reports to the rollups.
+
+    Works in micro-batches of at most ``ANALYTICS_ROLLUP_BATCH_SIZE`` reports,
+    each committed together with the new high-water mark. Returns early if
+    another run holds the state row.
+    """
+    batch_size = max(settings.ANALYTICS_ROLLUP_BATCH_SIZE, 1)
+    batches = 0
+    high_water_mark = None
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic(), connection.cursor() as cursor:
+            state = _locked_state(wait=False)
+            if state is None:
+                break
+            high_water_mark = state.high_water_mark
+            bound = _settled_bound(cursor, state.high_water_mark)
+            if bound is None:
+                break
+            cursor.execute(
+                BATCH_BOUND_SQL,
+                {"low": state.high_water_mark, "size": batch_size},
+            )
+            row = cursor.fetchone()
+            high = min(bound, row[0]) if row else bound
+            months = _accumulate(cursor, state.high_water_mark, high, *ALL_DATES)
+            state.high_water_mark = high_water_mark = high
+            state.save(update_fields=["high_water_mark", "updated_at"])
+            transaction.on_commit(partial(bump_rollup_versions, months))
+        batches += 1
+    return {"batches": batches, "high_water_mark": high_water_mark}
+
+
+def rebuild_rollups(since: datetime.date | None = None) -> dict:
+    """
+    Recount the rollups from the case reports, from ``since`` onwards.
+
+    Rollup rows from the Monday of ``since``'s week (or all of them) are
+    replaced in one transaction, so readers see either the old or the new
+    counts. Reports dated earlier that the incremental run has not counted
+    yet are added as usual, so the high-water mark can move to the settled
+    bound.
+    """
+    since = since or datetime.date.min
+    since -= datetime.timedelta(days=since.weekday())
+    with transaction.atomic(), connection.cursor() as cursor:
+        state = _locked_state(wait=True)
+        high = max(_settled_bound(cursor, 0) or 0, state.high_water_mark)
+        for model, field in ROLLUP_PERIODS.items():
+            model.objects.filter(**{f"{field}__gte": since}).delete()
+        _accumulate(cursor, 0, high, since, datetime.date.max)
+        _accumulate(cursor, state.high_water_mark, high, datetime.date.min, since)
+        state.high_water_mark = high
+        state.save(update_fields=["high_water_mark", "updated_at"])
+        transaction.on_commit(partial(bump_rollup_versions, rebuilt=True))
+    return {"since": since, "high_water_mark": high}
@@ -0,0 +1,16 @@
+from celery import shared_task
+
+from .detection import run_detection
+from .rollups import update_rollups
+
+
+@shared_task()
+def update_case_count_rollups():
+    """Add newly ingested case reports to the daily and weekly rollups."""
+    return update_rollups()
+
+
+@shared_task()
+def detect_outbreaks():
+    """Raise outbreak alerts for the last complete weeks."""
+    return run_detection()
@@ -0,0 +1,427 @@
+"""Tests for analytics API endpoints."""
+
+import datetime
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from reference_data.models import Disease
+from reference_data.models import Location
+
+from ..models import DailyCaseCount
+from ..models import DailyCaseTotal
+from ..models import WeeklyCaseCount
+from ..models import WeeklyCaseTotal
+from ..rollups import bump_rollup_versions
+
+User = get_user_model()
+
+
+class CaseCountAPITestCase(APITestCase):
+    """Test cases for the case count endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="analyst@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.cholera = Disease.objects.create(disease_name="Cholera")
+        self.measles = Disease.objects.create(disease_name="Measles")
+        self.accra = Location.objects.create(district_name="Accra")
+        self.tema = Location.objects.create(district_name="Tema")
+        week = datetime.date(2024, 3, 4)
+        for disease, location, count in [
+            (self.cholera, self.accra, 5),
+            (self.cholera, self.tema, 2),
+            (self.measles, self.accra, 1),
+        ]:
+            WeeklyCaseCount.objects.create(
+                disease=disease,
+                location=location,
+                week_start=week,
+                count=count,
+            )
+            DailyCaseCount.objects.create(
+                disease=disease,
+                location=location,
+                day=week,
+                count=count,
+            )
+        for disease, count in [(self.cholera, 7), (self.measles, 1)]:
+            WeeklyCaseTotal.objects.create(
+                disease=disease,
+                week_start=week,
+                count=count,
+            )
+            DailyCaseTotal.objects.create(disease=disease, day=week, count=count)
+        bump_rollup_versions()
+        self.api_url = "/api/v1/analytics/case-counts/"
+        self.range = {"start": "2024-03-01", "end": "2024-03-31"}
+
+    def test_weekly_totals(self):
+        """Test totals across diseases and locations per week."""
+        response = self.client.get(self.api_url, self.range)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{"period": "2024-03-04", "count": 8}])
+
+    def test_filters_and_grouping(self):
+        """Test disease/location filters and grouping by disease."""
+        response = self.client.get(
+            self.api_url,
+            {**self.range, "location": [self.tema.id]},
+        )
+        self.assertEqual(response.data, [{"period": "2024-03-04", "count": 2}])
+        response = self.client.get(
+            self.api_url,
+            {**self.range, "location": [self.accra.id], "group_by": "disease"},
+        )
+        self.assertEqual(
+            response.data,
+            [
+                {"period": "2024-03-04", "disease": self.cholera.id, "count": 5},
+                {"period": "2024-03-04", "disease": self.measles.id, "count": 1},
+            ],
+        )
+        response = self.client.get(
+            self.api_url,
+            {**self.range, "interval": "day", "disease": [self.cholera.id]},
+        )
+        self.assertEqual(response.data, [{"period": "2024-03-04", "count": 7}])
+
+    def test_location_filter_covers_subtree(self):
+        """Test that filtering on a district includes its areas."""
+        ashaiman = Location.objects.create(district_name="Tema", area_name="Ashaiman")
+        WeeklyCaseCount.objects.create(
+            disease=self.cholera,
+            location=ashaiman,
+            week_start=datetime.date(2024, 3, 4),
+            count=3,
+        )
+        response = self.client.get(
+            self.api_url,
+            {**self.range, "location": [self.tema.id]},
+        )
+        self.assertEqual(response.data, [{"period": "2024-03-04", "count": 5}])
+
+    def test_reads_only_rollups_and_caches(self):
+        """Test that repeated queries are served from the cache."""
+        self.client.get(self.api_url, self.range)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.api_url, self.range)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([q for q in ctx.captured_queries if "SELECT" in q["sql"]])
+
+        WeeklyCaseTotal.objects.filter(disease=self.measles).update(count=4)
+        bump_rollup_versions()
+        response = self.client.get(self.api_url, self.range)
+        self.assertEqual(response.data[0]["count"], 11)
+
+    def test_invalid_range(self):
+        """Test that reversed and oversized ranges are rejected."""
+        response = self.client.get(
+            self.api_url,
+            {"start": "2024-03-31", "end": "2024-03-01"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(
+            self.api_url,
+            {"start": "2000-01-01", "end": "2024-03-01"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class EpiCurveAPITestCase(APITestCase):
+    """Test cases for the epidemic curve endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="analyst@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.cholera = Disease.objects.create(disease_name="Cholera")
+        self.measles = Disease.objects.create(disease_name="Measles")
+        self.accra = Location.objects.create(district_name="Accra")
+        self.start = datetime.date(2024, 1, 1)
+        # One cholera case a day for 90 days, with a 50-case peak on day 40.
+        for offset in range(90):
+            day = self.start + datetime.timedelta(days=offset)
+            count = 50 if offset == 40 else 1  # noqa: PLR2004
+            DailyCaseTotal.objects.create(disease=self.cholera, day=day, count=count)
+            DailyCaseCount.objects.create(
+                disease=self.cholera,
+                location=self.accra,
+                day=day,
+                count=count,
+            )
+        WeeklyCaseTotal.objects.create(
+            disease=self.cholera,
+            week_start=self.start,
+            count=7,
+        )
+        bump_rollup_versions()
+        self.api_url = "/api/v1/analytics/epicurve/"
+
+    def test_daily_bins_are_dense(self):
+        """Test that empty days are filled with zeros."""
+        response = self.client.get(
+            self.api_url,
+            {
+                "from": "2023-12-30",
+                "to": "2024-01-02",
+                "bin": "day",
+                "disease": [self.cholera.id, self.measles.id],
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        periods = ["2023-12-30", "2023-12-31", "2024-01-01", "2024-01-02"]
+        self.assertEqual(
+            response.data,
+            [
+                {"disease": self.cholera.id, "period": periods, "count": [0, 0, 1, 1]},
+                {"disease": self.measles.id, "period": periods, "count": [0, 0, 0, 0]},
+            ],
+        )
+
+    def test_monthly_and_weekly_bins(self):
+        """Test monthly sums from daily rollups and aligned weekly bins."""
+        response = self.client.get(
+            self.api_url,
+            {"from": "2024-01-15", "to": "2024-03-31", "bin": "month"},
+        )
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    "disease": self.cholera.id,
+                    "period": ["2024-01-01", "2024-02-01", "2024-03-01"],
+                    "count": [31, 78, 30],
+                },
+            ],
+        )
+        response = self.client.get(
+            self.api_url,
+            {"from": "2024-01-03", "to": "2024-01-10", "bin": "week"},
+        )
+        self.assertEqual(response.data[0]["period"], ["2024-01-01", "2024-01-08"])
+        self.assertEqual(response.data[0]["count"], [7, 0])
+
+    def test_location_filter_uses_counts(self):
+        """Test that a location filter reads the per-location rollups."""
+        response = self.client.get(
+            self.api_url,
+            {
+                "from": "2024-02-09",
+                "to": "2024-02-10",
+                "bin": "day",
+                "location": [self.accra.id],
+            },
+        )
+        self.assertEqual(response.data[0]["count"], [1, 50])
+
+    def test_downsampling_keeps_peak_and_ends(self):
+        """Test that LTTB keeps the endpoints and the peak."""
+        response = self.client.get(
+            self.api_url,
+            {"from": "2024-01-01", "to": "2024-03-30", "bin": "day", "max_points": 10},
+        )
+        series = response.data[0]
+        self.assertEqual(len(series["period"]), 10)
+        self.assertEqual(len(series["count"]), 10)
+        self.assertEqual(series["period"][0], "2024-01-01")
+        self.assertEqual(series["period"][-1], "2024-03-30")
+        self.assertIn("2024-02-10", series["period"])
+        self.assertIn(50, series["count"])
+
+    def test_invalid_parameters(self):
+        """Test that bad bins, budgets and ranges are rejected."""
+        for params in [
+            {"bin": "year"},
+            {"max_points": 2},
+            {"from": "2024-03-31", "to": "2024-03-01"},
+            {"from": "2000-01-01", "to": "2024-03-01"},
+        ]:
+            with self.subTest(params=params):
+                response = self.client.get(self.api_url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class MapAggregateAPITestCase(APITestCase):
+    """Test cases for the map aggregate endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="analyst@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.cholera = Disease.objects.create(disease_name="Cholera")
+        self.accra = Location.objects.create(district_name="Accra", population=100000)
+        self.osu = Location.objects.create(
+            district_name="Accra",
+            area_name="Osu",
+            population=20000,
+        )
+        self.tema = Location.objects.create(district_name="Tema")
+        self.ashaiman = Location.objects.create(
+            district_name="Tema",
+            area_name="Ashaiman",
+            population=50000,
+        )
+        Location.objects.create(
+            district_name="Tema",
+            area_name="Community 1",
+            population=30000,
+        )
+        # The window 2024-03-01 to 2024-03-31 has whole weeks from Monday
+        # 2024-03-04; March 1-3 come from the daily rollups.
+        for location, week_start, count in [
+            (self.accra, datetime.date(2024, 3, 4), 5),
+            (self.osu, datetime.date(2024, 3, 11), 3),
+            (self.ashaiman, datetime.date(2024, 3, 25), 10),
+            (self.ashaiman, datetime.date(2024, 2, 26), 100),
+        ]:
+            WeeklyCaseCount.objects.create(
+                disease=self.cholera,
+                location=location,
+                week_start=week_start,
+                count=count,
+            )
+        for day, count in [
+            (datetime.date(2024, 3, 2), 2),
+            (datetime.date(2024, 2, 29), 50),
+        ]:
+            DailyCaseCount.objects.create(
+                disease=self.cholera,
+                location=self.ashaiman,
+                day=day,
+                count=count,
+            )
+        self.api_url = "/api/v1/analytics/map/"
+        self.params = {
+            "disease": self.cholera.id,
+            "from": "2024-03-01",
+            "to": "2024-03-31",
+        }
+
+    def test_district_counts_and_rates(self):
+        """Test per-district sums with district or summed area populations."""
+        response = self.client.get(self.api_url, self.params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["level"], "district")
+        self.assertEqual(response.data["region"], [self.accra.id, self.tema.id])
+        self.assertEqual(response.data["name"], ["Accra", "Tema"])
+        self.assertEqual(response.data["count"], [8, 12])
+        self.assertEqual(response.data["population"], [100000, 80000])
+        self.assertEqual(response.data["rate"], [8.0, 15.0])
+
+    def test_area_level(self):
+        """Test per-area counts, leaving out counts recorded on districts."""
+        response = self.client.get(self.api_url, {**self.params, "level": "area"})
+        self.assertEqual(response.data["region"], [self.osu.id, self.ashaiman.id])
+        self.assertEqual(response.data["name"], ["Osu", "Ashaiman"])
+        self.assertEqual(response.data["count"], [3, 12])
+        self.assertEqual(response.data["rate"], [15.0, 24.0])
+
+    def test_region_level_rolls_up_districts(self):
+        """Test that areas and districts roll up to their region."""
+        region = Location.objects.create(
+            district_name="Greater Accra",
+            level=Location.Level.REGION,
+            population=400000,
+        )
+        for district in (self.accra, self.tema):
+            district.parent = region
+            district.save()
+        response = self.client.get(self.api_url, {**self.params, "level": "region"})
+        self.assertEqual(response.data["region"], [region.id])
+        self.assertEqual(response.data["count"], [20])
+        self.assertEqual(response.data["rate"], [5.0])
+
+    def test_cache_follows_window_months(self):
+        """Test that only rollup changes inside the window invalidate it."""
+        self.client.get(self.api_url, self.params)
+        bump_rollup_versions([datetime.date(2024, 5, 1)])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.api_url, self.params)
+        self.assertFalse([q for q in ctx.captured_queries if "SELECT" in q["sql"]])
+        etag = response.headers["ETag"]
+        response = self.client.get(self.api_url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        WeeklyCaseCount.objects.filter(location=self.osu).update(count=7)
+        bump_rollup_versions([datetime.date(2024, 3, 1)])
+        response = self.client.get(self.api_url, self.params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], [12, 12])
+
+    def test_requires_disease(self):
+        """Test that the disease parameter is mandatory."""
+        response = self.client.get(self.api_url, {"level": "area"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AsyncReadTestCase(TestCase):
+    """Test cases for serving rollup reads from async views."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="analyst@example.com",
+            password="testpass123",
+        )
+        self.cholera = Disease.objects.create(disease_name="Cholera")
+        self.accra = Location.objects.create(district_name="Accra")
+        WeeklyCaseCount.objects.create(
+            disease=self.cholera,
+            location=self.accra,
+            week_start=datetime.date(2024, 3, 4),
+            count=5,
+        )
+        WeeklyCaseTotal.objects.create(
+            disease=self.cholera,
+            week_start=datetime.date(2024, 3, 4),
+            count=5,
+        )
+
+    def test_read_views_are_async(self):
+        """Test that the rollup and reference data views are coroutines."""
+        for url in (
+            "/api/v1/analytics/case-counts/",
+            "/api/v1/analytics/epicurve/",
+            "/api/v1/analytics/map/",
+            "/api/v1/diseases/",
+            f"/api/v1/locations/{self.accra.id}/",
+        ):
+            with self.subTest(url=url):
+                self.assertTrue(iscoroutinefunction(resolve(url).func))
+
+    async def test_map_over_asgi(self):
+        """Test a map read and its revalidation through the ASGI handler."""
+        await self.async_client.aforce_login(self.user)
+        url = "/api/v1/analytics/map/"
+        params = {"disease": self.cholera.id, "from": "2024-03-01", "to": "2024-03-31"}
+        response = await self.async_client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], [5])
+        response = await self.async_client.get(
+            url,
+            params,
+            headers={"if-none-match": response.headers["ETag"]},
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_epicurve_requires_authentication(self):
+        """Test that permission errors are rendered by the async path."""
+        response = await self.async_client.get("/api/v1/analytics/epicurve/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,141 @@
+"""Tests for the outbreak detection engine."""
+
+import datetime
+
+import numpy as np
+from django.test import SimpleTestCase
+from django.test import TestCase
+from django.test import override_settings
+from django.utils import timezone
+
+from reference_data.models import Disease
+from reference_data.models import Location
+
+from ..detection import detect
+from ..detection import load_weekly_matrix
+from ..detection import run_detection
+from ..models import OutbreakAlert
+from ..models import WeeklyCaseCount
+from ..tasks import detect_outbreaks
+
+WEEKS = 60
+METHODS = {choice.value for choice in OutbreakAlert.Method}
+
+
+def quiet_series(weeks=WEEKS):
+    """Return alternating 3 and 5 cases a week."""
+    return np.resize([3.0, 5.0], weeks)
+
+
+class DetectionMethodTestCase(SimpleTestCase):
+    """Test cases for the vectorized detection methods."""
+
+    def test_spike_alarms_every_method(self):
+        """Test that a spike in the last week trips all methods."""
+        counts = np.stack([quiet_series(), quiet_series()])
+        counts[1, -1] = 20
+        for detection in detect(counts, years=1):
+            with self.subTest(method=detection.method):
+                self.assertFalse(detection.alarm[0].any())
+                self.assertTrue(detection.alarm[1, -1])
+                self.assertGreater(detection.score[1, -1], detection.threshold)
+
+    def test_methods_cover_alert_choices(self):
+        """Test that every method maps to an alert method choice."""
+        methods = {d.method for d in detect(np.zeros((1, WEEKS)), years=1)}
+        self.assertEqual(methods, METHODS)
+
+    def test_short_history_never_alarms(self):
+        """Test that weeks without enough baseline are skipped."""
+        counts = np.array([[0.0, 0.0, 40.0]])
+        for detection in detect(counts, years=1):
+            with self.subTest(method=detection.method):
+                self.assertFalse(detection.alarm.any())
+
+    def test_sparse_series_needs_several_cases(self):
+        """Test that two cases after silent weeks do not alarm."""
+        counts = np.zeros((1, WEEKS))
+        counts[0, -1] = 2
+        for detection in detect(counts, years=1):
+            with self.subTest(method=detection.method):
+                self.assertFalse(detection.alarm[0, -1])
+
+
+@override_settings(ANALYTICS_DETECTION_YEARS=1, ANALYTICS_DETECTION_WEEKS=2)
+class RunDetectionTestCase(TestCase):
+    """Test cases for loading rollups and writing alerts."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.today = timezone.localdate()
+        self.cholera = Disease.objects.create(disease_name="Cholera")
+        self.accra = Location.objects.create(district_name="Accra")
+        self.tema = Location.objects.create(district_name="Tema")
+        self.last_week = self.today - datetime.timedelta(
+            days=self.today.weekday(),
+            weeks=1,
+        )
+        self.start = self.last_week - datetime.timedelta(weeks=WEEKS - 1)
+        for location in (self.accra, self.tema):
+            self._weekly(location, quiet_series())
+
+    def _weekly(self, location, counts):
+        WeeklyCaseCount.objects.bulk_create(
+            WeeklyCaseCount(
+                disease=self.cholera,
+                location=location,
+                week_start=self.start + datetime.timedelta(weeks=week),
+                count=int(count),
+            )
+            for week, count in enumerate(counts)
+        )
+
+    def _set_last_week(self, location, count):
+        WeeklyCaseCount.objects.filter(
+            location=location,
+            week_start=self.last_week,
+        ).update(count=count)
+
+    def test_load_weekly_matrix(self):
+        """Test that rollup rows land in their series and week columns."""
+        end = self.last_week + datetime.timedelta(weeks=1)
+        matrix = load_weekly_matrix(self.start, end)
+        self.assertEqual(matrix.counts.shape, (2, WEEKS))
+        self.assertEqual(sorted(matrix.locations), [self.accra.id, self.tema.id])
+        np.testing.assert_array_equal(matrix.counts[0], quiet_series())
+        self.assertEqual(matrix.week_start(WEEKS - 1), self.last_week)
+
+    def test_spike_raises_alerts(self):
+        """Test that only the spiking series gets alerts, one per method."""
+        self._set_last_week(self.tema, 25)
+        result = run_detection(self.today)
+        self.assertEqual(result["alerts"], len(METHODS))
+        alerts = OutbreakAlert.objects.all()
+        self.assertEqual({a.method for a in alerts}, METHODS)
+        for alert in alerts:
+            self.assertEqual(alert.location, self.tema)
+            self.assertEqual(alert.week_start, self.last_week)
+            self.assertEqual(alert.observed, 25)
+            self.assertGreater(alert.score, alert.threshold)
+
+    def test_reruns_update_and_withdraw_alerts(self):
+        """Test that reruns keep one alert per method and drop stale ones."""
+        self._set_last_week(self.tema, 25)
+        run_detection(self.today)
+        ids = set(OutbreakAlert.objects.values_list("id", flat=True))
+
+        self._set_last_week(self.tema, 30)
+        run_detection(self.today)
+        self.assertEqual(set(OutbreakAlert.objects.values_list("id", flat=True)), ids)
+        self.assertEqual(OutbreakAlert.objects.filter(observed=30).count(), len(ids))
+
+        self._set_last_week(self.tema, 5)
+        result = run_detection(self.today)
+        self.assertEqual(result["removed"], len(ids))
+        self.assertFalse(OutbreakAlert.objects.exists())
+
+    def test_task_runs_detection(self):
+        """Test that the beat task evaluates the rollups."""
+        result = detect_outbreaks()
+        self.assertEqual(result["alerts"], 0)
+        self.assertEqual(result["series"], 2)
@@ -0,0 +1,173 @@
+"""Tests for the case count rollup engine."""
+
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.test import override_settings
+
+from disease_surveillance_dashboard.cases.models import CaseReport
+from disease_surveillance_dashboard.utils.cache import get_versions
+from reference_data.models import Disease
+from reference_data.models import Location
+
+from ..cache import month_version_name
+from ..models import DailyCaseCount
+from ..models import DailyCaseTotal
+from ..models import RollupState
+from ..models import WeeklyCaseCount
+from ..models import WeeklyCaseTotal
+from ..rollups import STATE_NAME
+from ..rollups import update_rollups
+
+User = get_user_model()
+
+
+@override_settings(ANALYTICS_ROLLUP_SETTLE_SECONDS=0, ANALYTICS_ROLLUP_BATCH_SIZE=1000)
+class RollupTestCase(TestCase):
+    """Test cases for incremental updates and rebuilds."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="reporter@example.com",
+            password="testpass123",
+        )
+        self.cholera = Disease.objects.create(disease_name="Cholera")
+        self.measles = Disease.objects.create(disease_name="Measles")
+        self.accra = Location.objects.create(district_name="Accra")
+        self.tema = Location.objects.create(district_name="Tema")
+
+    def _report(self, disease, location, day, count=1):
+        CaseReport.objects.bulk_create(
+            CaseReport(
+                disease=disease,
+                location=location,
+                reported_by=self.user,
+                report_date=day,
+            )
+            for _ in range(count)
+        )
+
+    def _daily(self):
+        return {
+            (r.disease_id, r.location_id, r.day): r.count
+            for r in DailyCaseCount.objects.all()
+        }
+
+    def _weekly(self):
+        return {
+            (r.disease_id, r.location_id, r.week_start): r.count
+            for r in WeeklyCaseCount.objects.all()
+        }
+
+    def test_incremental_updates_add_new_reports(self):
+        """Test that each run only counts reports it has not seen."""
+        monday = datetime.date(2024, 3, 4)
+        self._report(self.cholera, self.accra, monday, 3)
+        self._report(self.cholera, self.accra, monday + datetime.timedelta(days=2), 2)
+        update_rollups()
+        self._report(self.cholera, self.accra, monday, 4)
+        self._report(self.measles, self.tema, monday + datetime.timedelta(days=7))
+        update_rollups()
+
+        self.assertEqual(
+            self._daily(),
+            {
+                (self.cholera.id, self.accra.id, monday): 7,
+                (self.cholera.id, self.accra.id, datetime.date(2024, 3, 6)): 2,
+                (self.measles.id, self.tema.id, datetime.date(2024, 3, 11)): 1,
+            },
+        )
+        self.assertEqual(
+            self._weekly(),
+            {
+                (self.cholera.id, self.accra.id, monday): 9,
+                (self.measles.id, self.tema.id, datetime.date(2024, 3, 11)): 1,
+            },
+        )
+        self.assertEqual(
+            dict(WeeklyCaseTotal.objects.values_list("disease", "count")),
+            {self.cholera.id: 9, self.measles.id: 1},
+        )
+        self.assertEqual(
+            DailyCaseTotal.objects.get(disease=self.cholera, day=monday).count,
+            7,
+        )
+        state = RollupState.objects.get(name=STATE_NAME)
+        self.assertEqual(state.high_water_mark, CaseReport.objects.latest("id").id)
+        self.assertEqual(update_rollups()["batches"], 0)
+
+    def test_bumps_versions_of_touched_months(self):
+        """Test that a batch only invalidates the months it changed."""
+        march, april = datetime.date(2024, 3, 1), datetime.date(2024, 4, 1)
+        before = get_versions([month_version_name(march), month_version_name(april)])
+        self._report(self.cholera, self.accra, datetime.date(2024, 3, 31))
+        with self.captureOnCommitCallbacks(execute=True):
+            update_rollups()
+        after = get_versions([month_version_name(march), month_version_name(april)])
+        self.assertNotEqual(
+            after[month_version_name(march)],
+            before[month_version_name(march)],
+        )
+        self.assertEqual(
+            after[month_version_name(april)],
+            before[month_version_name(april)],
+        )
+
+    @override_settings(ANALYTICS_ROLLUP_BATCH_SIZE=2)
+    def test_micro_batches(self):
+        """Test that large backlogs are split into batches."""
+        self._report(self.cholera, self.accra, datetime.date(2024, 3, 4), 5)
+        self.assertEqual(update_rollups(max_batches=1)["batches"], 1)
+        self.assertEqual(sum(self._daily().values()), 2)
+        self.assertEqual(update_rollups()["batches"], 2)
+        self.assertEqual(sum(self._daily().values()), 5)
+
+    @override_settings(ANALYTICS_ROLLUP_SETTLE_SECONDS=3600)
+    def test_unsettled_reports_wait(self):
+        """Test that recent ids are left for a later run."""
+        self._report(self.cholera, self.accra, datetime.date(2024, 3, 4))
+        self.assertEqual(update_rollups()["batches"], 0)
+        self.assertEqual(self._daily(), {})
+
+    def test_rebuild_command(self):
+        """Test full and partial rebuilds."""
+        self._report(self.cholera, self.accra, datetime.date(2024, 1, 10), 2)
+        self._report(self.cholera, self.accra, datetime.date(2024, 3, 6), 3)
+        update_rollups()
+        DailyCaseCount.objects.update(count=99)
+        WeeklyCaseCount.objects.update(count=99)
+        self._report(self.measles, self.tema, datetime.date(2024, 1, 2))
+
+        # Weeks from Monday 2024-03-04 are recounted; older rows are only
+        # topped up with the not yet counted report.
+        call_command("rebuild_rollups", "--since", "2024-03-06", stdout=None)
+        self.assertEqual(
+            self._daily(),
+            {
+                (self.cholera.id, self.accra.id, datetime.date(2024, 1, 10)): 99,
+                (self.cholera.id, self.accra.id, datetime.date(2024, 3, 6)): 3,
+                (self.measles.id, self.tema.id, datetime.date(2024, 1, 2)): 1,
+            },
+        )
+
+        call_command("rebuild_rollups", stdout=None)
+        self.assertEqual(
+            dict(DailyCaseTotal.objects.values_list("day", "count")),
+            {
+                datetime.date(2024, 1, 2): 1,
+                datetime.date(2024, 1, 10): 2,
+                datetime.date(2024, 3, 6): 3,
+            },
+        )
+        self.assertEqual(
+            self._weekly(),
+            {
+                (self.cholera.id, self.accra.id, datetime.date(2024, 1, 8)): 2,
+                (self.cholera.id, self.accra.id, datetime.date(2024, 3, 4)): 3,
+                (self.measles.id, self.tema.id, datetime.date(2024, 1, 1)): 1,
+            },
+        )
+        self.assertEqual(update_rollups()["batches"], 0)
@@ -0,0 +1 @@
+"""Case reports app for recording individual disease cases."""
@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from .models import CaseReport
+
+
+@admin.register(CaseReport)
+class CaseReportAdmin(admin.ModelAdmin):
+    """Admin interface for CaseReport model."""
+
+    list_display = ["id", "disease", "location", "report_date", "reported_by"]
+    list_filter = ["disease"]
+    list_select_related = ["disease", "location", "reported_by"]
+    # Locations number in the hundreds of thousands; never render a select.
+    raw_id_fields = ["disease", "location", "reported_by"]
+    date_hierarchy = "report_date"
+    ordering = ["-id"]
+    readonly_fields = ["created_at"]
@@ -0,0 +1 @@
+"""API package for case reports app."""
@@ -0,0 +1,72 @@
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from reference_data.models import Disease
+from reference_data.models import Location
+
+from ..models import CaseReport
+
+
+class CaseReportSerializer(serializers.ModelSerializer):
+    """Serializer for CaseReport model."""
+
+    disease = serializers.PrimaryKeyRelatedField(
+        queryset=Disease.objects.filter(is_active=True),
+    )
+    location = serializers.PrimaryKeyRelatedField(
+        queryset=Location.objects.filter(is_active=True),
+    )
+
+    class Meta:
+        model = CaseReport
+        fields = [
+            "id",
+            "disease",
+            "location",
+            "reported_by",
+            "onset_date",
+            "report_date",
+            "created_at",
+        ]
+        read_only_fields = ["reported_by", "created_at"]
+
+    def validate_report_date(self, value):
+        """Reject report dates in the future."""
+        if value > timezone.localdate():
+            raise serializers.ValidationError(
+                _("Report date cannot be in the future."),
+            )
+        return value
+
+    def validate(self, attrs):
+        """Ensure onset precedes the report."""
+        onset_date = attrs.get("onset_date")
+        if onset_date and onset_date > attrs["report_date"]:
+            raise serializers.ValidationError(
+                {"onset_date": _("Onset date cannot be after the report date.")},
+            )
+        return attrs
+
+
+class CaseExportQuerySerializer(serializers.Serializer):
+    """Query parameters of the line-list export."""
+
+    disease = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=100,
+    )
+    location = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=1000,
+    )
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        """Ensure the report date range is not reversed."""
+        if "start" in attrs and "end" in attrs and attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError({"start": _("Must not be after end.")})
+        return attrs
@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError
+from django.http import StreamingHttpResponse
+from rest_framework import mixins
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from disease_surveillance_dashboard.access_control.api.mixins import LocationScopedMixin
+from disease_surveillance_dashboard.utils.mixins import AtomicWriteMixin
+from disease_surveillance_dashboard.utils.renderers import CSVRenderer
+from disease_surveillance_dashboard.utils.renderers import NDJSONRenderer
+
+from ..export import aiter_export
+from ..export import export_rows
+from ..export import filter_export
+from ..export import iter_export
+from ..ingest import ingest_case_reports
+from ..live import cases_created
+from ..models import CaseReport
+from .serializers import CaseExportQuerySerializer
+from .serializers import CaseReportSerializer
+
+CASE_BULK_MAX_ROWS = 10000
+
+
+class CaseReportViewSet(
+    AtomicWriteMixin,
+    LocationScopedMixin,
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    GenericViewSet,
+):
+    """Append-only ViewSet for CaseReport model, scoped to the user's locations."""
+
+    queryset = CaseReport.objects.all()
+    serializer_class = CaseReportSerializer
+    pagination_ordering = "-id"
+
+    def perform_create(self, serializer):
+        """Record the requesting user as the reporter."""
+        report = serializer.save(reported_by=self.request.user)
+        cases_created([(report.disease_id, report.location_id, report.report_date)])
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Ingest a JSON list of case reports in one request.
+
+        Valid reports are inserted and invalid ones are returned with their
+        position in the list; the response is the ingestion report.
+        """
+        if not isinstance(request.data, list):
+            msg = "Expected a list of case reports."
+            raise ParseError(msg)
+        if len(request.data) > CASE_BULK_MAX_ROWS:
+            msg = f"At most {CASE_BULK_MAX_ROWS} case reports per request."
+            raise ParseError(msg)
+        try:
+            report = ingest_case_reports(request.data, request.user)
+        except IntegrityError:
+            return Response(
+                {"detail": "Reference data changed during ingestion; retry."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        if report["created"]:
+            return Response(report, status=status.HTTP_201_CREATED)
+        return Response(report)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[CSVRenderer, NDJSONRenderer],
+    )
+    def export(self, request):
+        """
+        Stream the case line list as CSV or NDJSON.
+
+        Usage: GET /api/cases/export/?format=csv|ndjson&disease=<id>
+        &location=<id>&start=2024-01-01&end=2024-06-30
+
+        Rows carry the disease and location names and are read through a
+        server-side cursor, so the response streams in constant memory.
+        """
+        query = CaseExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        queryset = filter_export(self.get_queryset(), query.validated_data)
+
+        renderer = request.accepted_renderer
+        fmt = renderer.format
+        chunk_size = settings.CASES_EXPORT_CHUNK_SIZE
+        rows = export_rows(queryset).iterator(chunk_size)
+        if isinstance(request._request, ASGIRequest):  # noqa: SLF001
+            content = aiter_export(rows, fmt, chunk_size)
+        else:
+            content = iter_export(rows, fmt, chunk_size)
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="cases.{fmt}"'
+        return response
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class CasesConfig(AppConfig):
+    """App configuration for Cases."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "disease_surveillance_dashboard.cases"
+    verbose_name = _("Cases")
@@ -0,0 +1,104 @@
+"""Batch ingestion of case reports."""
+
+import datetime
+
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from reference_data.cache import active_disease_ids
+from reference_data.cache import active_location_ids
+
+from .live import cases_created
+from .models import CaseReport
+
+INSERT_BATCH_SIZE = 2000
+DATE_FORMAT_ERROR = "Date has wrong format. Use YYYY-MM-DD."
+
+
+def _reference(value, ids):
+    if isinstance(value, bool) or not isinstance(value, int):
+        msg = "Incorrect type. Expected pk value."
+        raise ValueError(msg)  # noqa: TRY004
+    if value not in ids:
+        msg = f'Invalid pk "{value}" - object does not exist.'
+        raise ValueError(msg)
+    return value
+
+
+def _date(value, *, required):
+    if value is None or value == "":
+        if required:
+            msg = "This field is required."
+            raise ValueError(msg)
+        return None
+    if not isinstance(value, str) or len(value) != 10:  # noqa: PLR2004
+        raise ValueError(DATE_FORMAT_ERROR)
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(DATE_FORMAT_ERROR) from None
+
+
+def clean_case_report(record, disease_ids, location_ids, today):
+    """Return ``(values, errors)`` for one raw record.
+
+    Foreign keys are checked against in-memory id sets rather than with a
+    query per row.
+    """
+    if not isinstance(record, dict):
+        return None, {"non_field_errors": ["Expected an object."]}
+    cleaners = {
+        "disease_id": ("disease", lambda v: _reference(v, disease_ids)),
+        "location_id": ("location", lambda v: _reference(v, location_ids)),
+        "onset_date": ("onset_date", lambda v: _date(v, required=False)),
+        "report_date": ("report_date", lambda v: _date(v, required=True)),
+    }
+    values, errors = {}, {}
+    for attname, (field, clean) in cleaners.items():
+        try:
+            values[attname] = clean(record.get(field))
+        except ValueError as exc:
+            errors[field] = [str(exc)]
+    if errors:
+        return None, errors
+    if values["report_date"] > today:
+        return None, {"report_date": ["Report date cannot be in the future."]}
+    if values["onset_date"] and values["onset_date"] > values["report_date"]:
+        return None, {"onset_date": ["Onset date cannot be after the report date."]}
+    return values, None
+
+
+def ingest_case_reports(records, reported_by, max_errors=1000):
+    """Validate ``records`` and insert the valid ones with bulk inserts.
+
+    Invalid records are skipped and reported by their position in the
+    batch (the first ``max_errors`` of them). Raises ``IntegrityError`` if a
+    referenced row was deleted after the id sets were read.
+    """
+    disease_ids = active_disease_ids()
+    location_ids = active_location_ids()
+    today = timezone.localdate()
+    report = {"received": 0, "created": 0, "error_count": 0, "errors": []}
+    reports = []
+    for index, record in enumerate(records):
+        report["received"] += 1
+        values, errors = clean_case_report(record, disease_ids, location_ids, today)
+        if errors:
+            report["error_count"] += 1
+            if len(report["errors"]) < max_errors:
+                report["errors"].append({"index": index, "errors": errors})
+            continue
+        reports.append(CaseReport(reported_by=reported_by, **values))
+
+    with transaction.atomic():
+        CaseReport.objects.bulk_create(reports, batch_size=INSERT_BATCH_SIZE)
+        # Foreign keys are deferred; check them now rather than at commit so
+        # a stale id set surfaces here instead of as a failed request commit.
+        connection.check_constraints(table_names=[CaseReport._meta.db_table])  # noqa: SLF001
+        cases_created(
+            (report.disease_id, report.location_id, report.report_date)
+            for report in reports
+        )
+    report["created"] = len(reports)
+    return report
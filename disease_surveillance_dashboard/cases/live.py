@@ -0,0 +1,271 @@
+"""
+Live case counts pushed to websocket subscribers.
+
+When case reports commit, their counts per report date are published to
+Redis on a ``(disease, location)`` channel for the report's location and
+each of its ancestors, so a region's subscribers see its districts' cases.
+Each server process holds one pub/sub connection, subscribed to the
+channels its websockets want, and hands every message to the subscribed
+connections. A connection merges what it receives into its unsent counts
+and sends at most one update per channel per ``CASES_LIVE_INTERVAL``. A
+slow client therefore only grows its unsent counts, which are bounded by
+its subscriptions, and never holds up delivery to other connections; one
+that cannot take an update within ``CASES_LIVE_SEND_TIMEOUT`` is dropped.
+"""
+
+import asyncio
+import datetime
+import functools
+import json
+import logging
+from collections import Counter
+from collections import defaultdict
+from collections.abc import Iterable
+from weakref import WeakKeyDictionary
+
+from django.conf import settings
+from django.db import transaction
+from redis import Redis
+from redis import RedisError
+from redis.asyncio import Redis as AsyncRedis
+
+from disease_surveillance_dashboard.access_control.roles import auser_grants
+from reference_data.models import Disease
+from reference_data.models import Location
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "case-counts"
+# Seconds a commit may wait on Redis before its counts are dropped.
+PUBLISH_TIMEOUT = 1
+# Seconds the pub/sub reader waits after a Redis error before reading again.
+RECONNECT_DELAY = 1
+
+
+def channel_name(disease_id: int, location_id: int) -> str:
+    """Return the pub/sub channel of ``disease_id`` cases at ``location_id``."""
+    return f"{CHANNEL_PREFIX}:{disease_id}:{location_id}"
+
+
+def _channel_ids(channel: str) -> tuple[int, int]:
+    _, disease_id, location_id = channel.split(":")
+    return int(disease_id), int(location_id)
+
+
+@functools.cache
+def _publisher(url: str) -> Redis:
+    return Redis.from_url(
+        url,
+        socket_timeout=PUBLISH_TIMEOUT,
+        socket_connect_timeout=PUBLISH_TIMEOUT,
+    )
+
+
+def cases_created(rows: Iterable[tuple[int, int, datetime.date]]) -> None:
+    """
+    Publish the counts of new case reports once the transaction commits.
+
+    ``rows`` are the ``(disease_id, location_id, report_date)`` of the
+    reports.
+    """
+    if not settings.CASES_LIVE_REDIS_URL:
+        return
+    counts = Counter(rows)
+    if counts:
+        transaction.on_commit(functools.partial(publish_counts, counts), robust=True)
+
+
+def publish_counts(counts: Counter) -> None:
+    """Publish ``(disease_id, location_id, report_date)`` counts to Redis."""
+    location_ids = {location_id for _, location_id, _ in counts}
+    paths = dict(
+        Location.objects.filter(pk__in=location_ids).values_list("pk", "path"),
+    )
+    channels = defaultdict(Counter)
+    for (disease_id, location_id, report_date), count in counts.items():
+        # Locations not placed in the hierarchy yet only reach themselves.
+        path = paths.get(location_id) or f"{location_id}/"
+        for ancestor_id in path.rstrip("/").split("/"):
+            channel = channel_name(disease_id, int(ancestor_id))
+            channels[channel][report_date.isoformat()] += count
+    try:
+        pipeline = _publisher(settings.CASES_LIVE_REDIS_URL).pipeline(
+            transaction=False,
+        )
+        for channel, days in channels.items():
+            pipeline.publish(channel, json.dumps(days))
+        pipeline.execute()
+    except RedisError:
+        logger.warning("Could not publish live case counts", exc_info=True)
+
+
+class CountHub:
+    """A process's Redis subscriptions, shared by its websocket connections."""
+
+    def __init__(self, client: AsyncRedis):
+        self.pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self.subscribers: dict[str, set[LiveCounts]] = {}
+        self.reader: asyncio.Task | None = None
+
+    async def subscribe(self, channel: str, subscriber: "LiveCounts") -> None:
+        subscribers = self.subscribers.setdefault(channel, set())
+        subscribers.add(subscriber)
+        if len(subscribers) > 1:
+            return
+        try:
+            await self.pubsub.subscribe(channel)
+        except RedisError:
+            del self.subscribers[channel]
+            raise
+        if self.reader is None:
+            self.reader = asyncio.create_task(self._read())
+
+    async def unsubscribe(self, channel: str, subscriber: "LiveCounts") -> None:
+        subscribers = self.subscribers.get(channel)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self.subscribers[channel]
+            await self.pubsub.unsubscribe(channel)
+
+    def dispatch(self, channel: str, counts: dict[str, int]) -> None:
+        """Hand ``counts`` to the subscribers of ``channel``; never blocks."""
+        for subscriber in self.subscribers.get(channel, ()):
+            subscriber.add(channel, counts)
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                message = await self.pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=None,
+                )
+            except RedisError:
+                # redis-py reconnects and resubscribes on the next read.
+                logger.warning("Live case counts reader failed", exc_info=True)
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            if message is not None:
+                self.dispatch(message["channel"], json.loads(message["data"]))
+
+
+_hubs: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def get_hub() -> CountHub:
+    """Return the hub of the running event loop."""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        client = AsyncRedis.from_url(
+            settings.CASES_LIVE_REDIS_URL,
+            decode_responses=True,
+        )
+        hub = _hubs[loop] = CountHub(client)
+    return hub
+
+
+class LiveCounts:
+    """
+    The live count subscriptions of one websocket connection.
+
+    ``send`` is the connection's ASGI send callable. :meth:`run` sends the
+    coalesced updates and raises ``TimeoutError`` when the client stops
+    reading.
+    """
+
+    def __init__(self, user, send):
+        self.user = user
+        self._send = send
+        self.lock = asyncio.Lock()
+        self.channels: set[str] = set()
+        self.pending: dict[str, Counter] = {}
+        self.ready = asyncio.Event()
+
+    async def send_json(self, data) -> None:
+        await self.send_text(json.dumps(data))
+
+    async def send_text(self, text: str) -> None:
+        async with self.lock, asyncio.timeout(settings.CASES_LIVE_SEND_TIMEOUT):
+            await self._send({"type": "websocket.send", "text": text})
+
+    def add(self, channel: str, counts: dict[str, int]) -> None:
+        if channel in self.channels:
+            self.pending.setdefault(channel, Counter()).update(counts)
+            self.ready.set()
+
+    async def run(self) -> None:
+        while True:
+            await self.ready.wait()
+            self.ready.clear()
+            pending, self.pending = self.pending, {}
+            updates = []
+            for channel, counts in pending.items():
+                disease_id, location_id = _channel_ids(channel)
+                updates.append(
+                    {
+                        "disease": disease_id,
+                        "location": location_id,
+                        "counts": dict(sorted(counts.items())),
+                    },
+                )
+            if updates:
+                await self.send_json({"type": "counts", "updates": updates})
+            await asyncio.sleep(settings.CASES_LIVE_INTERVAL)
+
+    async def _refusal(self, disease_id: int, location_id: int) -> str | None:
+        if not await Disease.objects.filter(pk=disease_id).aexists():
+            return "Unknown disease."
+        path = await (
+            Location.objects.filter(pk=location_id)
+            .values_list("path", flat=True)
+            .afirst()
+        )
+        if path is None:
+            return "Unknown location."
+        scope = (await auser_grants(self.user)).scope
+        if scope is not None and not any(
+            pk == location_id or (prefix and path.startswith(prefix))
+            for pk, prefix in scope
+        ):
+            return "You cannot follow this location."
+        return None
+
+    async def subscribe(self, disease_id: int, location_id: int) -> str | None:
+        """Follow a channel; returns an error message if it is refused."""
+        channel = channel_name(disease_id, location_id)
+        if channel in self.channels:
+            return None
+        if not settings.CASES_LIVE_REDIS_URL:
+            return "Live case counts are not available."
+        if len(self.channels) >= settings.CASES_LIVE_MAX_SUBSCRIPTIONS:
+            return "Too many subscriptions."
+        if refusal := await self._refusal(disease_id, location_id):
+            return refusal
+        self.channels.add(channel)
+        try:
+            await get_hub().subscribe(channel, self)
+        except RedisError:
+            self.channels.discard(channel)
+            logger.warning("Could not subscribe to %s", channel, exc_info=True)
+            return "Live case counts are not available."
+        return None
+
+    async def unsubscribe(self, disease_id: int, location_id: int) -> None:
+        channel = channel_name(disease_id, location_id)
+        if channel in self.channels:
+            self.channels.discard(channel)
+            self.pending.pop(channel, None)
+            await get_hub().unsubscribe(channel, self)
+
+    async def close(self) -> None:
+        """Drop every subscription of the connection."""
+        hub = get_hub() if self.channels else None
+        for channel in list(self.channels):
+            try:
+                await hub.unsubscribe(channel, self)
+            except RedisError:
+                logger.warning("Could not unsubscribe from %s", channel)
+        self.channels.clear()
+        self.pending.clear()
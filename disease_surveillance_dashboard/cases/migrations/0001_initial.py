@@ -0,0 +1,38 @@
+# Generated by Django 5.2.10 on 2026-10-17 18:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('reference_data', '0005_name_search_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('onset_date', models.DateField(blank=True, null=True, verbose_name='Onset Date')),
+                ('report_date', models.DateField(verbose_name='Report Date')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('disease', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='case_reports', to='reference_data.disease', verbose_name='Disease')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='case_reports', to='reference_data.location', verbose_name='Location')),
+                ('reported_by', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='case_reports', to=settings.AUTH_USER_MODEL, verbose_name='Reported By')),
+            ],
+            options={
+                'verbose_name': 'Case Report',
+                'verbose_name_plural': 'Case Reports',
+                'db_table': 'case_reports',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['disease', 'report_date'], name='case_report_disease_9c2cda_idx'), models.Index(fields=['location', 'report_date'], name='case_report_locatio_15a815_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(('onset_date__isnull', True), ('onset_date__lte', models.F('report_date')), _connector='OR'), name='case_onset_not_after_report')],
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+"""Rebuild case_reports as a table partitioned by RANGE (report_date)."""
+
+from django.db import migrations
+
+# Postgres requires the partition key in the primary key, so the table's key
+# becomes (id, report_date); ids still come from a single identity sequence
+# and stay unique, which is all the ORM relies on.
+PARTITION_SQL = """
+CREATE TABLE case_reports_partitioned (
+    id bigint GENERATED BY DEFAULT AS IDENTITY,
+    onset_date date NULL,
+    report_date date NOT NULL,
+    created_at timestamp with time zone NOT NULL,
+    disease_id bigint NOT NULL,
+    location_id bigint NOT NULL,
+    reported_by_id bigint NOT NULL,
+    PRIMARY KEY (id, report_date)
+) PARTITION BY RANGE (report_date);
+CREATE TABLE case_reports_default PARTITION OF case_reports_partitioned DEFAULT;
+
+INSERT INTO case_reports_partitioned
+       (id, onset_date, report_date, created_at, disease_id, location_id, reported_by_id)
+OVERRIDING SYSTEM VALUE
+SELECT id, onset_date, report_date, created_at, disease_id, location_id, reported_by_id
+  FROM case_reports;
+SELECT setval(
+    pg_get_serial_sequence('case_reports_partitioned', 'id'),
+    COALESCE(max(id), 0) + 1,
+    false
+) FROM case_reports_partitioned;
+
+DROP TABLE case_reports;
+ALTER TABLE case_reports_partitioned RENAME TO case_reports;
+ALTER SEQUENCE case_reports_partitioned_id_seq RENAME TO case_reports_id_seq;
+ALTER INDEX case_reports_partitioned_pkey RENAME TO case_reports_pkey;
+
+ALTER TABLE case_reports ADD CONSTRAINT case_onset_not_after_report
+    CHECK (onset_date IS NULL OR onset_date <= report_date);
+ALTER TABLE case_reports ADD CONSTRAINT case_reports_disease_id_31b8b3d9_fk_diseases_id
+    FOREIGN KEY (disease_id) REFERENCES diseases (id) DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE case_reports ADD CONSTRAINT case_reports_location_id_40e7b0f6_fk_locations_id
+    FOREIGN KEY (location_id) REFERENCES locations (id) DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE case_reports ADD CONSTRAINT case_reports_reported_by_id_6d5a590d_fk_users_user_id
+    FOREIGN KEY (reported_by_id) REFERENCES users_user (id) DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX case_reports_disease_id_31b8b3d9 ON case_reports (disease_id);
+CREATE INDEX case_reports_location_id_40e7b0f6 ON case_reports (location_id);
+CREATE INDEX case_reports_reported_by_id_6d5a590d ON case_reports (reported_by_id);
+CREATE INDEX case_report_disease_9c2cda_idx ON case_reports (disease_id, report_date);
+CREATE INDEX case_report_locatio_15a815_idx ON case_reports (location_id, report_date);
+"""
+
+
+def create_partitions(apps, schema_editor):
+    """Create the current partitions and move existing rows into them."""
+    from disease_surveillance_dashboard.cases.partitions import (  # noqa: PLC0415
+        ensure_partitions,
+    )
+
+    ensure_partitions()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cases", "0001_initial"),
+    ]
+
+    operations = [
+        # Model state is unchanged; reversing leaves the partitioned table,
+        # which 0001's reversal drops like any other.
+        migrations.RunSQL(PARTITION_SQL, migrations.RunSQL.noop),
+        migrations.RunPython(create_partitions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class CaseReport(models.Model):
+    """A single reported case of a disease at a location."""
+
+    disease = models.ForeignKey(
+        "reference_data.Disease",
+        on_delete=models.PROTECT,
+        related_name="case_reports",
+        verbose_name=_("Disease"),
+    )
+    location = models.ForeignKey(
+        "reference_data.Location",
+        on_delete=models.PROTECT,
+        related_name="case_reports",
+        verbose_name=_("Location"),
+    )
+    reported_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name="case_reports",
+        verbose_name=_("Reported By"),
+    )
+    onset_date = models.DateField(_("Onset Date"), null=True, blank=True)
+    report_date = models.DateField(_("Report Date"))
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+
+    class Meta:
+        db_table = "case_reports"
+        verbose_name = _("Case Report")
+        verbose_name_plural = _("Case Reports")
+        ordering = ["-id"]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(onset_date__isnull=True)
+                | models.Q(onset_date__lte=models.F("report_date")),
+                name="case_onset_not_after_report",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["disease", "report_date"]),
+            models.Index(fields=["location", "report_date"]),
+        ]
+
+    def __str__(self) -> str:
+        """Return disease, location and report date as string representation."""
+        return f"{self.disease} - {self.location} ({self.report_date})"
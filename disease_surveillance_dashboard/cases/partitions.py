@@ -0,0 +1,178 @@
+"""
+Maintenance of the ``case_reports`` range partitions.
+
+Case reports are partitioned on ``report_date`` into periods of
+``CASES_PARTITION_MONTHS`` months, named after their first day
+(``case_reports_p20240301``). Rows outside every period land in the default
+partition; creating a period's partition moves its rows out of the default.
+Partitions that end before the retention window are detached and moved to
+``CASES_ARCHIVE_SCHEMA``, where they can still be queried or re-attached.
+"""
+
+import datetime
+import re
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import CaseReport
+
+PARENT_TABLE = CaseReport._meta.db_table  # noqa: SLF001
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+# Serializes maintenance runs; any constant shared by all callers works.
+LOCK_KEY = 0x63617365
+
+_BOUND_RE = re.compile(r"FROM \('([\d-]+)'\) TO \('([\d-]+)'\)")
+
+LIST_PARTITIONS_SQL = """
+    SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+      FROM pg_inherits
+      JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+     WHERE pg_inherits.inhparent = %s::regclass
+"""
+
+
+class Partition(NamedTuple):
+    name: str
+    start: datetime.date
+    end: datetime.date
+
+
+def add_months(day: datetime.date, months: int) -> datetime.date:
+    """Return the first day of the month ``months`` after ``day``'s month."""
+    index = day.year * 12 + day.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def period_start(day: datetime.date, months: int | None = None) -> datetime.date:
+    """Return the first day of the partition period containing ``day``."""
+    months = months or settings.CASES_PARTITION_MONTHS
+    index = day.year * 12 + day.month - 1
+    index -= index % months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def list_partitions() -> list[Partition]:
+    """Return the attached range partitions, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(LIST_PARTITIONS_SQL, [PARENT_TABLE])
+        rows = cursor.fetchall()
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND_RE.search(bound)
+        if match:
+            start, end = map(datetime.date.fromisoformat, match.groups())
+            partitions.append(Partition(name, start, end))
+    return sorted(partitions, key=lambda partition: partition.start)
+
+
+def _lock(cursor) -> None:
+    cursor.execute("SELECT pg_advisory_xact_lock(%s)", [LOCK_KEY])
+
+
+def _create_partition(cursor, start: datetime.date, end: datetime.date) -> str:
+    name = f"{PARENT_TABLE}_p{start:%Y%m%d}"
+    qn = connection.ops.quote_name
+    cursor.execute(
+        f"SELECT EXISTS (SELECT 1 FROM {qn(DEFAULT_PARTITION)} "  # noqa: S608
+        "WHERE report_date >= %s AND report_date < %s)",
+        [start, end],
+    )
+    if not cursor.fetchone()[0]:
+        cursor.execute(
+            f"CREATE TABLE {qn(name)} PARTITION OF {qn(PARENT_TABLE)} "
+            "FOR VALUES FROM (%s) TO (%s)",
+            [start, end],
+        )
+        return name
+    # The default partition already holds rows for this period, which would
+    # violate the new bound: build the table standalone, move the rows into
+    # it, then attach it.
+    cursor.execute(
+        f"CREATE TABLE {qn(name)} (LIKE {qn(PARENT_TABLE)} "
+        "INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+    )
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} "  # noqa: S608
+        "WHERE report_date >= %s AND report_date < %s RETURNING *) "
+        f"INSERT INTO {qn(name)} SELECT * FROM moved",
+        [start, end],
+    )
+    cursor.execute(
+        f"ALTER TABLE {qn(PARENT_TABLE)} ATTACH PARTITION {qn(name)} "
+        "FOR VALUES FROM (%s) TO (%s)",
+        [start, end],
+    )
+    return name
+
+
+def retention_cutoff(today: datetime.date | None = None) -> datetime.date | None:
+    """Return the date before which partitions are archived, if any."""
+    if not settings.CASES_RETENTION_MONTHS:
+        return None
+    today = today or timezone.localdate()
+    return period_start(add_months(today, -settings.CASES_RETENTION_MONTHS))
+
+
+def ensure_partitions(today: datetime.date | None = None) -> list[str]:
+    """
+    Create the partitions for the current period and the next ones.
+
+    ``CASES_PARTITIONS_AHEAD`` future periods are kept ready. Periods that
+    already hold rows in the default partition (backfilled or late reports)
+    are created too, as far back as the retention window. A period that
+    overlaps an existing partition, e.g. after changing
+    ``CASES_PARTITION_MONTHS``, is skipped.
+    """
+    months = settings.CASES_PARTITION_MONTHS
+    today = today or timezone.localdate()
+    first = period_start(today)
+    last = add_months(first, months * settings.CASES_PARTITIONS_AHEAD)
+    cutoff = retention_cutoff(today)
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        _lock(cursor)
+        cursor.execute(
+            "SELECT min(report_date) FROM "  # noqa: S608
+            f"{connection.ops.quote_name(DEFAULT_PARTITION)}",
+        )
+        oldest = cursor.fetchone()[0]
+        if oldest is not None:
+            oldest = max(oldest, cutoff) if cutoff else oldest
+            first = min(first, period_start(oldest))
+
+        existing = list_partitions()
+        start = first
+        while start <= last:
+            end = add_months(start, months)
+            if not any(p.start < end and start < p.end for p in existing):
+                created.append(_create_partition(cursor, start, end))
+            start = end
+    return created
+
+
+def archive_partitions(today: datetime.date | None = None) -> list[str]:
+    """Detach partitions older than the retention window into the archive schema."""
+    cutoff = retention_cutoff(today)
+    if cutoff is None:
+        return []
+    qn = connection.ops.quote_name
+    schema = settings.CASES_ARCHIVE_SCHEMA
+    archived = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        _lock(cursor)
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {qn(schema)}")
+        for partition in list_partitions():
+            if partition.end > cutoff:
+                continue
+            # DETACH ... CONCURRENTLY is not allowed alongside a default
+            # partition; a plain detach only holds the lock briefly.
+            cursor.execute(
+                f"ALTER TABLE {qn(PARENT_TABLE)} DETACH PARTITION {qn(partition.name)}",
+            )
+            cursor.execute(f"ALTER TABLE {qn(partition.name)} SET SCHEMA {qn(schema)}")
+            archived.append(partition.name)
+    return archived
@@ -0,0 +1,10 @@
+from celery import shared_task
+
+from .partitions import archive_partitions
+from .partitions import ensure_partitions
+
+
+@shared_task()
+def maintain_case_partitions():
+    """Create upcoming case report partitions and archive expired ones."""
+    return {"created": ensure_partitions(), "archived": archive_partitions()}
@@ -0,0 +1,365 @@
+"""Tests for case report API endpoints."""
+
+import csv
+import datetime
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from disease_surveillance_dashboard.access_control.models import Role
+from disease_surveillance_dashboard.access_control.models import UserRole
+from disease_surveillance_dashboard.utils.testing import assert_constant_queries
+from reference_data.models import Disease
+from reference_data.models import Location
+
+from ..models import CaseReport
+
+User = get_user_model()
+
+
+class CaseReportAPITestCase(APITestCase):
+    """Test cases for CaseReport API endpoints."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="reporter@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.disease = Disease.objects.create(disease_name="Cholera")
+        self.location = Location.objects.create(district_name="Accra")
+        self.api_url = "/api/v1/cases/"
+
+    def test_create_records_reporter(self):
+        """Test creating a single case report."""
+        data = {
+            "disease": self.disease.id,
+            "location": self.location.id,
+            "onset_date": "2024-03-01",
+            "report_date": "2024-03-04",
+        }
+        response = self.client.post(self.api_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["reported_by"], self.user.id)
+
+    def test_create_rejects_onset_after_report(self):
+        """Test that onset must not follow the report date."""
+        data = {
+            "disease": self.disease.id,
+            "location": self.location.id,
+            "onset_date": "2024-03-05",
+            "report_date": "2024-03-04",
+        }
+        response = self.client.post(self.api_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("onset_date", response.data)
+
+    def test_reports_are_append_only(self):
+        """Test that case reports cannot be edited or deleted."""
+        case = CaseReport.objects.create(
+            disease=self.disease,
+            location=self.location,
+            reported_by=self.user,
+            report_date=datetime.date(2024, 3, 4),
+        )
+        url = f"{self.api_url}{case.id}/"
+        self.assertEqual(
+            self.client.delete(url).status_code,
+            status.HTTP_405_METHOD_NOT_ALLOWED,
+        )
+        self.assertEqual(
+            self.client.patch(url, {"report_date": "2024-03-05"}).status_code,
+            status.HTTP_405_METHOD_NOT_ALLOWED,
+        )
+
+
+class CaseReportBulkTestCase(APITestCase):
+    """Test cases for the bulk ingestion endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="reporter@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.diseases = [
+            Disease.objects.create(disease_name=name) for name in ("Cholera", "Measles")
+        ]
+        self.locations = [
+            Location.objects.create(district_name=f"District {i}") for i in range(3)
+        ]
+        self.inactive = Location.objects.create(district_name="Closed", is_active=False)
+        self.api_url = "/api/v1/cases/bulk/"
+
+    def _row(self, i, **overrides):
+        return {
+            "disease": self.diseases[i % 2].id,
+            "location": self.locations[i % 3].id,
+            "onset_date": "2024-03-01",
+            "report_date": "2024-03-02",
+            **overrides,
+        }
+
+    def test_bulk_inserts_with_constant_queries(self):
+        """Test that query count does not grow with the batch size."""
+        self.client.post(self.api_url, [self._row(0)], format="json")
+
+        rows = [self._row(i) for i in range(500)]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.api_url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 500)
+        self.assertEqual(CaseReport.objects.count(), 501)
+        self.assertEqual(
+            CaseReport.objects.filter(reported_by=self.user).count(),
+            501,
+        )
+        # Warm id sets: no reference lookups, and a single INSERT.
+        sql = [q["sql"] for q in ctx.captured_queries]
+        self.assertFalse([s for s in sql if '"diseases"' in s or '"locations"' in s])
+        self.assertEqual(len([s for s in sql if s.startswith("INSERT")]), 1)
+
+    def test_bulk_reports_invalid_rows(self):
+        """Test that invalid rows are skipped and reported by index."""
+        rows = [
+            self._row(0),
+            self._row(1, disease=999999),
+            self._row(2, location=self.inactive.id),
+            self._row(3, report_date="03/02/2024"),
+            self._row(4, onset_date="2024-03-09"),
+            self._row(5, report_date="2999-01-01", onset_date=None),
+            "not an object",
+        ]
+        response = self.client.post(self.api_url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["error_count"], 6)
+        errors = {e["index"]: e["errors"] for e in response.data["errors"]}
+        self.assertEqual(set(errors), {1, 2, 3, 4, 5, 6})
+        self.assertIn("disease", errors[1])
+        self.assertIn("location", errors[2])
+        self.assertIn("report_date", errors[3])
+        self.assertIn("onset_date", errors[4])
+        self.assertIn("report_date", errors[5])
+
+    def test_new_reference_rows_are_accepted(self):
+        """Test that the cached id sets follow reference data writes."""
+        self.client.post(self.api_url, [self._row(0)], format="json")
+        location = Location.objects.create(district_name="New District")
+        response = self.client.post(
+            self.api_url,
+            [self._row(0, location=location.id)],
+            format="json",
+        )
+        self.assertEqual(response.data["created"], 1)
+
+    def test_stale_id_set_conflicts(self):
+        """Test that a row deleted behind the cache's back is caught."""
+        self.client.post(self.api_url, [self._row(0)], format="json")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM locations WHERE id = %s",
+                [self.locations[1].id],
+            )
+        response = self.client.post(self.api_url, [self._row(1)], format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(CaseReport.objects.count(), 1)
+
+    def test_bulk_requires_a_list(self):
+        """Test that a non-list body is rejected."""
+        response = self.client.post(self.api_url, self._row(0), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CaseExportTestCase(APITestCase):
+    """Test cases for the streamed line-list export."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="reporter@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.cholera = Disease.objects.create(disease_name="Cholera")
+        self.measles = Disease.objects.create(disease_name="Measles")
+        self.region = Location.objects.create(
+            district_name="Greater Accra",
+            level=Location.Level.REGION,
+        )
+        self.accra = Location.objects.create(
+            district_name="Accra",
+            area_name="Osu",
+            parent=self.region,
+        )
+        self.tema = Location.objects.create(district_name="Tema")
+        self.api_url = "/api/v1/cases/export/"
+
+    def _report(self, disease, location, day=4):
+        return CaseReport.objects.create(
+            disease=disease,
+            location=location,
+            reported_by=self.user,
+            onset_date=datetime.date(2024, 3, 1),
+            report_date=datetime.date(2024, 3, day),
+        )
+
+    def _export(self, params=None, client=None):
+        response = (client or self.client).get(self.api_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_csv_joins_names(self):
+        """Test that the CSV export carries the disease and location names."""
+        first = self._report(self.cholera, self.accra)
+        second = self._report(self.measles, self.tema, day=5)
+        response, body = self._export({"format": "csv"})
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="cases.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual([row["id"] for row in rows], [str(first.id), str(second.id)])
+        self.assertEqual(
+            rows[0],
+            {
+                "id": str(first.id),
+                "disease": str(self.cholera.id),
+                "disease_name": "Cholera",
+                "location": str(self.accra.id),
+                "district_name": "Accra",
+                "area_name": "Osu",
+                "reported_by": str(self.user.id),
+                "onset_date": "2024-03-01",
+                "report_date": "2024-03-04",
+                "created_at": self.client.get(f"/api/v1/cases/{first.id}/").data[
+                    "created_at"
+                ],
+            },
+        )
+
+    def test_ndjson(self):
+        """Test the NDJSON export, negotiated by format or Accept header."""
+        case = self._report(self.cholera, self.tema)
+        for params, headers in (
+            ({"format": "ndjson"}, {}),
+            ({}, {"Accept": "application/x-ndjson"}),
+        ):
+            with self.subTest(params=params, headers=headers):
+                response = self.client.get(self.api_url, params, headers=headers)
+                self.assertEqual(response["Content-Type"], "application/x-ndjson")
+                lines = b"".join(response.streaming_content).decode().splitlines()
+                self.assertEqual(len(lines), 1)
+                row = json.loads(lines[0])
+                self.assertEqual(row["id"], case.id)
+                self.assertEqual(row["disease_name"], "Cholera")
+                self.assertIsNone(row["area_name"])
+
+    def test_filters(self):
+        """Test the disease, location subtree and report date filters."""
+        accra = self._report(self.cholera, self.accra, day=4)
+        tema = self._report(self.cholera, self.tema, day=6)
+        measles = self._report(self.measles, self.accra, day=8)
+        for params, expected in (
+            ({"disease": self.cholera.id}, [accra, tema]),
+            ({"location": self.region.id}, [accra, measles]),
+            ({"start": "2024-03-05", "end": "2024-03-07"}, [tema]),
+        ):
+            with self.subTest(params=params):
+                _, body = self._export({"format": "csv", **params})
+                rows = csv.DictReader(io.StringIO(body))
+                self.assertEqual(
+                    [int(row["id"]) for row in rows],
+                    [case.id for case in expected],
+                )
+
+    def test_scoped_to_user_locations(self):
+        """Test that scoped users export only their locations' cases."""
+        inside = self._report(self.cholera, self.accra)
+        self._report(self.cholera, self.tema)
+        role = Role.objects.create(role_name="DISTRICT_OFFICER")
+        UserRole.objects.create(user=self.user, role=role, location=self.region)
+        _, body = self._export({"format": "ndjson"})
+        self.assertEqual(
+            [json.loads(line)["id"] for line in body.splitlines()],
+            [inside.id],
+        )
+
+    @override_settings(CASES_EXPORT_CHUNK_SIZE=2)
+    def test_streams_with_constant_queries(self):
+        """Test that the export streams in chunks from one cursor query."""
+        self._report(self.cholera, self.accra)
+
+        def export():
+            response = self.client.get(self.api_url, {"format": "csv"})
+            self.chunks = list(response.streaming_content)
+
+        def grow():
+            for day in range(1, 8):
+                self._report(self.measles, self.tema, day=day)
+
+        export()  # Caches the user's grants.
+        assert_constant_queries(export, grow, budget=1)
+        self.assertEqual(len(self.chunks), 5)
+
+    def test_invalid_parameters(self):
+        """Test that bad filters are rejected in the requested format."""
+        response = self.client.get(
+            self.api_url,
+            {"format": "csv", "start": "2024-03-05", "end": "2024-03-01"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertEqual(
+            list(csv.reader(io.StringIO(response.content.decode()))),
+            [["start"], ["Must not be after end."]],
+        )
+        response = self.client.get(self.api_url, {"format": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CaseExportAsyncTestCase(TestCase):
+    """Test cases for the export served through the ASGI handler."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="reporter@example.com",
+            password="testpass123",
+        )
+        disease = Disease.objects.create(disease_name="Cholera")
+        location = Location.objects.create(district_name="Accra")
+        self.cases = [
+            CaseReport.objects.create(
+                disease=disease,
+                location=location,
+                reported_by=self.user,
+                report_date=datetime.date(2024, 3, day),
+            )
+            for day in range(1, 6)
+        ]
+
+    @override_settings(CASES_EXPORT_CHUNK_SIZE=2)
+    async def test_streams_async_generator(self):
+        """Test that ASGI responses stream an async generator, chunk by chunk."""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(
+            "/api/v1/cases/export/",
+            {"format": "ndjson"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), 3)
+        lines = b"".join(chunks).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line)["id"] for line in lines],
+            [case.id for case in self.cases],
+        )
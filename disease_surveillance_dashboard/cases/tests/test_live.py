@@ -0,0 +1,314 @@
+"""Tests for live case counts and the websocket endpoint."""
+
+import asyncio
+import datetime
+import json
+from collections import Counter
+from unittest import mock
+
+import fakeredis
+import redis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from config.websocket import websocket_application
+from disease_surveillance_dashboard.access_control.models import Role
+from disease_surveillance_dashboard.access_control.models import UserRole
+from reference_data.models import Disease
+from reference_data.models import Location
+
+from .. import live
+
+User = get_user_model()
+REDIS_URL = "redis://live-test:6379/0"
+
+
+class FakeRedisMixin:
+    """Run live counts against an in-process Redis."""
+
+    def setUp(self):
+        """Point the live counts at fakeredis."""
+        super().setUp()
+        self.enterContext(override_settings(CASES_LIVE_REDIS_URL=REDIS_URL))
+        self.enterContext(mock.patch.object(live, "Redis", fakeredis.FakeRedis))
+        self.enterContext(
+            mock.patch.object(live, "AsyncRedis", fakeredis.FakeAsyncRedis),
+        )
+        self.addCleanup(live._publisher.cache_clear)  # noqa: SLF001
+        self.redis = fakeredis.FakeRedis.from_url(REDIS_URL, decode_responses=True)
+
+    def listen(self, *channels):
+        pubsub = self.redis.pubsub()
+        pubsub.subscribe(*channels)
+        self.addCleanup(pubsub.close)
+        for _ in channels:
+            self.assertEqual(pubsub.get_message(timeout=1)["type"], "subscribe")
+        return pubsub
+
+
+def messages(pubsub) -> dict:
+    received = {}
+    while message := pubsub.get_message(timeout=0.1):
+        received[message["channel"]] = json.loads(message["data"])
+    return received
+
+
+class PublishTestCase(FakeRedisMixin, APITestCase):
+    """Test cases for publishing the counts of new case reports."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.user = User.objects.create_user(
+            email="reporter@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.disease = Disease.objects.create(disease_name="Cholera")
+        self.district = Location.objects.create(district_name="Accra")
+        self.area = Location.objects.create(
+            district_name="Accra",
+            area_name="Osu",
+            parent=self.district,
+        )
+
+    def test_bulk_ingest_publishes_after_commit(self):
+        """Test that counts reach the location's and its ancestors' channels."""
+        pubsub = self.listen(
+            live.channel_name(self.disease.id, self.district.id),
+            live.channel_name(self.disease.id, self.area.id),
+        )
+        data = [
+            {"disease": self.disease.id, "location": location.id, "report_date": day}
+            for location, day in (
+                (self.area, "2024-03-04"),
+                (self.area, "2024-03-04"),
+                (self.district, "2024-03-05"),
+            )
+        ]
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post("/api/v1/cases/bulk/", data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(messages(pubsub), {})
+        for callback in callbacks:
+            callback()
+        self.assertEqual(
+            messages(pubsub),
+            {
+                live.channel_name(self.disease.id, self.district.id): {
+                    "2024-03-04": 2,
+                    "2024-03-05": 1,
+                },
+                live.channel_name(self.disease.id, self.area.id): {"2024-03-04": 2},
+            },
+        )
+
+    def test_create_publishes(self):
+        """Test that single reports are published too."""
+        pubsub = self.listen(live.channel_name(self.disease.id, self.area.id))
+        data = {
+            "disease": self.disease.id,
+            "location": self.area.id,
+            "report_date": "2024-03-04",
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/v1/cases/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(list(messages(pubsub).values()), [{"2024-03-04": 1}])
+
+    @override_settings(CASES_LIVE_REDIS_URL="redis://127.0.0.1:1/0")
+    def test_redis_errors_are_logged(self):
+        """Test that an unreachable Redis does not fail the commit."""
+        self.enterContext(mock.patch.object(live, "Redis", redis.Redis))
+        counts = Counter(
+            {(self.disease.id, self.area.id, datetime.date(2024, 3, 4)): 1},
+        )
+        with self.assertLogs(live.logger, "WARNING"):
+            live.publish_counts(counts)
+
+
+class WebsocketClient:
+    """Drive the websocket application as an ASGI server would."""
+
+    def __init__(self, query_string=b"", headers=()):
+        self.scope = {
+            "type": "websocket",
+            "query_string": query_string,
+            "headers": list(headers),
+        }
+        self.received = asyncio.Queue()
+        self.sent = asyncio.Queue()
+        self.send_delay = 0
+
+    async def _send(self, event):
+        if event["type"] == "websocket.send":
+            await asyncio.sleep(self.send_delay)
+        await self.sent.put(event)
+
+    async def connect(self) -> dict:
+        self.task = asyncio.create_task(
+            websocket_application(self.scope, self.received.get, self._send),
+        )
+        await self.received.put({"type": "websocket.connect"})
+        return await self.next_event()
+
+    async def next_event(self, wait=2) -> dict:
+        async with asyncio.timeout(wait):
+            return await self.sent.get()
+
+    async def request(self, message) -> dict:
+        text = message if isinstance(message, str) else json.dumps(message)
+        await self.received.put({"type": "websocket.receive", "text": text})
+        event = await self.next_event()
+        return event["text"] if text == "ping" else json.loads(event["text"])
+
+    async def disconnect(self):
+        await self.received.put({"type": "websocket.disconnect", "code": 1000})
+        await self.task
+
+
+@override_settings(CASES_LIVE_INTERVAL=0.2, CASES_LIVE_SEND_TIMEOUT=0.5)
+class WebsocketTestCase(FakeRedisMixin, TestCase):
+    """Test cases for following live counts over the websocket endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        super().setUp()
+        self.user = User.objects.create_user(
+            email="analyst@example.com",
+            password="testpass123",
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.disease = Disease.objects.create(disease_name="Cholera")
+        self.region = Location.objects.create(
+            district_name="Greater Accra",
+            level=Location.Level.REGION,
+        )
+        self.district = Location.objects.create(
+            district_name="Accra",
+            parent=self.region,
+        )
+        self.other = Location.objects.create(district_name="Tamale")
+
+    def publish(self, location, day, count=1):
+        return sync_to_async(live.publish_counts)(
+            Counter(
+                {(self.disease.id, location.id, datetime.date(2024, 3, day)): count},
+            ),
+        )
+
+    async def connect(self) -> WebsocketClient:
+        client = WebsocketClient(f"token={self.token.key}".encode())
+        self.assertEqual((await client.connect())["type"], "websocket.accept")
+        return client
+
+    def subscription(self, location) -> dict:
+        return {"disease": self.disease.id, "location": location.id}
+
+    async def test_ping(self):
+        """Test that the endpoint still answers pings."""
+        client = await self.connect()
+        self.assertEqual(await client.request("ping"), "pong!")
+        await client.disconnect()
+
+    async def test_rejects_unauthenticated(self):
+        """Test that handshakes without a valid token or session are refused."""
+        for query_string in (b"", b"token=invalid"):
+            with self.subTest(query_string=query_string):
+                client = WebsocketClient(query_string)
+                event = await client.connect()
+                self.assertEqual(event["type"], "websocket.close")
+                await client.task
+
+    async def test_session_cookie(self):
+        """Test that session cookies are accepted from the site's own pages."""
+        await self.async_client.aforce_login(self.user)
+        cookie = self.async_client.cookies[settings.SESSION_COOKIE_NAME]
+        headers = [
+            (b"host", b"testserver"),
+            (b"cookie", cookie.OutputString().encode()),
+        ]
+        for origin, accepted in (
+            (b"http://testserver", "websocket.accept"),
+            (b"https://evil.example", "websocket.close"),
+        ):
+            with self.subTest(origin=origin):
+                client = WebsocketClient(headers=[*headers, (b"origin", origin)])
+                self.assertEqual((await client.connect())["type"], accepted)
+                if accepted == "websocket.accept":
+                    await client.disconnect()
+                await client.task
+
+    async def test_coalesced_counts(self):
+        """Test that deltas within an interval arrive as one update."""
+        client = await self.connect()
+        subscription = self.subscription(self.region)
+        reply = await client.request({"action": "subscribe", **subscription})
+        self.assertEqual(reply, {"type": "subscribed", **subscription})
+
+        await self.publish(self.district, 4)
+        first = json.loads((await client.next_event())["text"])
+        self.assertEqual(
+            first,
+            {
+                "type": "counts",
+                "updates": [{**subscription, "counts": {"2024-03-04": 1}}],
+            },
+        )
+        await self.publish(self.district, 4, count=2)
+        await self.publish(self.region, 5)
+        await self.publish(self.other, 5)
+        second = json.loads((await client.next_event())["text"])
+        self.assertEqual(
+            second["updates"],
+            [{**subscription, "counts": {"2024-03-04": 2, "2024-03-05": 1}}],
+        )
+
+        reply = await client.request({"action": "unsubscribe", **subscription})
+        self.assertEqual(reply["type"], "unsubscribed")
+        await self.publish(self.district, 4)
+        with self.assertRaises(TimeoutError):
+            await client.next_event(wait=0.5)
+        await client.disconnect()
+        self.assertEqual(live.get_hub().subscribers, {})
+
+    async def test_subscriptions_are_checked(self):
+        """Test that unknown ids and locations outside the scope are refused."""
+        role = await Role.objects.acreate(role_name="DISTRICT_OFFICER")
+        await UserRole.objects.acreate(user=self.user, role=role, location=self.region)
+        client = await self.connect()
+        for message, detail in (
+            ({"action": "subscribe", "disease": "1", "location": 1}, "Expected"),
+            ({"action": "follow", **self.subscription(self.region)}, "Unknown"),
+            ({"action": "subscribe", "disease": 0, "location": 1}, "Unknown disease"),
+            (
+                {"action": "subscribe", **self.subscription(self.other)},
+                "cannot follow",
+            ),
+        ):
+            with self.subTest(message=message):
+                reply = await client.request(message)
+                self.assertEqual(reply["type"], "error")
+                self.assertIn(detail, reply["detail"])
+        reply = await client.request(
+            {"action": "subscribe", **self.subscription(self.district)},
+        )
+        self.assertEqual(reply["type"], "subscribed")
+        await client.disconnect()
+
+    async def test_slow_clients_are_closed(self):
+        """Test that a client not taking updates is disconnected."""
+        client = await self.connect()
+        await client.request({"action": "subscribe", **self.subscription(self.region)})
+        client.send_delay = 1
+        await self.publish(self.district, 4)
+        await client.task
+        event = await client.next_event()
+        self.assertEqual(event, {"type": "websocket.close", "code": 1013})
+        self.assertEqual(live.get_hub().subscribers, {})
@@ -0,0 +1,150 @@
+"""Tests for case report partition maintenance."""
+
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test import override_settings
+
+from reference_data.models import Disease
+from reference_data.models import Location
+
+from ..models import CaseReport
+from ..partitions import DEFAULT_PARTITION
+from ..partitions import add_months
+from ..partitions import archive_partitions
+from ..partitions import ensure_partitions
+from ..partitions import list_partitions
+from ..partitions import period_start
+from ..tasks import maintain_case_partitions
+
+User = get_user_model()
+TODAY = datetime.date(2024, 5, 20)
+
+
+class PeriodTestCase(TestCase):
+    """Test cases for period arithmetic."""
+
+    def test_period_start_aligns_to_interval(self):
+        """Test that periods start on multiples of the interval."""
+        self.assertEqual(period_start(TODAY, 1), datetime.date(2024, 5, 1))
+        self.assertEqual(period_start(TODAY, 3), datetime.date(2024, 4, 1))
+        self.assertEqual(period_start(TODAY, 12), datetime.date(2024, 1, 1))
+
+    def test_add_months_crosses_years(self):
+        """Test month arithmetic across year boundaries."""
+        self.assertEqual(add_months(TODAY, 8), datetime.date(2025, 1, 1))
+        self.assertEqual(add_months(TODAY, -5), datetime.date(2023, 12, 1))
+
+
+@override_settings(
+    CASES_PARTITION_MONTHS=1,
+    CASES_PARTITIONS_AHEAD=2,
+    CASES_RETENTION_MONTHS=0,
+)
+class PartitionMaintenanceTestCase(TestCase):
+    """Test cases for creating and archiving partitions."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="reporter@example.com",
+            password="testpass123",
+        )
+        self.disease = Disease.objects.create(disease_name="Cholera")
+        self.location = Location.objects.create(district_name="Accra")
+        # Start from a table with only the default partition.
+        with connection.cursor() as cursor:
+            for partition in list_partitions():
+                cursor.execute(f'DROP TABLE "{partition.name}"')
+
+    def _report(self, report_date):
+        return CaseReport.objects.create(
+            disease=self.disease,
+            location=self.location,
+            reported_by=self.user,
+            report_date=report_date,
+        )
+
+    def _partition_of(self, case):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT tableoid::regclass::text FROM case_reports WHERE id = %s",
+                [case.id],
+            )
+            return cursor.fetchone()[0]
+
+    def test_creates_current_and_upcoming_partitions(self):
+        """Test that the current period and the next ones are created."""
+        created = ensure_partitions(TODAY)
+        self.assertEqual(
+            created,
+            [
+                "case_reports_p20240501",
+                "case_reports_p20240601",
+                "case_reports_p20240701",
+            ],
+        )
+        self.assertEqual(ensure_partitions(TODAY), [])
+
+    def test_moves_rows_out_of_default_partition(self):
+        """Test that backfilled rows move into their new partitions."""
+        old = self._report(datetime.date(2024, 2, 10))
+        current = self._report(datetime.date(2024, 5, 2))
+        self.assertEqual(self._partition_of(old), DEFAULT_PARTITION)
+
+        created = ensure_partitions(TODAY)
+        self.assertEqual(created[0], "case_reports_p20240201")
+        self.assertEqual(len(created), 6)
+        self.assertEqual(self._partition_of(old), "case_reports_p20240201")
+        self.assertEqual(self._partition_of(current), "case_reports_p20240501")
+        self.assertEqual(CaseReport.objects.count(), 2)
+
+    @override_settings(CASES_PARTITION_MONTHS=3)
+    def test_interval_is_configurable(self):
+        """Test quarterly partitions."""
+        created = ensure_partitions(TODAY)
+        self.assertEqual(created[0], "case_reports_p20240401")
+        bounds = {p.name: (p.start, p.end) for p in list_partitions()}
+        self.assertEqual(
+            bounds["case_reports_p20240401"],
+            (datetime.date(2024, 4, 1), datetime.date(2024, 7, 1)),
+        )
+
+    def test_date_range_queries_prune_partitions(self):
+        """Test that a recent-weeks query only scans matching partitions."""
+        self._report(datetime.date(2024, 2, 10))
+        ensure_partitions(TODAY)
+        queryset = CaseReport.objects.filter(
+            report_date__gte=TODAY - datetime.timedelta(weeks=8),
+            report_date__lt=TODAY,
+        )
+        plan = queryset.explain()
+        self.assertIn("case_reports_p20240501", plan)
+        self.assertIn("case_reports_p20240301", plan)
+        self.assertNotIn("case_reports_p20240201", plan)
+        self.assertNotIn(DEFAULT_PARTITION, plan)
+
+    @override_settings(CASES_RETENTION_MONTHS=2)
+    def test_archives_partitions_past_retention(self):
+        """Test that expired partitions are detached into the archive schema."""
+        old = self._report(datetime.date(2024, 2, 10))
+        ensure_partitions(datetime.date(2024, 3, 1))
+
+        archived = archive_partitions(TODAY)
+        self.assertEqual(archived, ["case_reports_p20240201"])
+        self.assertFalse(CaseReport.objects.filter(pk=old.pk).exists())
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM case_archive.case_reports_p20240201")
+            self.assertEqual(cursor.fetchone()[0], 1)
+        self.assertNotIn(
+            "case_reports_p20240201",
+            [p.name for p in list_partitions()],
+        )
+
+    def test_maintenance_task(self):
+        """Test that the beat task runs both maintenance steps."""
+        result = maintain_case_partitions()
+        self.assertEqual(len(result["created"]), 3)
+        self.assertEqual(result["archived"], [])
@@ -2,6 +2,7 @@ import pytest
 
 from disease_surveillance_dashboard.users.models import User
 from disease_surveillance_dashboard.users.tests.factories import UserFactory
+from disease_surveillance_dashboard.utils import testing
 
 
 @pytest.fixture(autouse=True)
@@ -12,3 +13,10 @@ def _media_storage(settings, tmpdir) -> None:
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
+
+
+@pytest.fixture
+def query_budget(db) -> type[testing.query_budget]:
+    """``with query_budget(n): ...`` fails if the block runs more than n queries."""
+    return testing.query_budget
+
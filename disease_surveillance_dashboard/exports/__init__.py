@@ -0,0 +1 @@
+"""Exports app writing columnar downloads of case data."""
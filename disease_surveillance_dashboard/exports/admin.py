@@ -0,0 +1,23 @@
+from django.contrib import admin
+
+from .models import ExportJob
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    """Admin interface for ExportJob model."""
+
+    list_display = [
+        "id",
+        "dataset",
+        "format",
+        "status",
+        "requested_by",
+        "row_count",
+        "created_at",
+        "finished_at",
+    ]
+    list_filter = ["dataset", "format", "status"]
+    list_select_related = ["requested_by"]
+    raw_id_fields = ["requested_by"]
+    readonly_fields = ["created_at", "started_at", "finished_at"]
@@ -0,0 +1,53 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from disease_surveillance_dashboard.cases.api.serializers import (
+    CaseExportQuerySerializer,
+)
+
+from ..models import ExportJob
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Serializer for ExportJob model."""
+
+    filters = CaseExportQuerySerializer(required=False)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            "id",
+            "dataset",
+            "format",
+            "filters",
+            "status",
+            "row_count",
+            "file_size",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "download_url",
+        ]
+        read_only_fields = [
+            "status",
+            "row_count",
+            "file_size",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+
+    def create(self, validated_data):
+        # The filters are stored as given, in a JSON field.
+        return ExportJob.objects.create(**validated_data)
+
+    def get_download_url(self, obj) -> str | None:
+        """Return the download link of a finished export."""
+        if obj.status != ExportJob.Status.SUCCEEDED:
+            return None
+        url = reverse("api:exportjob-download", kwargs={"pk": obj.pk})
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
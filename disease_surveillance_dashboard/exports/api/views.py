@@ -0,0 +1,62 @@
+from functools import partial
+from pathlib import PurePath
+
+from django.db import transaction
+from django.http import FileResponse
+from rest_framework import mixins
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from disease_surveillance_dashboard.utils.mixins import AtomicWriteMixin
+
+from ..columnar import MEDIA_TYPES
+from ..models import ExportJob
+from ..tasks import run_export
+from .serializers import ExportJobSerializer
+
+
+class ExportJobViewSet(
+    AtomicWriteMixin,
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    GenericViewSet,
+):
+    """
+    Columnar exports of case line lists and rollups, written in the background.
+
+    Usage: POST /api/exports/ {"dataset": "cases", "format": "parquet",
+    "filters": {"disease": [<id>], "start": "2024-01-01"}}, then poll the
+    job until ``download_url`` is set. Users see only their own jobs, and
+    exports are limited to their locations.
+    """
+
+    queryset = ExportJob.objects.all()
+    serializer_class = ExportJobSerializer
+    pagination_ordering = "-id"
+
+    def get_queryset(self):
+        return super().get_queryset().filter(requested_by=self.request.user)
+
+    def perform_create(self, serializer):
+        """Record the requesting user and queue the job once it is committed."""
+        job = serializer.save(requested_by=self.request.user)
+        transaction.on_commit(partial(run_export.delay, job.pk))
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """Download the file of a finished export."""
+        job = self.get_object()
+        if job.status != ExportJob.Status.SUCCEEDED:
+            return Response(
+                {"detail": "The export is not ready."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return FileResponse(
+            job.file.open("rb"),
+            as_attachment=True,
+            filename=PurePath(job.file.name).name,
+            content_type=MEDIA_TYPES[job.format],
+        )
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class ExportsConfig(AppConfig):
+    """App configuration for Exports."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "disease_surveillance_dashboard.exports"
+    verbose_name = _("Exports")
@@ -0,0 +1,309 @@
+"""
+Parquet and Arrow IPC exports of case line lists and rollups.
+
+Rows never pass through Python one at a time: the export query is streamed
+with ``COPY ... TO STDOUT`` into Arrow's multithreaded CSV reader, and the
+resulting record batches are written out as they arrive. Disease and
+district names become dictionary columns whose dictionaries are read in the
+same snapshot as the rows, so every batch shares them and pandas loads them
+as categoricals.
+"""
+
+import io
+import logging
+import tempfile
+from pathlib import Path
+from typing import NamedTuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from django.conf import settings
+from django.core.files import File
+from django.db import connection
+from django.db import models
+from django.db import transaction
+from django.utils import timezone
+
+from disease_surveillance_dashboard.access_control.roles import user_grants
+from disease_surveillance_dashboard.analytics.models import DailyCaseCount
+from disease_surveillance_dashboard.analytics.models import WeeklyCaseCount
+from disease_surveillance_dashboard.cases.api.serializers import (
+    CaseExportQuerySerializer,
+)
+from disease_surveillance_dashboard.cases.export import COLUMNS as CASE_COLUMNS
+from disease_surveillance_dashboard.cases.export import filter_export
+from disease_surveillance_dashboard.cases.models import CaseReport
+from reference_data.hierarchy import paths_q
+from reference_data.models import Disease
+from reference_data.models import Location
+
+from .models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+# CSV bytes parsed per record batch.
+READ_BLOCK_SIZE = 16 * 1024 * 1024
+MEDIA_TYPES = {
+    ExportJob.Format.PARQUET: "application/vnd.apache.parquet",
+    ExportJob.Format.ARROW: "application/vnd.apache.arrow.file",
+}
+
+
+class Dataset(NamedTuple):
+    model: type[models.Model]
+    date_field: str
+    # Output column -> lookup, as in cases/export.py.
+    columns: dict[str, str]
+
+
+def _rollup_columns(date_field: str) -> dict[str, str]:
+    return {
+        date_field: date_field,
+        "disease": "disease_id",
+        "disease_name": "disease__disease_name",
+        "location": "location_id",
+        "district_name": "location__district_name",
+        "area_name": "location__area_name",
+        "count": "count",
+    }
+
+
+DATASETS = {
+    ExportJob.Dataset.CASES: Dataset(CaseReport, "report_date", CASE_COLUMNS),
+    ExportJob.Dataset.DAILY_COUNTS: Dataset(
+        DailyCaseCount,
+        "day",
+        _rollup_columns("day"),
+    ),
+    ExportJob.Dataset.WEEKLY_COUNTS: Dataset(
+        WeeklyCaseCount,
+        "week_start",
+        _rollup_columns("week_start"),
+    ),
+}
+
+TYPES = {
+    "id": pa.int64(),
+    "disease": pa.int64(),
+    "location": pa.int64(),
+    "reported_by": pa.int64(),
+    "count": pa.int64(),
+    "disease_name": pa.string(),
+    "district_name": pa.string(),
+    "area_name": pa.string(),
+    "onset_date": pa.date32(),
+    "report_date": pa.date32(),
+    "day": pa.date32(),
+    "week_start": pa.date32(),
+    "created_at": pa.timestamp("us", tz="UTC"),
+}
+# Dictionary-encoded columns and the (model, field) their values come from.
+DICTIONARIES = {
+    "disease_name": (Disease, "disease_name"),
+    "district_name": (Location, "district_name"),
+}
+
+
+def export_queryset(job: ExportJob):
+    """Return the rows of ``job``, limited by its filters and owner's scope."""
+    dataset = DATASETS[job.dataset]
+    filters = CaseExportQuerySerializer(data=job.filters)
+    filters.is_valid(raise_exception=True)
+    queryset = filter_export(
+        dataset.model.objects.all(),
+        filters.validated_data,
+        dataset.date_field,
+    )
+    scope = user_grants(job.requested_by).scope
+    if scope is not None:
+        queryset = queryset.filter(paths_q(scope, "location__"))
+    # Unordered: cases then come partition by partition, so report dates are
+    # clustered and Parquet row-group statistics stay selective.
+    return queryset.order_by().values_list(*dataset.columns.values())
+
+
+def _schema(names) -> pa.Schema:
+    return pa.schema(
+        pa.field(name, pa.dictionary(pa.int32(), TYPES[name]))
+        if name in DICTIONARIES
+        else pa.field(name, TYPES[name])
+        for name in names
+    )
+
+
+def _dictionary(name: str) -> pa.Array:
+    model, field = DICTIONARIES[name]
+    values = model.objects.order_by(field).values_list(field, flat=True).distinct()
+    return pa.array(list(values), pa.string())
+
+
+class _CopyStream(io.RawIOBase):
+    """Read-only file over the data of a psycopg ``COPY ... TO STDOUT``."""
+
+    def __init__(self, copy):
+        self.copy = copy
+        self.pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        # COPY hands out a row at a time; fill the whole buffer, because
+        # Arrow allocates a block for every read.
+        filled = 0
+        while filled < len(buffer):
+            if not self.pending:
+                data = self.copy.read()
+                if not data:
+                    break
+                self.pending = memoryview(data)
+            size = min(len(buffer) - filled, len(self.pending))
+            buffer[filled : filled + size] = self.pending[:size]
+            self.pending = self.pending[size:]
+            filled += size
+        return filled
+
+
+class _ParquetSink:
+    """Write batches as Parquet row groups of exactly ``row_group_size`` rows."""
+
+    def __init__(self, path, schema: pa.Schema, row_group_size: int):
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.writer = pq.ParquetWriter(
+            path,
+            schema,
+            compression="zstd",
+            use_dictionary=[name for name in schema.names if name in DICTIONARIES],
+        )
+        self.batches = []
+        self.rows = 0
+
+    def write(self, batch: pa.RecordBatch) -> None:
+        self.batches.append(batch)
+        self.rows += batch.num_rows
+        if self.rows >= self.row_group_size:
+            self._flush(final=False)
+
+    def _flush(self, *, final: bool) -> None:
+        table = pa.Table.from_batches(self.batches, self.schema)
+        size = table.num_rows
+        if not final:
+            size -= size % self.row_group_size
+        if size:
+            self.writer.write_table(
+                table.slice(0, size),
+                row_group_size=self.row_group_size,
+            )
+        # The remainder starts the next row group.
+        self.batches = table.slice(size).to_batches()
+        self.rows = table.num_rows - size
+
+    def close(self) -> None:
+        self._flush(final=True)
+        self.writer.close()
+
+
+class _ArrowSink:
+    """Write batches to an uncompressed Arrow IPC file, for memory mapping."""
+
+    def __init__(self, path, schema: pa.Schema):
+        self.writer = pa.ipc.new_file(path, schema)
+
+    def write(self, batch: pa.RecordBatch) -> None:
+        self.writer.write_batch(batch)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def write_columnar(queryset, names, fmt: str, path) -> int:
+    """
+    Write the ``values_list`` ``queryset`` with columns ``names`` to ``path``.
+
+    Returns the number of rows written.
+    """
+    schema = _schema(names)
+    sql, params = queryset.query.sql_with_params()
+    read_options = pa_csv.ReadOptions(column_names=names, block_size=READ_BLOCK_SIZE)
+    # NULLs arrive unquoted and empty strings quoted, so both survive.
+    convert_options = pa_csv.ConvertOptions(
+        column_types={name: TYPES[name] for name in names},
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=False,
+    )
+    rows = 0
+    snapshot = not connection.in_atomic_block
+    with transaction.atomic(), connection.cursor() as cursor:
+        if snapshot:
+            # One snapshot for the rows and the dictionaries of their names.
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+        dictionaries = {
+            name: _dictionary(name) for name in names if name in DICTIONARIES
+        }
+        if fmt == ExportJob.Format.PARQUET:
+            sink = _ParquetSink(path, schema, settings.EXPORTS_PARQUET_ROW_GROUP_SIZE)
+        else:
+            sink = _ArrowSink(path, schema)
+        try:
+            with cursor.copy(f"COPY ({sql}) TO STDOUT (FORMAT csv)", params) as copy:
+                reader = pa_csv.open_csv(
+                    _CopyStream(copy),
+                    read_options=read_options,
+                    convert_options=convert_options,
+                )
+                for batch in reader:
+                    columns = [
+                        pa.DictionaryArray.from_arrays(
+                            pc.index_in(column, value_set=dictionaries[name]),
+                            dictionaries[name],
+                        )
+                        if name in dictionaries
+                        else column
+                        for name, column in zip(names, batch.columns, strict=True)
+                    ]
+                    sink.write(pa.RecordBatch.from_arrays(columns, schema=schema))
+                    rows += batch.num_rows
+        finally:
+            sink.close()
+    return rows
+
+
+def run_export_job(job_id: int) -> dict:
+    """
+    Write the file of a pending export job and record the outcome.
+
+    Jobs already picked up by another worker are left alone.
+    """
+    started = ExportJob.objects.filter(
+        pk=job_id,
+        status=ExportJob.Status.PENDING,
+    ).update(status=ExportJob.Status.RUNNING, started_at=timezone.now())
+    if not started:
+        return {"job": job_id, "status": "skipped"}
+    job = ExportJob.objects.select_related("requested_by").get(pk=job_id)
+    suffix = f".{job.format}"
+    try:
+        with tempfile.NamedTemporaryFile(suffix=suffix) as temporary:
+            job.row_count = write_columnar(
+                export_queryset(job),
+                list(DATASETS[job.dataset].columns),
+                job.format,
+                temporary.name,
+            )
+            job.file_size = Path(temporary.name).stat().st_size
+            job.file.save(
+                f"{job.dataset}-{job.pk}{suffix}",
+                File(temporary),
+                save=False,
+            )
+        job.status = ExportJob.Status.SUCCEEDED
+    except Exception as exc:
+        logger.exception("Export job %s failed", job_id)
+        job.status = ExportJob.Status.FAILED
+        job.error = str(exc)
+    job.finished_at = timezone.now()
+    job.save()
+    return {"job": job_id, "status": job.status, "rows": job.row_count}
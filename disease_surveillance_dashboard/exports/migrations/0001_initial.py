@@ -0,0 +1,42 @@
+# Generated by Django 5.2.10 on 2026-10-17 20:18
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dataset', models.CharField(choices=[('cases', 'Case line list'), ('daily_counts', 'Daily case counts'), ('weekly_counts', 'Weekly case counts')], max_length=20, verbose_name='Dataset')),
+                ('format', models.CharField(choices=[('parquet', 'Parquet'), ('arrow', 'Arrow IPC')], default='parquet', max_length=10, verbose_name='Format')),
+                ('filters', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Disease, location and date range the export is limited to', verbose_name='Filters')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='pending', max_length=10, verbose_name='Status')),
+                ('file', models.FileField(blank=True, upload_to='exports/%Y/%m/', verbose_name='File')),
+                ('file_size', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='File Size')),
+                ('row_count', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Row Count')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Started At')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished At')),
+                ('requested_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Requested By')),
+            ],
+            options={
+                'verbose_name': 'Export Job',
+                'verbose_name_plural': 'Export Jobs',
+                'db_table': 'export_jobs',
+                'ordering': ['-id'],
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ExportJob(models.Model):
+    """A columnar export of case data, written by a background task."""
+
+    class Dataset(models.TextChoices):
+        CASES = "cases", _("Case line list")
+        DAILY_COUNTS = "daily_counts", _("Daily case counts")
+        WEEKLY_COUNTS = "weekly_counts", _("Weekly case counts")
+
+    class Format(models.TextChoices):
+        PARQUET = "parquet", _("Parquet")
+        ARROW = "arrow", _("Arrow IPC")
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        RUNNING = "running", _("Running")
+        SUCCEEDED = "succeeded", _("Succeeded")
+        FAILED = "failed", _("Failed")
+
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="export_jobs",
+        verbose_name=_("Requested By"),
+    )
+    dataset = models.CharField(_("Dataset"), max_length=20, choices=Dataset.choices)
+    format = models.CharField(
+        _("Format"),
+        max_length=10,
+        choices=Format.choices,
+        default=Format.PARQUET,
+    )
+    filters = models.JSONField(
+        _("Filters"),
+        default=dict,
+        blank=True,
+        encoder=DjangoJSONEncoder,
+        help_text=_("Disease, location and date range the export is limited to"),
+    )
+    status = models.CharField(
+        _("Status"),
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    file = models.FileField(_("File"), upload_to="exports/%Y/%m/", blank=True)
+    file_size = models.PositiveBigIntegerField(_("File Size"), null=True, blank=True)
+    row_count = models.PositiveBigIntegerField(_("Row Count"), null=True, blank=True)
+    error = models.TextField(_("Error"), blank=True)
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+    started_at = models.DateTimeField(_("Started At"), null=True, blank=True)
+    finished_at = models.DateTimeField(_("Finished At"), null=True, blank=True)
+
+    class Meta:
+        db_table = "export_jobs"
+        verbose_name = _("Export Job")
+        verbose_name_plural = _("Export Jobs")
+        ordering = ["-id"]
+
+    def __str__(self) -> str:
+        """Return dataset, format and status as string representation."""
+        return f"{self.dataset}.{self.format} ({self.status})"
@@ -0,0 +1,13 @@
+from celery import shared_task
+from django.conf import settings
+
+from .columnar import run_export_job
+
+
+@shared_task(
+    soft_time_limit=settings.EXPORTS_TASK_SOFT_TIME_LIMIT,
+    time_limit=settings.EXPORTS_TASK_SOFT_TIME_LIMIT + 60,
+)
+def run_export(job_id):
+    """Write the Parquet or Arrow file of an export job."""
+    return run_export_job(job_id)
@@ -0,0 +1,103 @@
+"""Tests for export job API endpoints."""
+
+import datetime
+
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from disease_surveillance_dashboard.cases.models import CaseReport
+from reference_data.models import Disease
+from reference_data.models import Location
+
+from ..columnar import run_export_job
+from ..models import ExportJob
+
+User = get_user_model()
+
+
+class ExportJobAPITestCase(APITestCase):
+    """Test cases for the ExportJob API endpoints."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="analyst@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        CaseReport.objects.create(
+            disease=Disease.objects.create(disease_name="Cholera"),
+            location=Location.objects.create(district_name="Accra"),
+            reported_by=self.user,
+            report_date=datetime.date(2024, 3, 4),
+        )
+        self.api_url = "/api/v1/exports/"
+
+    def test_create_queues_job(self):
+        """Test that a created job is queued after commit and then downloadable."""
+        data = {
+            "dataset": "cases",
+            "format": "parquet",
+            "filters": {"start": "2024-03-01", "end": "2024-03-31"},
+        }
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(self.api_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(response.data["status"], ExportJob.Status.PENDING)
+        self.assertEqual(response.data["filters"], data["filters"])
+        self.assertIsNone(response.data["download_url"])
+        job_id = response.data["id"]
+        url = f"{self.api_url}{job_id}/"
+        response = self.client.get(f"{url}download/")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        run_export_job(ExportJob.objects.get().pk)
+        response = self.client.get(url)
+        self.assertEqual(response.data["status"], ExportJob.Status.SUCCEEDED)
+        self.assertEqual(response.data["row_count"], 1)
+        self.assertTrue(
+            response.data["download_url"].endswith(f"/exports/{job_id}/download/"),
+        )
+        response = self.client.get(response.data["download_url"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/vnd.apache.parquet")
+        self.assertIn("attachment", response["Content-Disposition"])
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"PAR1"))
+
+    def test_create_validates_filters(self):
+        """Test that unknown datasets and reversed ranges are rejected."""
+        for data in (
+            {"dataset": "users"},
+            {"dataset": "cases", "format": "xlsx"},
+            {
+                "dataset": "cases",
+                "filters": {"start": "2024-03-05", "end": "2024-03-01"},
+            },
+        ):
+            with self.subTest(data=data):
+                response = self.client.post(self.api_url, data, format="json")
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ExportJob.objects.exists())
+
+    def test_jobs_are_private(self):
+        """Test that users only see and download their own jobs."""
+        other = ExportJob.objects.create(
+            requested_by=User.objects.create(email="other@example.com"),
+            dataset=ExportJob.Dataset.CASES,
+        )
+        run_export_job(other.pk)
+        response = self.client.get(self.api_url)
+        self.assertEqual(response.data["results"], [])
+        response = self.client.get(f"{self.api_url}{other.pk}/download/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_requires_authentication(self):
+        """Test that anonymous users cannot request exports."""
+        self.client.force_authenticate(user=None)
+        response = self.client.post(self.api_url, {"dataset": "cases"}, format="json")
+        self.assertIn(
+            response.status_code,
+            [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN],
+        )
@@ -0,0 +1,169 @@
+"""Tests for the Parquet and Arrow export writer."""
+
+import datetime
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.test import override_settings
+
+from disease_surveillance_dashboard.access_control.models import Role
+from disease_surveillance_dashboard.access_control.models import UserRole
+from disease_surveillance_dashboard.analytics.models import WeeklyCaseCount
+from disease_surveillance_dashboard.cases.models import CaseReport
+from reference_data.models import Disease
+from reference_data.models import Location
+
+from ..columnar import run_export_job
+from ..models import ExportJob
+
+User = get_user_model()
+
+
+def read_table(job: ExportJob) -> pa.Table:
+    """Load the file of a finished export job."""
+    with job.file.open("rb") as file:
+        data = io.BytesIO(file.read())
+    if job.format == ExportJob.Format.PARQUET:
+        return pq.read_table(data)
+    return pa.ipc.open_file(data).read_all()
+
+
+class ColumnarExportTestCase(TestCase):
+    """Test cases for writing export files."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create(email="analyst@example.com")
+        self.cholera = Disease.objects.create(disease_name="Cholera")
+        self.measles = Disease.objects.create(disease_name="Measles")
+        self.region = Location.objects.create(
+            district_name="Greater Accra",
+            level=Location.Level.REGION,
+        )
+        self.accra = Location.objects.create(
+            district_name="Accra",
+            area_name="",
+            parent=self.region,
+        )
+        self.tema = Location.objects.create(district_name="Tema", area_name="Port")
+        for day, disease, location in (
+            (1, self.cholera, self.accra),
+            (2, self.measles, self.accra),
+            (3, self.cholera, self.tema),
+        ):
+            CaseReport.objects.create(
+                disease=disease,
+                location=location,
+                reported_by=self.user,
+                report_date=datetime.date(2024, 3, day),
+            )
+
+    def _run(self, **fields) -> ExportJob:
+        job = ExportJob.objects.create(requested_by=self.user, **fields)
+        result = run_export_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.SUCCEEDED, job.error)
+        self.assertEqual(result["rows"], job.row_count)
+        return job
+
+    def test_case_line_list(self):
+        """Test both formats, with dictionary-encoded names."""
+        for fmt in ExportJob.Format.values:
+            with self.subTest(format=fmt):
+                job = self._run(dataset=ExportJob.Dataset.CASES, format=fmt)
+                self.assertEqual(job.row_count, 3)
+                self.assertEqual(job.file_size, job.file.size)
+                self.assertTrue(job.file.name.endswith(f".{fmt}"))
+                table = read_table(job).sort_by("id")
+                for name in ("disease_name", "district_name"):
+                    self.assertTrue(
+                        pa.types.is_dictionary(table.schema.field(name).type),
+                    )
+                self.assertEqual(table.schema.field("report_date").type, pa.date32())
+                rows = table.to_pylist()
+                self.assertEqual(
+                    [row["disease_name"] for row in rows],
+                    ["Cholera", "Measles", "Cholera"],
+                )
+                self.assertEqual(
+                    [row["district_name"] for row in rows],
+                    ["Accra", "Accra", "Tema"],
+                )
+                # Empty strings and NULLs stay apart.
+                self.assertEqual([row["area_name"] for row in rows], ["", "", "Port"])
+                self.assertIsNone(rows[0]["onset_date"])
+                self.assertEqual(rows[2]["report_date"], datetime.date(2024, 3, 3))
+
+    @override_settings(EXPORTS_PARQUET_ROW_GROUP_SIZE=2)
+    def test_parquet_row_groups(self):
+        """Test that Parquet row groups hold the configured number of rows."""
+        job = self._run(dataset=ExportJob.Dataset.CASES)
+        with job.file.open("rb") as file:
+            metadata = pq.ParquetFile(io.BytesIO(file.read())).metadata
+        self.assertEqual(
+            [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)],
+            [2, 1],
+        )
+
+    def test_filters_and_scope(self):
+        """Test that filters and the owner's location scope limit the rows."""
+        job = self._run(
+            dataset=ExportJob.Dataset.CASES,
+            filters={"disease": [self.cholera.id], "end": "2024-03-02"},
+        )
+        self.assertEqual(read_table(job).column("district_name").to_pylist(), ["Accra"])
+
+        role = Role.objects.create(role_name="DISTRICT_OFFICER")
+        UserRole.objects.create(user=self.user, role=role, location=self.region)
+        job = self._run(dataset=ExportJob.Dataset.CASES)
+        self.assertEqual(job.row_count, 2)
+
+    def test_rollups(self):
+        """Test the weekly rollup dataset."""
+        WeeklyCaseCount.objects.create(
+            disease=self.cholera,
+            location=self.tema,
+            week_start=datetime.date(2024, 2, 26),
+            count=4,
+        )
+        job = self._run(
+            dataset=ExportJob.Dataset.WEEKLY_COUNTS,
+            format=ExportJob.Format.ARROW,
+        )
+        self.assertEqual(
+            read_table(job).to_pylist(),
+            [
+                {
+                    "week_start": datetime.date(2024, 2, 26),
+                    "disease": self.cholera.id,
+                    "disease_name": "Cholera",
+                    "location": self.tema.id,
+                    "district_name": "Tema",
+                    "area_name": "Port",
+                    "count": 4,
+                },
+            ],
+        )
+
+    def test_jobs_run_once(self):
+        """Test that a job already picked up is skipped."""
+        job = self._run(dataset=ExportJob.Dataset.CASES)
+        self.assertEqual(run_export_job(job.pk)["status"], "skipped")
+
+    def test_failure_is_recorded(self):
+        """Test that a failing export marks the job failed."""
+        job = ExportJob.objects.create(
+            requested_by=self.user,
+            dataset=ExportJob.Dataset.CASES,
+            filters={"start": "not a date"},
+        )
+        with self.assertLogs("disease_surveillance_dashboard.exports.columnar"):
+            run_export_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.FAILED)
+        self.assertIn("start", job.error)
+        self.assertFalse(job.file)
+        self.assertIsNotNone(job.finished_at)
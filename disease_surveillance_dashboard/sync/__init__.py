@@ -0,0 +1 @@
+"""Sync app serving reference data changes to offline clients."""
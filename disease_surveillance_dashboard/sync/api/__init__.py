@@ -0,0 +1 @@
+"""API package for sync app."""
@@ -0,0 +1,38 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from disease_surveillance_dashboard.access_control.models import UserRole
+
+from ..changes import START
+from ..changes import Position
+
+
+class SyncQuerySerializer(serializers.Serializer):
+    """Query parameters of the sync endpoint."""
+
+    since = serializers.RegexField(r"^\d{1,18}\.\d{1,18}$", required=False)
+    limit = serializers.IntegerField(min_value=1, required=False)
+
+    def validate_limit(self, value):
+        """Cap the page size."""
+        if value > settings.SYNC_MAX_PAGE_SIZE:
+            maximum = settings.SYNC_MAX_PAGE_SIZE
+            msg = f"Ensure this value is less than or equal to {maximum}."
+            raise serializers.ValidationError(msg)
+        return value
+
+    def validate(self, attrs):
+        """Parse the position and default the page size."""
+        attrs["since"] = Position.parse(attrs["since"]) if "since" in attrs else START
+        attrs.setdefault("limit", settings.SYNC_PAGE_SIZE)
+        return attrs
+
+
+class SyncedUserRoleSerializer(serializers.ModelSerializer):
+    """A role assignment as its user's device keeps it."""
+
+    role_name = serializers.CharField(source="role.role_name", read_only=True)
+
+    class Meta:
+        model = UserRole
+        fields = ["id", "role", "role_name", "location", "assigned_at"]
@@ -0,0 +1,94 @@
+from django.utils.decorators import method_decorator
+from django.views.decorators.gzip import gzip_page
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from disease_surveillance_dashboard.access_control.api.mixins import LocationScopedMixin
+from disease_surveillance_dashboard.access_control.models import UserRole
+from disease_surveillance_dashboard.access_control.roles import scope_token
+from reference_data.models import Disease
+from reference_data.models import Location
+from reference_data.serializers import DiseaseSerializer
+from reference_data.serializers import LocationSerializer
+
+from ..changes import kind
+from ..changes import read_changes
+from .serializers import SyncedUserRoleSerializer
+from .serializers import SyncQuerySerializer
+
+
+class SyncViewSet(LocationScopedMixin, GenericViewSet):
+    """
+    Changes to diseases, locations and the user's role assignments since a
+    position in the change log, for devices keeping an offline copy.
+
+    Usage: GET /api/sync/?since=<next>&limit=1000
+
+    Without ``since`` the whole data set is sent. Each change carries the
+    row's current ``data``, or ``"deleted": true`` when the row is gone or
+    outside the user's locations; a row changed several times in a page is
+    sent once. Keep ``next`` and repeat while ``more`` is true. Locations
+    are limited to the user's scope, and ``scope`` changes with it: a device
+    seeing a new ``scope`` drops its copy and syncs from the start.
+    Responses are gzip-compressed for clients accepting it.
+    """
+
+    serializer_class = SyncQuerySerializer
+    pagination_class = None
+    scope_field = ""
+
+    def get_rows(self, change_kind: str, ids: list[int]) -> list[dict]:
+        """Return the serialized current state of the user's ``ids`` rows."""
+        if change_kind == kind(Disease):
+            queryset, serializer = Disease.objects.all(), DiseaseSerializer
+        elif change_kind == kind(Location):
+            queryset, serializer = Location.objects.all(), LocationSerializer
+            if (scope := self.get_scope_q()) is not None:
+                queryset = queryset.filter(scope)
+        elif change_kind == kind(UserRole):
+            queryset = UserRole.objects.select_related("role")
+            queryset = queryset.filter(user=self.request.user)
+            serializer = SyncedUserRoleSerializer
+        else:
+            return []
+        return serializer(queryset.filter(pk__in=ids), many=True).data
+
+    @method_decorator(gzip_page)
+    def list(self, request, *args, **kwargs):
+        query = SyncQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        since, limit = query.validated_data["since"], query.validated_data["limit"]
+        changes = read_changes(request.user.pk, since, limit + 1)
+        more = len(changes) > limit
+        changes = changes[:limit]
+
+        # Only the last change of a row counts, and it names the row only.
+        latest = {}
+        for change in changes:
+            latest.pop((change.kind, change.object_id), None)
+            latest[change.kind, change.object_id] = change
+        ids = {}
+        for change_kind, object_id in latest:
+            ids.setdefault(change_kind, []).append(object_id)
+        rows = {
+            (change_kind, row["id"]): row
+            for change_kind, kind_ids in ids.items()
+            for row in self.get_rows(change_kind, kind_ids)
+        }
+        return Response(
+            {
+                "changes": [
+                    {
+                        "type": change_kind,
+                        "id": object_id,
+                        "data": rows[change_kind, object_id],
+                    }
+                    if (change_kind, object_id) in rows
+                    else {"type": change_kind, "id": object_id, "deleted": True}
+                    for change_kind, object_id in latest
+                ],
+                "next": str(changes[-1].position if changes else since),
+                "more": more,
+                "scope": scope_token(request),
+            },
+        )
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class SyncConfig(AppConfig):
+    """App configuration for Sync."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "disease_surveillance_dashboard.sync"
+    verbose_name = _("Sync")
+
+    def ready(self):
+        """Connect signal handlers."""
+        from . import signals  # noqa: F401, PLC0415
@@ -0,0 +1,123 @@
+"""
+Change log behind the offline delta sync.
+
+Writes to synced rows add a ``Change`` naming the row, in the writing
+transaction: model signals cover ORM writes and bulk paths call
+:func:`record_changes` or :func:`record_queryset` themselves.
+
+Changes are read in ``(transaction_id, id)`` order, and only those of
+transactions older than every transaction still open, so a change can never
+commit behind a position a client has already synced past. A long-running
+transaction holds back sync, not correctness.
+"""
+
+from typing import NamedTuple
+
+from django.db import connection
+
+RECORD_SQL = """
+    INSERT INTO sync_changes (kind, object_id, user_id, transaction_id)
+    SELECT %s, object_id, user_id, pg_current_xact_id()::text::bigint
+      FROM unnest(%s::bigint[], %s::bigint[]) AS changed (object_id, user_id)
+"""
+RECORD_QUERY_SQL = """
+    INSERT INTO sync_changes (kind, object_id, user_id, transaction_id)
+    SELECT %s, changed.*, pg_current_xact_id()::text::bigint
+      FROM ({}) AS changed
+"""
+# Transactions below the snapshot's xmin have all finished. The reading
+# transaction's own changes are visible too, which only matters in tests.
+READ_SQL = """
+    SELECT transaction_id, id, kind, object_id
+      FROM sync_changes
+     WHERE (transaction_id, id) > (%(transaction_id)s, %(id)s)
+       AND (transaction_id < pg_snapshot_xmin(pg_current_snapshot())::text::bigint
+            OR transaction_id = pg_current_xact_id_if_assigned()::text::bigint)
+       AND (user_id IS NULL OR user_id = %(user_id)s)
+     ORDER BY transaction_id, id
+     LIMIT %(limit)s
+"""
+# A later change of the same row supersedes an earlier one: whoever syncs
+# past the earlier one still reaches the later.
+COMPACT_SQL = """
+    DELETE FROM sync_changes AS earlier
+     USING sync_changes AS later
+     WHERE later.kind = earlier.kind
+       AND later.object_id = earlier.object_id
+       AND later.user_id IS NOT DISTINCT FROM earlier.user_id
+       AND (later.transaction_id, later.id) > (earlier.transaction_id, earlier.id)
+"""
+
+
+class Position(NamedTuple):
+    """A place in the change log; clients hold it as ``"<transaction>.<id>"``."""
+
+    transaction_id: int
+    id: int
+
+    @classmethod
+    def parse(cls, token: str) -> "Position":
+        transaction_id, _, change_id = token.partition(".")
+        return cls(int(transaction_id), int(change_id))
+
+    def __str__(self) -> str:
+        return f"{self.transaction_id}.{self.id}"
+
+
+START = Position(0, 0)
+
+
+class LoggedChange(NamedTuple):
+    position: Position
+    kind: str
+    object_id: int
+
+
+def kind(model) -> str:
+    """Return the change kind of ``model``'s rows."""
+    return model._meta.model_name  # noqa: SLF001
+
+
+def record_changes(model, ids, user_ids=()) -> None:
+    """Log writes to the ``model`` rows ``ids``, owned by ``user_ids`` if given."""
+    if ids:
+        with connection.cursor() as cursor:
+            cursor.execute(RECORD_SQL, [kind(model), list(ids), list(user_ids)])
+
+
+def record_queryset(queryset, user_field: str | None = None) -> None:
+    """Log writes to every row of ``queryset`` in one statement."""
+    fields = ["pk", user_field] if user_field else ["pk"]
+    sql, params = queryset.order_by().values_list(*fields).query.sql_with_params()
+    if not user_field:
+        sql = f"SELECT changed.*, NULL::bigint FROM ({sql}) AS changed"  # noqa: S608
+    with connection.cursor() as cursor:
+        cursor.execute(
+            RECORD_QUERY_SQL.format(sql),
+            [kind(queryset.model), *params],
+        )
+
+
+def read_changes(user_id: int, since: Position, limit: int) -> list[LoggedChange]:
+    """Return up to ``limit`` changes after ``since`` that ``user_id`` syncs."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            READ_SQL,
+            {
+                "transaction_id": since.transaction_id,
+                "id": since.id,
+                "user_id": user_id,
+                "limit": limit,
+            },
+        )
+        return [
+            LoggedChange(Position(transaction_id, change_id), change_kind, object_id)
+            for transaction_id, change_id, change_kind, object_id in cursor.fetchall()
+        ]
+
+
+def compact_changes() -> int:
+    """Drop changes superseded by a later change of the same row."""
+    with connection.cursor() as cursor:
+        cursor.execute(COMPACT_SQL)
+        return cursor.rowcount
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.10 on 2026-10-17 20:49
+
+from django.db import migrations, models
+
+# Log every existing row once, so a first sync from the start of the log
+# downloads the full data set.
+BACKFILL_SQL = """
+INSERT INTO sync_changes (kind, object_id, user_id, transaction_id)
+SELECT kind, object_id, user_id, pg_current_xact_id()::text::bigint
+  FROM (
+        SELECT 'disease', id, NULL::bigint FROM diseases
+        UNION ALL
+        SELECT 'location', id, NULL FROM locations
+        UNION ALL
+        SELECT 'userrole', id, user_id FROM user_roles
+       ) AS existing (kind, object_id, user_id)
+ ORDER BY kind, object_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('access_control', '0004_userrole_location'),
+        ('reference_data', '0007_location_hierarchy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=30, verbose_name='Kind')),
+                ('object_id', models.BigIntegerField(verbose_name='Object ID')),
+                ('user_id', models.BigIntegerField(blank=True, null=True, verbose_name='User ID')),
+                ('transaction_id', models.BigIntegerField(verbose_name='Transaction ID')),
+            ],
+            options={
+                'verbose_name': 'Change',
+                'verbose_name_plural': 'Changes',
+                'db_table': 'sync_changes',
+                'indexes': [models.Index(fields=['transaction_id', 'id'], name='sync_change_transac_b901b7_idx'), models.Index(fields=['kind', 'object_id'], name='sync_change_kind_c1c947_idx')],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,33 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class Change(models.Model):
+    """
+    A write to a row that offline clients keep a copy of.
+
+    Only the row is named; the sync endpoint serves its state at sync time,
+    or a tombstone when it is gone.
+    """
+
+    # The model name of the changed row, e.g. "location".
+    kind = models.CharField(_("Kind"), max_length=30)
+    object_id = models.BigIntegerField(_("Object ID"))
+    # Set on rows only their user syncs (role assignments).
+    user_id = models.BigIntegerField(_("User ID"), null=True, blank=True)
+    # The writing transaction's id (pg_current_xact_id()); changes are read
+    # in (transaction_id, id) order, once no earlier transaction is open.
+    transaction_id = models.BigIntegerField(_("Transaction ID"))
+
+    class Meta:
+        db_table = "sync_changes"
+        verbose_name = _("Change")
+        verbose_name_plural = _("Changes")
+        indexes = [
+            models.Index(fields=["transaction_id", "id"]),
+            models.Index(fields=["kind", "object_id"]),
+        ]
+
+    def __str__(self) -> str:
+        """Return the changed row as string representation."""
+        return f"{self.kind} {self.object_id}"
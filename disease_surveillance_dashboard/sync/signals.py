@@ -0,0 +1,48 @@
+"""Signal handlers logging writes to the rows offline clients sync."""
+
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from disease_surveillance_dashboard.access_control.models import Role
+from disease_surveillance_dashboard.access_control.models import UserRole
+from reference_data.models import Disease
+from reference_data.models import Location
+
+from .changes import record_changes
+from .changes import record_queryset
+
+
+@receiver([post_save, post_delete], sender=Disease)
+@receiver([post_save, post_delete], sender=Location)
+def record_reference_change(sender, instance, **kwargs):
+    """Log a write to a reference data row."""
+    record_changes(sender, [instance.pk])
+
+
+@receiver([post_save, post_delete], sender=UserRole)
+def record_user_role_change(sender, instance, **kwargs):
+    """Log a write to a role assignment, for its user to sync."""
+    record_changes(sender, [instance.pk], [instance.user_id])
+
+
+@receiver(pre_save, sender=UserRole)
+def record_user_role_reassignment(sender, instance, **kwargs):
+    """Let the previous user of a reassigned role assignment drop it."""
+    if kwargs.get("raw") or instance.pk is None:
+        return
+    previous = (
+        UserRole.objects.filter(pk=instance.pk)
+        .values_list("user_id", flat=True)
+        .first()
+    )
+    if previous is not None and previous != instance.user_id:
+        record_changes(sender, [instance.pk], [previous])
+
+
+@receiver(post_save, sender=Role)
+def record_role_change(sender, instance, **kwargs):
+    """Log the assignments of a renamed role, whose name they carry."""
+    if not kwargs.get("created"):
+        record_queryset(UserRole.objects.filter(role=instance), "user_id")
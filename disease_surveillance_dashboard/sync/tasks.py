@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from .changes import compact_changes
+
+
+@shared_task()
+def compact_sync_changes():
+    """Drop sync changes superseded by a later change of the same row."""
+    return compact_changes()
@@ -0,0 +1 @@
+"""Tests package for sync app."""
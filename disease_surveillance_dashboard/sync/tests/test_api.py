@@ -0,0 +1,207 @@
+"""Tests for the offline sync endpoint."""
+
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from disease_surveillance_dashboard.access_control.bulk import bulk_assign_roles
+from disease_surveillance_dashboard.access_control.models import Role
+from disease_surveillance_dashboard.access_control.models import UserRole
+from reference_data.bulk import import_locations
+from reference_data.bulk import upsert_diseases
+from reference_data.models import Disease
+from reference_data.models import Location
+
+from ..changes import compact_changes
+
+User = get_user_model()
+
+
+class SyncAPITestCase(APITestCase):
+    """Test cases for the sync endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="officer@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.api_url = "/api/v1/sync/"
+        self.disease = Disease.objects.create(disease_name="Cholera")
+        self.district = Location.objects.create(district_name="Accra")
+        self.since = self.sync()["next"]
+
+    def sync(self, **params) -> dict:
+        response = self.client.get(self.api_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def changes(self) -> list[tuple]:
+        """Return the changes since the last sync as (type, id, name or None)."""
+        page = self.sync(since=self.since)
+        self.since = page["next"]
+        return [
+            (
+                change["type"],
+                change["id"],
+                None
+                if change.get("deleted")
+                else change["data"].get("disease_name")
+                or change["data"].get("district_name")
+                or change["data"].get("role_name"),
+            )
+            for change in page["changes"]
+        ]
+
+    def test_initial_sync(self):
+        """Test that a sync from the start sends every row."""
+        page = self.sync()
+        self.assertIn(
+            {
+                "type": "disease",
+                "id": self.disease.id,
+                "data": {
+                    "id": self.disease.id,
+                    "disease_name": "Cholera",
+                    "is_active": True,
+                    "created_at": page["changes"][0]["data"]["created_at"],
+                },
+            },
+            page["changes"],
+        )
+        self.assertIn(
+            ("location", self.district.id),
+            [(change["type"], change["id"]) for change in page["changes"]],
+        )
+        self.assertFalse(page["more"])
+
+    def test_updates_and_tombstones(self):
+        """Test that later syncs send only changed rows, and deletions."""
+        self.assertEqual(self.changes(), [])
+        self.disease.disease_name = "Cholera (O1)"
+        self.disease.save()
+        self.disease.save()
+        other = Disease.objects.create(disease_name="Measles")
+        self.assertEqual(
+            self.changes(),
+            [
+                ("disease", self.disease.id, "Cholera (O1)"),
+                ("disease", other.id, "Measles"),
+            ],
+        )
+        other_id = other.id
+        other.delete()
+        self.assertEqual(self.changes(), [("disease", other_id, None)])
+
+    def test_compaction(self):
+        """Test that compacting the log keeps each row's last change."""
+        self.disease.save()
+        self.disease.save()
+        before = self.sync()["changes"]
+        self.assertGreaterEqual(compact_changes(), 2)
+        self.assertEqual(self.sync()["changes"], before)
+        self.assertEqual(self.changes(), [("disease", self.disease.id, "Cholera")])
+
+    def test_pages(self):
+        """Test that pages are bounded and the token resumes after them."""
+        diseases = [
+            Disease.objects.create(disease_name=f"Disease {number}")
+            for number in range(3)
+        ]
+        first = self.sync(since=self.since, limit=2)
+        self.assertTrue(first["more"])
+        second = self.sync(since=first["next"], limit=2)
+        self.assertFalse(second["more"])
+        self.assertEqual(
+            [change["id"] for change in first["changes"] + second["changes"]],
+            [disease.id for disease in diseases],
+        )
+
+    def test_invalid_query(self):
+        """Test that malformed tokens and oversized pages are rejected."""
+        for params in ({"since": "abc"}, {"limit": 0}, {"limit": 10**6}):
+            with self.subTest(params=params):
+                response = self.client.get(self.api_url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_locations_are_scoped(self):
+        """Test that locations outside the user's scope sync as tombstones."""
+        unscoped = self.sync()["scope"]
+        role = Role.objects.create(role_name="DISTRICT_OFFICER")
+        UserRole.objects.create(user=self.user, role=role, location=self.district)
+        self.since = self.sync()["next"]
+        area = Location.objects.create(
+            district_name="Accra",
+            area_name="Osu",
+            parent=self.district,
+        )
+        other = Location.objects.create(district_name="Tamale")
+        page = self.sync(since=self.since)
+        self.assertNotEqual(page["scope"], unscoped)
+        self.assertEqual(
+            [(change["id"], "deleted" in change) for change in page["changes"]],
+            [(area.id, False), (other.id, True)],
+        )
+
+    def test_role_assignments(self):
+        """Test that users sync their own role assignments only."""
+        role = Role.objects.create(role_name="SURVEILLANCE_OFFICER")
+        colleague = User.objects.create_user(email="colleague@example.com")
+        assignment = UserRole.objects.create(user=self.user, role=role)
+        UserRole.objects.create(user=colleague, role=role)
+        self.assertEqual(
+            self.changes(),
+            [("userrole", assignment.id, "SURVEILLANCE_OFFICER")],
+        )
+
+        role.role_name = "FIELD_OFFICER"
+        role.save()
+        self.assertEqual(
+            self.changes(),
+            [("userrole", assignment.id, "FIELD_OFFICER")],
+        )
+
+        assignment.user = colleague
+        assignment.location = self.district
+        assignment.save()
+        self.assertEqual(self.changes(), [("userrole", assignment.id, None)])
+
+    def test_bulk_writes_are_logged(self):
+        """Test that bulk imports, which skip signals, are synced too."""
+        role = Role.objects.create(role_name="SURVEILLANCE_OFFICER")
+        upsert_diseases([{"disease_name": "Measles", "is_active": True}])
+        import_locations(
+            [
+                (2, {"district_name": "Tamale"}),
+                (3, {"district_name": "Accra", "area_name": "Osu"}),
+            ],
+        )
+        bulk_assign_roles(assign=[{"user": self.user.id, "role": role.id}])
+        changes = self.changes()
+        measles = Disease.objects.get(disease_name="Measles")
+        tamale = Location.objects.get(district_name="Tamale")
+        osu = Location.objects.get(area_name="Osu")
+        assignment = UserRole.objects.get(user=self.user)
+        self.assertEqual(
+            sorted(changes),
+            sorted(
+                [
+                    ("disease", measles.id, "Measles"),
+                    ("location", tamale.id, "Tamale"),
+                    ("location", osu.id, "Accra"),
+                    ("userrole", assignment.id, "SURVEILLANCE_OFFICER"),
+                ],
+            ),
+        )
+
+        bulk_assign_roles(revoke=[{"user": self.user.id, "role": role.id}])
+        self.assertEqual(self.changes(), [("userrole", assignment.id, None)])
+
+    def test_gzip(self):
+        """Test that responses are compressed for clients accepting gzip."""
+        for number in range(20):
+            Disease.objects.create(disease_name=f"Disease {number}")
+        response = self.client.get(self.api_url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
@@ -36,6 +36,7 @@ class UserAdmin(auth_admin.UserAdmin):
         ),
         (_("Important dates"), {"fields": ("last_login", "date_joined", "created_at")}),
     )
+    readonly_fields = ["created_at"]
     list_display = ["email", "full_name", "phone", "is_active", "created_at"]
     search_fields = ["full_name", "email"]
     ordering = ["id"]
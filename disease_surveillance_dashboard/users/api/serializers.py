@@ -4,6 +4,8 @@ from disease_surveillance_dashboard.users.models import User
 
 
 class UserSerializer(serializers.ModelSerializer[User]):
+    name = serializers.CharField(source="full_name", required=False, allow_blank=True)
+
     class Meta:
         model = User
         fields = ["name", "url"]
@@ -7,11 +7,18 @@ from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
 from disease_surveillance_dashboard.users.models import User
+from disease_surveillance_dashboard.utils.mixins import AtomicWriteMixin
 
 from .serializers import UserSerializer
 
 
-class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericViewSet):
+class UserViewSet(
+    AtomicWriteMixin,
+    RetrieveModelMixin,
+    ListModelMixin,
+    UpdateModelMixin,
+    GenericViewSet,
+):
     serializer_class = UserSerializer
     queryset = User.objects.all()
     lookup_field = "pk"
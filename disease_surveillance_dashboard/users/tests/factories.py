@@ -10,7 +10,7 @@ from disease_surveillance_dashboard.users.models import User
 
 class UserFactory(DjangoModelFactory[User]):
     email = Faker("email")
-    name = Faker("name")
+    full_name = Faker("name")
 
     @post_generation
     def password(self, create: bool, extracted: Sequence[Any], **kwargs):  # noqa: FBT001
@@ -9,6 +9,8 @@ from django.urls import reverse
 from pytest_django.asserts import assertRedirects
 
 from disease_surveillance_dashboard.users.models import User
+from disease_surveillance_dashboard.users.tests.factories import UserFactory
+from disease_surveillance_dashboard.utils.testing import assert_constant_queries
 
 
 class TestUserAdmin:
@@ -63,3 +65,11 @@ class TestUserAdmin:
         # The `admin` login view should redirect to the `allauth` login view
         target_url = reverse(settings.LOGIN_URL) + "?next=" + request.path
         assertRedirects(response, target_url, fetch_redirect_response=False)
+
+
+def test_changelist_query_count_is_constant(admin_client):
+    url = reverse("admin:users_user_changelist")
+    assert_constant_queries(
+        lambda: admin_client.get(url),
+        lambda: UserFactory.create_batch(5),
+    )
@@ -0,0 +1 @@
+"""Shared helpers used across the project's apps."""
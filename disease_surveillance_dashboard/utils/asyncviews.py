@@ -0,0 +1,136 @@
+"""
+Async dispatch for read-only viewset actions.
+
+Under ASGI, Django hands each request's sync view to a thread of its own,
+so threads, and the database connections they open, grow with the number
+of concurrent requests. Viewsets with :class:`AsyncReadMixin` answer
+``list``/``retrieve`` on the event loop instead: cache and version lookups
+go through the async cache API, so warm hits and 304s need no view thread,
+and only what must block (authentication, cache misses) is handed to a
+thread, by default one from the event loop's bounded pool.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from asgiref.sync import markcoroutinefunction
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.db import connections
+from django.db import transaction
+from django.views.decorators.csrf import csrf_exempt
+
+READ_METHODS = ("get", "head")
+
+
+def _with_connection_cleanup(func: Callable[..., Any]) -> Callable[..., Any]:
+    # Pool threads see no request_started/finished signals, so recycle their
+    # connections the way the request handler would.
+    def call(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return call
+
+
+async def run_blocking(func: Callable[..., Any], /, *args, **kwargs) -> Any:
+    """
+    Run the blocking ``func`` without blocking the event loop.
+
+    Calls go to the event loop's thread pool, unless
+    ``ASYNC_VIEWS_THREAD_SENSITIVE`` keeps them on the sync thread (tests do,
+    so that queries see the test transaction).
+    """
+    if getattr(settings, "ASYNC_VIEWS_THREAD_SENSITIVE", False):
+        return await sync_to_async(func, thread_sensitive=True)(*args, **kwargs)
+    call = _with_connection_cleanup(func)
+    return await sync_to_async(call, thread_sensitive=False)(*args, **kwargs)
+
+
+def _atomic(view):
+    # Async views cannot run in ATOMIC_REQUESTS transactions, so the async
+    # view opts out and wraps only the sync actions, as the handler would.
+    for alias, settings_dict in connections.settings.items():
+        if settings_dict["ATOMIC_REQUESTS"]:
+            view = transaction.atomic(using=alias)(view)
+    return view
+
+
+class AsyncReadMixin:
+    """
+    Serve ``list`` and ``retrieve`` GETs from an async view.
+
+    Other actions keep running synchronously. Mixins with async steps
+    define ``alist``/``aretrieve`` calling ``super()``, like their sync
+    methods; the chain ends here by running the sync ``list``/``retrieve``
+    of the classes after this one through :func:`run_blocking`. List this
+    mixin after ``ConditionalGetMixin`` and ``CachedReadMixin`` and before
+    the DRF action mixins.
+    """
+
+    async_actions = frozenset({"list", "retrieve"})
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        actions = {**view.actions}
+        if "get" in actions and "head" not in actions:
+            actions["head"] = actions["get"]
+        if not any(
+            actions.get(method) in cls.async_actions for method in READ_METHODS
+        ):
+            return view
+
+        sync_view = sync_to_async(_atomic(view))
+
+        async def async_view(request, *args, **kwargs):
+            if actions.get(request.method.lower()) not in cls.async_actions:
+                return await sync_view(request, *args, **kwargs)
+            self = cls(**initkwargs)
+            self.action_map = actions
+            for method, action in actions.items():
+                setattr(self, method, getattr(self, action))
+            self.request = request
+            self.args = args
+            self.kwargs = kwargs
+            return await self.adispatch(request, *args, **kwargs)
+
+        markcoroutinefunction(async_view)
+        async_view.cls = cls
+        async_view.initkwargs = view.initkwargs
+        async_view.actions = view.actions
+        for alias in connections:
+            async_view = transaction.non_atomic_requests(using=alias)(async_view)
+        return csrf_exempt(async_view)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """Async ``dispatch`` for the actions in ``async_actions``."""
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            handler = getattr(self, f"a{self.action}")
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:  # noqa: BLE001
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        """
+        Run ``initial`` (authentication, permissions, throttles) off the loop.
+
+        Mixins needing per-request data loaded asynchronously extend this.
+        """
+        await run_blocking(self.initial, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await run_blocking(super().list, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await run_blocking(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,206 @@
+"""
+Versioned caching for slowly changing tables.
+
+Every cached namespace has a version token kept in the shared Django cache.
+Writers replace the token (``bump_version``); entries stored under the old
+token simply stop being reachable in every worker, so nothing has to be
+deleted explicitly.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Iterable
+from typing import Any
+
+from django.core.cache import caches
+from django.db.models import Model
+
+_MISSING = object()
+
+
+def _version_key(name: str) -> str:
+    return f"version:{name}"
+
+
+def _new_token() -> str:
+    # The timestamp prefix lets callers derive a Last-Modified time.
+    return f"{time.time_ns():x}-{uuid.uuid4().hex[:12]}"
+
+
+def version_timestamp(version: str) -> float:
+    """Return the POSIX time at which ``version`` was issued."""
+    return int(version.partition("-")[0], 16) / 1e9
+
+
+def get_versions(names: Iterable[str], alias: str = "default") -> dict[str, str]:
+    """Return the current version token of each namespace in ``names``."""
+    cache = caches[alias]
+    names = list(names)
+    found = cache.get_many([_version_key(name) for name in names])
+    versions = {}
+    for name in names:
+        key = _version_key(name)
+        version = found.get(key)
+        if version is None:
+            version = _new_token()
+            # add() so that concurrent first readers agree on a single token.
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+        versions[name] = version
+    return versions
+
+
+async def aget_versions(
+    names: Iterable[str],
+    alias: str = "default",
+) -> dict[str, str]:
+    """Async :func:`get_versions`, through the cache's async API."""
+    cache = caches[alias]
+    names = list(names)
+    found = await cache.aget_many([_version_key(name) for name in names])
+    versions = {}
+    for name in names:
+        key = _version_key(name)
+        version = found.get(key)
+        if version is None:
+            version = _new_token()
+            if not await cache.aadd(key, version, timeout=None):
+                version = await cache.aget(key, version)
+        versions[name] = version
+    return versions
+
+
+def get_version(name: str, alias: str = "default") -> str:
+    """Return the current version token of namespace ``name``."""
+    return get_versions([name], alias)[name]
+
+
+def bump_version(*names: str, alias: str = "default") -> None:
+    """Invalidate everything cached under the given namespaces."""
+    caches[alias].set_many(
+        {_version_key(name): _new_token() for name in names},
+        timeout=None,
+    )
+
+
+def table_version_name(model: type[Model]) -> str:
+    """Return the version namespace tracking writes to ``model``'s table."""
+    return f"table:{model._meta.label_lower}"  # noqa: SLF001
+
+
+def table_version(model: type[Model]) -> str:
+    """Return the current version token of ``model``'s table."""
+    return get_version(table_version_name(model))
+
+
+def bump_table_version(model: type[Model]) -> None:
+    """Mark ``model``'s table as changed."""
+    bump_version(table_version_name(model))
+
+
+class VersionedCache:
+    """
+    Two-tier cache keyed by a version namespace.
+
+    Lookups go to a per-process LRU first, then to the shared Django cache,
+    and only compute the value on a miss in both. Each lookup costs one read
+    of the version token from the shared cache.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        maxsize: int = 256,
+        timeout: int | None = 60 * 60,
+        alias: str = "default",
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.alias = alias
+        self._local: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"local_hits": 0, "shared_hits": 0, "misses": 0}
+
+    @property
+    def version(self) -> str:
+        return get_version(self.name, self.alias)
+
+    def get_or_set(self, key: str, default: Callable[[], Any]) -> Any:
+        """Return the value cached under ``key``, computing it on a miss."""
+        local_key = (self.version, key)
+        value = self._get_local(local_key)
+        if value is not _MISSING:
+            return value
+
+        cache = caches[self.alias]
+        shared_key = f"{self.name}:{local_key[0]}:{key}"
+        value = cache.get(shared_key, _MISSING)
+        if value is _MISSING:
+            value = default()
+            cache.set(shared_key, value, timeout=self.timeout)
+            counter = "misses"
+        else:
+            counter = "shared_hits"
+        self._set_local(local_key, value, counter)
+        return value
+
+    async def aget_or_set(
+        self,
+        key: str,
+        default: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Async :meth:`get_or_set`; ``default`` is awaited on a miss."""
+        local_key = ((await aget_versions([self.name], self.alias))[self.name], key)
+        value = self._get_local(local_key)
+        if value is not _MISSING:
+            return value
+
+        cache = caches[self.alias]
+        shared_key = f"{self.name}:{local_key[0]}:{key}"
+        value = await cache.aget(shared_key, _MISSING)
+        if value is _MISSING:
+            value = await default()
+            await cache.aset(shared_key, value, timeout=self.timeout)
+            counter = "misses"
+        else:
+            counter = "shared_hits"
+        self._set_local(local_key, value, counter)
+        return value
+
+    def _get_local(self, local_key: tuple[str, str]) -> Any:
+        with self._lock:
+            if local_key not in self._local:
+                return _MISSING
+            self._local.move_to_end(local_key)
+            self._counters["local_hits"] += 1
+            return self._local[local_key]
+
+    def _set_local(self, local_key: tuple[str, str], value: Any, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+            self._local[local_key] = value
+            self._local.move_to_end(local_key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drop every entry, in this process and in all others."""
+        bump_version(self.name, alias=self.alias)
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters for this process."""
+        with self._lock:
+            return {**self._counters, "local_size": len(self._local)}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for counter in self._counters:
+                self._counters[counter] = 0
@@ -0,0 +1,197 @@
+"""Reusable mixins for DRF viewsets."""
+
+import hashlib
+from collections.abc import Sequence
+
+from django.db import transaction
+from django.db.models import Model
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+from django.utils.http import quote_etag
+from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from .cache import VersionedCache
+from .cache import aget_versions
+from .cache import get_versions
+from .cache import table_version_name
+from .cache import version_timestamp
+
+
+class AtomicWriteMixin:
+    """
+    Run each unsafe-method request in a transaction, and reads outside one.
+
+    This replaces ``ATOMIC_REQUESTS``, which wrapped GETs too. Error
+    responses roll the transaction back, as DRF's exception handler does
+    under ``ATOMIC_REQUESTS``.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with transaction.atomic():
+            response = super().dispatch(request, *args, **kwargs)
+            if getattr(response, "exception", False):
+                transaction.set_rollback(True)
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Answer ``list``/``retrieve`` with 304 Not Modified when nothing changed.
+
+    The validators come from the version tokens of ``etag_models`` (the
+    viewset's own model by default), so checking them costs one cache read
+    and no queries or serialization. Every model whose rows appear in the
+    payload must be listed and must bump its table version on write; views
+    tracking finer-grained versions override ``get_version_names``.
+    """
+
+    etag_models: Sequence[type[Model]] = ()
+
+    def get_etag_models(self) -> Sequence[type[Model]]:
+        return self.etag_models or [self.get_queryset().model]
+
+    def get_etag_variant(self, request) -> list[str]:
+        """Request attributes that select a different representation."""
+        return [request.get_full_path(), request.headers.get("accept", "")]
+
+    def get_version_names(self, request) -> list[str]:
+        """Version namespaces covering everything in the payload."""
+        return [table_version_name(model) for model in self.get_etag_models()]
+
+    def get_validators(self, request) -> tuple[str, float]:
+        names = self.get_version_names(request)
+        return self._validators(request, names, get_versions(names))
+
+    async def aget_validators(self, request) -> tuple[str, float]:
+        names = self.get_version_names(request)
+        return self._validators(request, names, await aget_versions(names))
+
+    def _validators(self, request, names, versions) -> tuple[str, float]:
+        parts = [*(versions[name] for name in names), *self.get_etag_variant(request)]
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode())
+            digest.update(b"\0")
+        last_modified = max(version_timestamp(v) for v in versions.values())
+        return quote_etag(digest.hexdigest()[:32]), last_modified
+
+    def _conditional(self, request, handler, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = self._not_modified(request, etag, last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return self._set_validators(response, etag, last_modified)
+
+    async def _aconditional(self, request, handler, *args, **kwargs):
+        etag, last_modified = await self.aget_validators(request)
+        response = self._not_modified(request, etag, last_modified)
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+        return self._set_validators(response, etag, last_modified)
+
+    def _not_modified(self, request, etag, last_modified):
+        return get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified),
+        )
+
+    def _set_validators(self, response, etag, last_modified):
+        if response.status_code in (200, 304):
+            response.headers["ETag"] = etag
+            response.headers["Last-Modified"] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(request, super().retrieve, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self._aconditional(request, super().alist, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self._aconditional(request, super().aretrieve, *args, **kwargs)
+
+
+class CachedReadMixin:
+    """
+    Serve ``list`` and ``retrieve`` from a :class:`VersionedCache`.
+
+    The cached value is the serialized payload, so a warm cache answers
+    without touching the database. Views that restrict results per user must
+    fold that restriction into ``get_read_cache_variant``.
+    """
+
+    read_cache: VersionedCache
+
+    def get_read_cache_key(self, request) -> str:
+        # Absolute so pagination links built from the host stay correct.
+        return request.build_absolute_uri()
+
+    def get_read_cache_variant(self, request) -> str:
+        """Part of every key that tells apart users seeing different rows."""
+        return ""
+
+    async def aget_read_cache_key(self, request) -> str:
+        """Async :meth:`get_read_cache_key`, for keys that need cache reads."""
+        return self.get_read_cache_key(request)
+
+    def list(self, request, *args, **kwargs):
+        parent_list = super().list
+        variant = self.get_read_cache_variant(request)
+        data = self.read_cache.get_or_set(
+            f"list:{variant}:{self.get_read_cache_key(request)}",
+            lambda: parent_list(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        parent_retrieve = super().retrieve
+        lookup = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        variant = self.get_read_cache_variant(request)
+        data = self.read_cache.get_or_set(
+            f"detail:{variant}:{lookup}",
+            lambda: parent_retrieve(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
+    async def alist(self, request, *args, **kwargs):
+        parent_alist = super().alist
+
+        async def compute():
+            return (await parent_alist(request, *args, **kwargs)).data
+
+        variant = self.get_read_cache_variant(request)
+        key = await self.aget_read_cache_key(request)
+        data = await self.read_cache.aget_or_set(f"list:{variant}:{key}", compute)
+        return Response(data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        parent_aretrieve = super().aretrieve
+        lookup = kwargs[self.lookup_url_kwarg or self.lookup_field]
+
+        async def compute():
+            return (await parent_aretrieve(request, *args, **kwargs)).data
+
+        variant = self.get_read_cache_variant(request)
+        data = await self.read_cache.aget_or_set(f"detail:{variant}:{lookup}", compute)
+        return Response(data)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="cache-stats",
+        permission_classes=[IsAdminUser],
+    )
+    def cache_stats(self, request):
+        """Hit/miss counters of this worker's read cache."""
+        return Response(self.read_cache.stats())
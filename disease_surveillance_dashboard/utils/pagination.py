@@ -0,0 +1,24 @@
+"""Pagination classes for the REST API."""
+
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over an indexed column.
+
+    Each page is a range scan from the previous page's last key, so latency
+    does not grow with the page number the way ``OFFSET`` does. Viewsets
+    choose the key with ``pagination_ordering``; it should be unique, or
+    unique together with a trailing tie-breaker, and backed by an index.
+    """
+
+    ordering = "id"
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "pagination_ordering", None) or self.ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
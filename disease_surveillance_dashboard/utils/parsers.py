@@ -0,0 +1,23 @@
+"""Request parsers for the REST API."""
+
+from rest_framework.parsers import BaseParser
+
+
+class StreamParser(BaseParser):
+    """
+    Hand the unread request body to the view.
+
+    ``request.data`` becomes a binary file-like object, so bulk endpoints can
+    consume large uploads line by line instead of buffering them.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream
+
+
+class CSVStreamParser(StreamParser):
+    media_type = "text/csv"
+
+
+class NDJSONStreamParser(StreamParser):
+    media_type = "application/x-ndjson"
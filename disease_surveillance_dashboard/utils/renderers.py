@@ -0,0 +1,54 @@
+"""Renderers for the REST API's CSV and NDJSON exports."""
+
+import csv
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+def _cell(value) -> str:
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value)
+    return str(value)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Negotiate ``text/csv`` (or ``?format=csv``) for streamed exports.
+
+    Exports stream their own body; what is rendered here are error payloads,
+    as a header of their keys over one row of messages.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if not isinstance(data, dict):
+            data = {"detail": data}
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(data)
+        writer.writerow(_cell(value) for value in data.values())
+        return buffer.getvalue().encode(self.charset)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Negotiate ``application/x-ndjson`` (or ``?format=ndjson``) for exports.
+
+    Error payloads render as a single JSON line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return json.dumps(data).encode() + b"\n"
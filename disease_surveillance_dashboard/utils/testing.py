@@ -0,0 +1,85 @@
+"""
+Query-budget assertions for tests.
+
+``query_budget`` caps the queries a block may run; ``assert_constant_queries``
+checks that a view's query count does not grow with the number of rows it
+shows, which is what catches N+1 patterns regardless of the fixture size.
+Both work in ``TestCase`` classes and plain pytest tests (see the
+``query_budget`` fixture in conftest.py).
+"""
+
+from collections.abc import Callable
+from contextlib import ContextDecorator
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+
+def _format(queries) -> str:
+    return "\n".join(
+        f"{number}. {query['sql']}" for number, query in enumerate(queries, start=1)
+    )
+
+
+class query_budget(ContextDecorator):  # noqa: N801
+    """
+    Fail if the block (or decorated function) runs more than ``limit`` queries.
+
+    Usage::
+
+        with query_budget(4):
+            client.get("/api/v1/roles/")
+    """
+
+    def __init__(self, limit: int, using: str = DEFAULT_DB_ALIAS):
+        self.limit = limit
+        self.using = using
+
+    def __enter__(self) -> CaptureQueriesContext:
+        self.context = CaptureQueriesContext(connections[self.using])
+        return self.context.__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.context.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None and len(self.context) > self.limit:
+            msg = (
+                f"{len(self.context)} queries executed, budget is {self.limit}:\n"
+                f"{_format(self.context.captured_queries)}"
+            )
+            raise AssertionError(msg)
+
+
+def count_queries(call: Callable[[], object], using: str = DEFAULT_DB_ALIAS) -> list:
+    """Run ``call`` and return the queries it executed."""
+    with CaptureQueriesContext(connections[using]) as context:
+        call()
+    return context.captured_queries
+
+
+def assert_constant_queries(
+    call: Callable[[], object],
+    grow: Callable[[], object],
+    budget: int | None = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> int:
+    """
+    Assert that ``call`` runs as many queries after ``grow`` adds rows.
+
+    ``call`` is typically a list request and ``grow`` creates more of the
+    listed rows (and their relations). Optionally also caps the count at
+    ``budget``. Returns the query count.
+    """
+    before = count_queries(call, using)
+    grow()
+    after = count_queries(call, using)
+    if len(after) != len(before):
+        msg = (
+            f"Query count grew with the rows, {len(before)} -> {len(after)}:\n"
+            f"{_format(after)}"
+        )
+        raise AssertionError(msg)
+    if budget is not None and len(after) > budget:
+        msg = f"{len(after)} queries executed, budget is {budget}:\n{_format(after)}"
+        raise AssertionError(msg)
+    return len(after)
@@ -10,6 +10,8 @@ class DiseaseAdmin(admin.ModelAdmin):
 
 @admin.register(Location)
 class LocationAdmin(admin.ModelAdmin):
-    list_display = ('district_name', 'area_name', 'is_active')
+    list_display = ('district_name', 'area_name', 'level', 'parent', 'is_active')
     search_fields = ('district_name', 'area_name')
-    list_filter = ('is_active',)
\ No newline at end of file
+    list_filter = ('level', 'is_active')
+    list_select_related = ('parent',)
+    raw_id_fields = ('parent',)
\ No newline at end of file
@@ -0,0 +1,249 @@
+import codecs
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.db import connection, transaction
+
+from disease_surveillance_dashboard.sync.changes import record_changes
+from disease_surveillance_dashboard.utils.cache import bump_table_version
+
+from .hierarchy import sync_hierarchy
+from .models import Disease, Location
+
+CSV = 'csv'
+NDJSON = 'ndjson'
+FORMATS_BY_EXTENSION = {'.csv': CSV, '.ndjson': NDJSON, '.jsonl': NDJSON}
+
+LOCATION_FIELDS = (
+    'district_name', 'area_name', 'latitude', 'longitude', 'population', 'is_active',
+)
+NAME_MAX_LENGTH = 255
+POPULATION_MAX = 2**31 - 1
+COORDINATE_PLACES = Decimal('0.000001')
+TRUE_VALUES = {'1', 't', 'true', 'y', 'yes'}
+FALSE_VALUES = {'0', 'f', 'false', 'n', 'no'}
+
+# Staging rows keep their source line so duplicates resolve to the last one.
+STAGING_SQL = '''
+    CREATE TEMPORARY TABLE location_import (
+        line integer NOT NULL,
+        district_name varchar(255) NOT NULL,
+        area_name varchar(255),
+        latitude numeric(9, 6),
+        longitude numeric(9, 6),
+        population integer,
+        is_active boolean NOT NULL
+    ) ON COMMIT DROP
+'''
+COPY_SQL = (
+    'COPY location_import '
+    '(line, district_name, area_name, latitude, longitude, population, is_active) '
+    'FROM STDIN'
+)
+LOCATION_MERGE_SQL = '''
+    WITH source AS (
+        SELECT DISTINCT ON (district_name, area_name)
+               district_name, area_name, latitude, longitude, population, is_active
+          FROM location_import
+         ORDER BY district_name, area_name, line DESC
+    ), merged AS (
+        INSERT INTO locations
+               (level, path, district_name, area_name,
+                latitude, longitude, population, is_active, created_at)
+        SELECT CASE WHEN area_name IS NULL THEN 'district' ELSE 'area' END, '',
+               district_name, area_name, latitude, longitude, population, is_active, now()
+          FROM source
+        ON CONFLICT (level, district_name, area_name) DO UPDATE
+           SET latitude = EXCLUDED.latitude,
+               longitude = EXCLUDED.longitude,
+               population = EXCLUDED.population,
+               is_active = EXCLUDED.is_active
+         WHERE (locations.latitude, locations.longitude,
+                locations.population, locations.is_active)
+               IS DISTINCT FROM
+               (EXCLUDED.latitude, EXCLUDED.longitude,
+                EXCLUDED.population, EXCLUDED.is_active)
+        RETURNING id, xmax = 0 AS inserted
+    )
+    SELECT (SELECT count(*) FROM source),
+           count(*) FILTER (WHERE inserted),
+           count(*) FILTER (WHERE NOT inserted),
+           coalesce(array_agg(id), '{}')
+      FROM merged
+'''
+
+DISEASE_UPSERT_SQL = '''
+    WITH merged AS (
+        INSERT INTO diseases (disease_name, is_active, created_at)
+        SELECT name, active, now()
+          FROM unnest(%s::varchar[], %s::boolean[]) AS source (name, active)
+        ON CONFLICT (disease_name) DO UPDATE
+           SET is_active = EXCLUDED.is_active
+         WHERE diseases.is_active IS DISTINCT FROM EXCLUDED.is_active
+        RETURNING id, xmax = 0 AS inserted
+    )
+    SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted),
+           coalesce(array_agg(id), '{}')
+      FROM merged
+'''
+
+
+def format_for_filename(name):
+    for extension, fmt in FORMATS_BY_EXTENSION.items():
+        if name.lower().endswith(extension):
+            return fmt
+    return None
+
+
+def iter_records(stream, fmt):
+    """Yield ``(line_number, record)`` pairs from a byte stream.
+
+    ``record`` is ``None`` when an NDJSON line is not valid JSON.
+    """
+    lines = codecs.iterdecode(stream, 'utf-8-sig')
+    if fmt == CSV:
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+def _name(value, required):
+    value = '' if value is None else str(value).strip()
+    if not value:
+        if required:
+            raise ValueError('This field is required.')
+        return None
+    if len(value) > NAME_MAX_LENGTH:
+        raise ValueError(f'Ensure this field has no more than {NAME_MAX_LENGTH} characters.')
+    return value
+
+
+def _coordinate(value, limit):
+    if value is None or value == '':
+        return None
+    try:
+        number = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError('A valid number is required.') from None
+    if not number.is_finite() or abs(number) > limit:
+        raise ValueError(f'Ensure this value is between -{limit} and {limit}.')
+    return number.quantize(COORDINATE_PLACES)
+
+
+def _population(value):
+    if value is None or value == '':
+        return None
+    try:
+        number = int(str(value).strip())
+    except ValueError:
+        raise ValueError('A valid integer is required.') from None
+    if not 0 <= number <= POPULATION_MAX:
+        raise ValueError(f'Ensure this value is between 0 and {POPULATION_MAX}.')
+    return number
+
+
+def _boolean(value):
+    if value is None or value == '':
+        return True
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError('Must be a valid boolean.')
+
+
+def clean_location(record):
+    """Return ``(values, errors)`` for one raw record, in LOCATION_FIELDS order."""
+    if not isinstance(record, dict):
+        return None, {'non_field_errors': ['Expected an object.']}
+    cleaners = {
+        'district_name': lambda v: _name(v, required=True),
+        'area_name': lambda v: _name(v, required=False),
+        'latitude': lambda v: _coordinate(v, 90),
+        'longitude': lambda v: _coordinate(v, 180),
+        'population': _population,
+        'is_active': _boolean,
+    }
+    values, errors = [], {}
+    for field in LOCATION_FIELDS:
+        try:
+            values.append(cleaners[field](record.get(field)))
+        except ValueError as exc:
+            errors[field] = [str(exc)]
+    if errors:
+        return None, errors
+    return tuple(values), None
+
+
+def import_locations(records, max_errors=1000):
+    """Upsert locations on (district_name, area_name) in one transaction.
+
+    Valid rows are streamed into a temporary table with COPY and merged with
+    a single INSERT ... ON CONFLICT; invalid rows are skipped and reported
+    with their line number (the first ``max_errors`` of them). New rows are
+    then placed in the hierarchy, creating missing district rows.
+    """
+    report = {
+        'received': 0,
+        'valid': 0,
+        'created': 0,
+        'updated': 0,
+        'unchanged': 0,
+        'error_count': 0,
+        'errors': [],
+    }
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(STAGING_SQL)
+        with cursor.copy(COPY_SQL) as copy:
+            for line, record in records:
+                report['received'] += 1
+                values, errors = clean_location(record)
+                if errors:
+                    report['error_count'] += 1
+                    if len(report['errors']) < max_errors:
+                        report['errors'].append({'line': line, 'errors': errors})
+                    continue
+                report['valid'] += 1
+                copy.write_row((line, *values))
+        cursor.execute(LOCATION_MERGE_SQL)
+        distinct, report['created'], report['updated'], merged = cursor.fetchone()
+        report['unchanged'] = distinct - report['created'] - report['updated']
+        placed = sync_hierarchy()
+        # Bulk writes skip model signals, so log changes and invalidate
+        # caches by hand.
+        record_changes(Location, placed.union(merged))
+        bump_table_version(Location)
+        transaction.on_commit(lambda: bump_table_version(Location))
+    return report
+
+
+def upsert_diseases(rows):
+    """Create or update diseases keyed on ``disease_name`` in one statement.
+
+    ``rows`` are validated dicts; when a name repeats, the last row wins.
+    """
+    desired = {row['disease_name']: row['is_active'] for row in rows}
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(DISEASE_UPSERT_SQL, [list(desired), list(desired.values())])
+        created, updated, merged = cursor.fetchone()
+        record_changes(Disease, merged)
+        bump_table_version(Disease)
+        transaction.on_commit(lambda: bump_table_version(Disease))
+    return {
+        'received': len(rows),
+        'created': created,
+        'updated': updated,
+        'unchanged': len(desired) - created - updated,
+    }
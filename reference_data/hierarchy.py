@@ -0,0 +1,101 @@
+from django.db import connections
+from django.db.models import Q
+
+from .models import Location
+
+# Rows written without Location.save() (bulk imports, the migration) have an
+# empty path until sync_hierarchy places them; a blank level is derived from
+# area_name on the way. Each statement writes a row at most once, which
+# matters when deriving the hierarchy of a whole table.
+
+# Areas whose district has no row of its own get one. District rows may not
+# have their level yet.
+DISTRICT_SQL = '''
+    INSERT INTO locations (level, path, district_name, is_active, created_at)
+    SELECT DISTINCT 'district', '', district_name, true, now()
+      FROM locations AS area
+     WHERE path = '' AND parent_id IS NULL
+       AND area_name IS NOT NULL AND level IN ('', 'area')
+       AND NOT EXISTS (
+           SELECT FROM locations AS district
+            WHERE district.level IN ('', 'district')
+              AND district.district_name = area.district_name
+              AND district.area_name IS NULL
+       )
+    ON CONFLICT (level, district_name, area_name) DO NOTHING
+'''
+ROOT_SQL = '''
+    UPDATE locations
+       SET level = coalesce(nullif(level, ''), 'district'), path = id || '/'
+     WHERE path = '' AND parent_id IS NULL
+       AND NOT (area_name IS NOT NULL AND level IN ('', 'area'))
+    RETURNING id
+'''
+ATTACH_SQL = '''
+    UPDATE locations AS area
+       SET parent_id = district.id,
+           level = 'area',
+           path = CASE WHEN district.path = '' THEN '' ELSE district.path || area.id || '/' END
+      FROM locations AS district
+     WHERE area.path = '' AND area.parent_id IS NULL
+       AND area.area_name IS NOT NULL AND area.level IN ('', 'area')
+       AND district.level IN ('', 'district')
+       AND district.district_name = area.district_name
+       AND district.area_name IS NULL
+    RETURNING area.id
+'''
+# One level per run, top down, until nothing is left to place.
+CHILD_SQL = '''
+    UPDATE locations AS child
+       SET level = coalesce(
+               nullif(child.level, ''),
+               CASE WHEN child.area_name IS NULL THEN 'district' ELSE 'area' END
+           ),
+           path = parent.path || child.id || '/'
+      FROM locations AS parent
+     WHERE child.path = '' AND child.parent_id = parent.id AND parent.path <> ''
+    RETURNING child.id
+'''
+
+
+def sync_hierarchy(using='default'):
+    """Place rows that have no path yet; returns the ids of the rows placed.
+
+    Missing levels are derived from ``area_name``, areas are attached to
+    their district row (created when missing) and paths are filled in from
+    the roots down. Set-based, so it also derives the hierarchy of a whole
+    existing table.
+    """
+    placed = set()
+    with connections[using].cursor() as cursor:
+        cursor.execute(DISTRICT_SQL)
+        for sql in (ROOT_SQL, ATTACH_SQL):
+            cursor.execute(sql)
+            placed.update(pk for pk, in cursor.fetchall())
+        while True:
+            cursor.execute(CHILD_SQL)
+            if not cursor.rowcount:
+                return placed
+            placed.update(pk for pk, in cursor.fetchall())
+
+
+def subtree_q(ids, prefix=''):
+    """Q matching the locations ``ids`` and everything under them.
+
+    ``prefix`` points the lookups through a relation, e.g. ``'location__'``.
+    """
+    paths = Location.objects.filter(pk__in=ids).values_list('pk', 'path')
+    return paths_q(paths, prefix, ids)
+
+
+def paths_q(locations, prefix='', ids=()):
+    """Q matching the subtrees of ``(id, path)`` pairs and the rows ``ids``.
+
+    Rows not placed yet (empty path) match only themselves.
+    """
+    ids = {*ids, *(pk for pk, _ in locations)}
+    q = Q(**{f'{prefix}pk__in': ids})
+    for _, path in locations:
+        if path:
+            q |= Q(**{f'{prefix}path__startswith': path})
+    return q
@@ -0,0 +1,43 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reference_data.bulk import CSV, NDJSON, format_for_filename, import_locations, iter_records
+
+
+class Command(BaseCommand):
+    help = 'Upsert locations from a CSV or NDJSON file, keyed on (district_name, area_name).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or - for standard input.')
+        parser.add_argument('--format', choices=[CSV, NDJSON], help='Defaults to the file extension.')
+        parser.add_argument('--max-errors', type=int, default=50, help='Row errors to print.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or format_for_filename(path)
+        if fmt is None:
+            raise CommandError('Cannot tell the file format from its name; pass --format.')
+
+        try:
+            if path == '-':
+                report = self._import(sys.stdin.buffer, fmt, options['max_errors'])
+            else:
+                with open(path, 'rb') as stream:  # noqa: PTH123
+                    report = self._import(stream, fmt, options['max_errors'])
+        except OSError as exc:
+            raise CommandError(exc) from exc
+
+        for error in report['errors']:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            'Imported {valid} of {received} rows: {created} created, {updated} updated, '
+            '{unchanged} unchanged, {error_count} rejected.'.format(**report)
+        ))
+
+    def _import(self, stream, fmt, max_errors):
+        try:
+            return import_locations(iter_records(stream, fmt), max_errors=max_errors)
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise CommandError(f'Could not read input: {exc}') from exc
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.10 on 2026-10-17 18:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reference_data', '0003_rename_locations_district_area_idx_locations_distric_d2cbe7_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='location',
+            name='locations_distric_d2cbe7_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='location',
+            constraint=models.UniqueConstraint(fields=('district_name', 'area_name'), name='unique_location_district_area', nulls_distinct=False),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.10 on 2026-10-17 18:31
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reference_data', '0004_location_natural_key'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.TrigramExtension(),
+        migrations.AddIndex(
+            model_name='disease',
+            index=models.Index(django.db.models.functions.comparison.Collate(django.db.models.functions.text.Upper('disease_name'), 'C'), name='diseases_name_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='disease',
+            index=django.contrib.postgres.indexes.GistIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('disease_name'), name='gist_trgm_ops(siglen=64)'), name='diseases_name_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(django.db.models.functions.comparison.Collate(django.db.models.functions.text.Upper('district_name'), 'C'), name='locations_district_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=django.contrib.postgres.indexes.GistIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('district_name'), name='gist_trgm_ops(siglen=64)'), name='locations_district_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(django.db.models.functions.comparison.Collate(django.db.models.functions.text.Upper('area_name'), 'C'), name='locations_area_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=django.contrib.postgres.indexes.GistIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('area_name'), name='gist_trgm_ops(siglen=64)'), name='locations_area_trgm_idx'),
+        ),
+    ]
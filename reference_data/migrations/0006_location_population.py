@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-17 19:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reference_data', '0005_name_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='location',
+            name='population',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.10 on 2026-10-17 19:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from reference_data.hierarchy import sync_hierarchy
+
+
+def derive_hierarchy(apps, schema_editor):
+    # Existing rows only know district and area names: districts become
+    # roots and areas are attached to them.
+    sync_hierarchy(using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reference_data', '0006_location_population'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='location',
+            name='unique_location_district_area',
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='level',
+            field=models.CharField(blank=True, choices=[('country', 'Country'), ('region', 'Region'), ('district', 'District'), ('area', 'Area')], default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='children', to='reference_data.location'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(fields=['path'], name='locations_path_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddConstraint(
+            model_name='location',
+            constraint=models.UniqueConstraint(fields=('level', 'district_name', 'area_name'), name='unique_location_level_name', nulls_distinct=False),
+        ),
+        migrations.RunPython(derive_hierarchy, migrations.RunPython.noop),
+    ]
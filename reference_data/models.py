@@ -1,4 +1,28 @@
-from django.db import models
+from django.contrib.postgres.indexes import GistIndex, OpClass
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Value
+from django.db.models.functions import Concat, Substr
+from django.db.models.functions import Collate, Upper
+
+from disease_surveillance_dashboard.sync.changes import record_queryset
+
+# A wider signature than the 12-byte default keeps the GiST tree selective
+# when many names share trigrams ("District 1", "District 2", ...).
+TRIGRAM_OPCLASS = 'gist_trgm_ops(siglen=64)'
+
+
+def name_search_indexes(prefix, field):
+    """Indexes behind reference_data.search for one name column.
+
+    A C-collated btree on UPPER(name) serves prefix range scans in name
+    order; a trigram GiST on UPPER(name) serves nearest-match ordering.
+    """
+    return [
+        models.Index(Collate(Upper(field), 'C'), name=f'{prefix}_prefix_idx'),
+        GistIndex(OpClass(Upper(field), name=TRIGRAM_OPCLASS), name=f'{prefix}_trgm_idx'),
+    ]
+
 
 class Disease(models.Model):
     disease_name = models.CharField(max_length=255, unique=True)
@@ -9,26 +33,121 @@ class Disease(models.Model):
         db_table = 'diseases'
         indexes = [
             models.Index(fields=['disease_name']),
+            *name_search_indexes('diseases_name', 'disease_name'),
         ]
 
     def __str__(self):
         return self.disease_name
 
 class Location(models.Model):
+    """A node of the country > region > district > area hierarchy.
+
+    Rows above district level keep their name in ``district_name``. ``path``
+    is the materialized path of ids from the root down to the row itself
+    ("3/17/1042/"), so a subtree is one indexed prefix scan on ``path``.
+    """
+
+    class Level(models.TextChoices):
+        # In hierarchy order, root first.
+        COUNTRY = 'country', 'Country'
+        REGION = 'region', 'Region'
+        DISTRICT = 'district', 'District'
+        AREA = 'area', 'Area'
+
+    parent = models.ForeignKey(
+        'self', on_delete=models.PROTECT, null=True, blank=True, related_name='children',
+    )
+    # Derived from area_name when left blank.
+    level = models.CharField(max_length=10, choices=Level.choices, blank=True, default='')
+    path = models.CharField(max_length=255, default='', editable=False)
     district_name = models.CharField(max_length=255)
     area_name = models.CharField(max_length=255, null=True, blank=True)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    # Residents, for incidence rates. Record it on a row or on its children;
+    # a row's own population takes precedence.
+    population = models.PositiveIntegerField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = 'locations'
+        constraints = [
+            # Natural key used by bulk imports; an area-less row is the
+            # district (or region, country) itself, so NULL area names must
+            # collide too.
+            models.UniqueConstraint(
+                fields=['level', 'district_name', 'area_name'],
+                name='unique_location_level_name',
+                nulls_distinct=False,
+            ),
+        ]
         indexes = [
-            models.Index(fields=['district_name', 'area_name']),
+            # Pattern ops so LIKE 'prefix%' can use the index.
+            models.Index(fields=['path'], name='locations_path_idx', opclasses=['varchar_pattern_ops']),
+            *name_search_indexes('locations_district', 'district_name'),
+            *name_search_indexes('locations_area', 'area_name'),
         ]
 
     def __str__(self):
         if self.area_name:
             return f"{self.district_name} - {self.area_name}"
-        return self.district_name
\ No newline at end of file
+        return self.district_name
+
+    @property
+    def name(self):
+        return self.area_name or self.district_name
+
+    def clean(self):
+        error = parent_error(self.level or self.derived_level(), self.parent, self.path)
+        if error:
+            raise ValidationError({'parent': error})
+
+    def derived_level(self):
+        return self.Level.AREA if self.area_name else self.Level.DISTRICT
+
+    def save(self, *args, **kwargs):
+        if not self.level:
+            self.level = self.derived_level()
+        if self.parent_id is None and self.level == self.Level.AREA:
+            self.parent = Location.objects.filter(
+                level=self.Level.DISTRICT, district_name=self.district_name, area_name=None,
+            ).first()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._place()
+
+    def _place(self):
+        """Store the path and carry descendants along when it changed."""
+        old = Location.objects.filter(pk=self.pk).values_list('path', flat=True).get()
+        self.path = f'{self.parent.path if self.parent_id else ""}{self.pk}/'
+        if old == self.path:
+            return
+        if old:
+            Location.objects.filter(path__startswith=old).update(
+                path=Concat(Value(self.path), Substr('path', len(old) + 1), output_field=models.CharField()),
+            )
+        else:
+            Location.objects.filter(pk=self.pk).update(path=self.path)
+        if self.level == self.Level.DISTRICT:
+            # Adopt areas saved before their district row existed.
+            Location.objects.filter(
+                level=self.Level.AREA, district_name=self.district_name, parent=None,
+            ).update(parent=self, path=Concat(Value(self.path), 'id', Value('/'), output_field=models.CharField()),
+            )
+        if old or self.level == self.Level.DISTRICT:
+            # Rows moved or adopted above skip the signals logging changes
+            # for offline sync.
+            record_queryset(Location.objects.filter(path__startswith=self.path))
+
+
+def parent_error(level, parent, path=''):
+    """Why ``parent`` cannot hold a ``level`` row at ``path``, or None."""
+    if parent is None:
+        return None
+    levels = list(Location.Level)
+    if levels.index(parent.level) >= levels.index(level):
+        return f'A {parent.get_level_display().lower()} cannot contain a {level}.'
+    if path and parent.path.startswith(path):
+        return 'A location cannot be moved under itself.'
+    return None
@@ -0,0 +1,64 @@
+from django.db.models import FloatField, Func, Value
+from django.db.models.functions import Collate, Upper
+
+MIN_SCORE = 0.3
+
+
+class WordDistance(Func):
+    """``name <->> term``: pg_trgm word distance with the column on the left.
+
+    Django's TrigramWordDistance puts the term first (``term <<-> name``),
+    which the GiST index cannot order by.
+    """
+
+    arg_joiner = ' <->> '
+    template = '(%(expressions)s)'
+    output_field = FloatField()
+
+
+def _successor(term):
+    return term[:-1] + chr(ord(term[-1]) + 1)
+
+
+def autocomplete(queryset, fields, term, limit):
+    """Return up to ``limit`` rows of ``fields`` that start with, or resemble, ``term``.
+
+    Every query is an index scan stopped by LIMIT, so the cost does not grow
+    with the number of matching rows: prefix matches come from a range scan
+    of the C-collated UPPER(name) btree, and when those run short the
+    nearest names by trigram word distance come from the GiST index. Prefix
+    matches rank first, alphabetically; fuzzy ones follow by score.
+    """
+    term = term.upper()
+    columns = ['id', *fields]
+    prefixed, fuzzy = {}, {}
+    for field in fields:
+        key = Collate(Upper(field), 'C')
+        rows = (
+            queryset.alias(key=key)
+            .filter(key__gte=term, key__lt=_successor(term))
+            .annotate(score=1 - WordDistance(Upper(field), Value(term)))
+            .order_by('key')
+            .values(*columns, 'score')[:limit]
+        )
+        for row in rows:
+            prefixed.setdefault(row['id'], (row[field].upper(), row))
+    results = [row for _, row in sorted(prefixed.values(), key=lambda item: item[0])][:limit]
+
+    if len(results) < limit:
+        for field in fields:
+            distance = WordDistance(Upper(field), Value(term))
+            rows = (
+                queryset.annotate(distance=distance, score=1 - distance)
+                .order_by('distance')
+                .values(*columns, 'score')[:limit]
+            )
+            for row in rows:
+                # NULL names (area-less rows) sort last and have no score.
+                if row['id'] in prefixed or row['score'] is None or row['score'] < MIN_SCORE:
+                    continue
+                if row['id'] not in fuzzy or fuzzy[row['id']]['score'] < row['score']:
+                    fuzzy[row['id']] = row
+        ranked = sorted(fuzzy.values(), key=lambda row: (-row['score'], *(row[f] or '' for f in fields)))
+        results += ranked[:limit - len(results)]
+    return results
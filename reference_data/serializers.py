@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Disease, Location
+from .models import Disease, Location, parent_error
 
 class DiseaseSerializer(serializers.ModelSerializer):
     class Meta:
@@ -10,4 +10,35 @@ class DiseaseSerializer(serializers.ModelSerializer):
 class LocationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Location
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+        read_only_fields = ('path',)
+
+    def validate(self, attrs):
+        def current(field, default=None):
+            return attrs.get(field, getattr(self.instance, field, default))
+
+        level = current('level') or Location(area_name=current('area_name')).derived_level()
+        error = parent_error(level, current('parent'), current('path', ''))
+        if error:
+            raise serializers.ValidationError({'parent': error})
+        return attrs
+
+
+class DiseaseUpsertSerializer(serializers.Serializer):
+    # Plain serializer: the model's unique validator would reject updates.
+    disease_name = serializers.CharField(max_length=255)
+    is_active = serializers.BooleanField(default=True)
+
+
+
+class NearbyQuerySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lon = serializers.FloatField(min_value=-180, max_value=180)
+    radius_km = serializers.FloatField(min_value=0, max_value=500, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(min_length=2, max_length=100)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
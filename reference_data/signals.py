@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from disease_surveillance_dashboard.utils.cache import bump_table_version
+
+from .models import Disease, Location
+
+
+@receiver([post_save, post_delete], sender=Disease)
+@receiver([post_save, post_delete], sender=Location)
+def bump_reference_version(sender, **kwargs):
+    # Bump now so this request sees its own write, and again after commit so
+    # a concurrent reader cannot keep the pre-commit rows cached.
+    bump_table_version(sender)
+    transaction.on_commit(lambda: bump_table_version(sender))
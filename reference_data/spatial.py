@@ -0,0 +1,122 @@
+import math
+import threading
+from array import array
+from collections import defaultdict
+
+from disease_surveillance_dashboard.utils.cache import table_version
+
+from .models import Location
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class LocationGrid:
+    """Fixed-size latitude/longitude buckets of location points.
+
+    A query only looks at the buckets its search area overlaps, so cost
+    depends on the density around the point, not on the total row count.
+    """
+
+    def __init__(self, points, cell_degrees=0.05):
+        self.cell_degrees = cell_degrees
+        self.cells = defaultdict(lambda: (array('q'), array('d'), array('d')))
+        for pk, lat, lon in points:
+            ids, lats, lons = self.cells[self._cell(lat, lon)]
+            ids.append(pk)
+            lats.append(lat)
+            lons.append(lon)
+        self.cells = dict(self.cells)
+        self.size = sum(len(ids) for ids, _, _ in self.cells.values())
+        rows = [row for row, _ in self.cells] or [0]
+        cols = [col for _, col in self.cells] or [0]
+        self._bounds = (min(rows), max(rows), min(cols), max(cols))
+
+    def _cell(self, lat, lon):
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+
+    def _scan(self, lat, lon, cells):
+        for cell in cells:
+            bucket = self.cells.get(cell)
+            if bucket is None:
+                continue
+            for pk, p_lat, p_lon in zip(*bucket, strict=True):
+                yield haversine_km(lat, lon, p_lat, p_lon), pk
+
+    def within(self, lat, lon, radius_km):
+        """Return ``(distance_km, id)`` pairs within ``radius_km``, nearest first."""
+        lat_span = radius_km / KM_PER_DEGREE
+        lon_span = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+        lon_span = min(lon_span, 180.0)
+        row_lo, col_lo = self._cell(lat - lat_span, lon - lon_span)
+        row_hi, col_hi = self._cell(lat + lat_span, lon + lon_span)
+        min_row, max_row, min_col, max_col = self._bounds
+        cells = (
+            (row, col)
+            for row in range(max(row_lo, min_row), min(row_hi, max_row) + 1)
+            for col in range(max(col_lo, min_col), min(col_hi, max_col) + 1)
+        )
+        return sorted(hit for hit in self._scan(lat, lon, cells) if hit[0] <= radius_km)
+
+    def _ring_clearance_km(self, lat, ring):
+        """Lower bound on the distance to any point outside rings ``0..ring``."""
+        span = math.radians(ring * self.cell_degrees)
+        # Distance to the nearest parallel, and to the nearest meridian
+        # great circle, whichever is closer.
+        along_lat = EARTH_RADIUS_KM * span
+        reach = math.cos(math.radians(lat)) * math.sin(min(span, math.pi / 2))
+        along_lon = EARTH_RADIUS_KM * math.asin(min(1.0, reach))
+        return min(along_lat, along_lon)
+
+    def nearest(self, lat, lon, k):
+        """Return the ``k`` nearest ``(distance_km, id)`` pairs, nearest first."""
+        row0, col0 = self._cell(lat, lon)
+        min_row, max_row, min_col, max_col = self._bounds
+        max_ring = max(abs(row0 - min_row), abs(row0 - max_row), abs(col0 - min_col), abs(col0 - max_col))
+        hits = []
+        for ring in range(max_ring + 1):
+            if ring == 0:
+                cells = [(row0, col0)]
+            else:
+                cells = [
+                    (row0 + dr, col0 + dc)
+                    for dr in range(-ring, ring + 1)
+                    for dc in range(-ring, ring + 1)
+                    if max(abs(dr), abs(dc)) == ring
+                ]
+            hits.extend(self._scan(lat, lon, cells))
+            if len(hits) >= k:
+                hits.sort()
+                del hits[k:]
+                if hits[-1][0] <= self._ring_clearance_km(lat, ring):
+                    break
+        hits.sort()
+        return hits[:k]
+
+
+_grid_lock = threading.Lock()
+_grid = (None, None)
+
+
+def location_grid():
+    """Return this worker's grid of active located rows, rebuilt after writes."""
+    global _grid  # noqa: PLW0603
+    version = table_version(Location)
+    with _grid_lock:
+        if _grid[0] != version:
+            points = (
+                Location.objects.filter(is_active=True, latitude__isnull=False, longitude__isnull=False)
+                .values_list('id', 'latitude', 'longitude')
+                .iterator(chunk_size=10000)
+            )
+            _grid = (version, LocationGrid((pk, float(lat), float(lon)) for pk, lat, lon in points))
+        return _grid[1]
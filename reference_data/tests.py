@@ -1,10 +1,27 @@
+import random
+import tempfile
+from io import StringIO
+from pathlib import Path
+
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APIClient, APITestCase
-
-from reference_data.models import Disease, Location
-
+from rest_framework.test import APIClient
+from rest_framework.test import APITestCase
+
+from disease_surveillance_dashboard.utils.testing import assert_constant_queries
+from reference_data.cache import disease_cache
+from reference_data.hierarchy import subtree_q
+from reference_data.hierarchy import sync_hierarchy
+from reference_data.models import Disease
+from reference_data.models import Location
+from reference_data.spatial import LocationGrid
+from reference_data.spatial import haversine_km
 
 User = get_user_model()
 
@@ -252,4 +269,435 @@ class DiseaseTests(APITestCase):
 
         # Second create with same unique values should fail
         r2 = self.client.post(self.list_url, payload, format="json")
-        self.assertIn(r2.status_code, (status.HTTP_400_BAD_REQUEST, status.HTTP_409_CONFLICT))
\ No newline at end of file
+        self.assertIn(r2.status_code, (status.HTTP_400_BAD_REQUEST, status.HTTP_409_CONFLICT))
+
+class ReferenceCacheTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="cache_tester@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.list_url = reverse("api:disease-list")
+
+        disease_cache.invalidate()
+        disease_cache.reset_stats()
+        self.disease = Disease.objects.create(disease_name="Cholera")
+
+    def _disease_queries(self, url, **extra):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, **extra)
+        return response, [q for q in ctx.captured_queries if '"diseases"' in q["sql"]]
+
+    def test_list_served_from_cache_after_warm_up(self):
+        _, cold = self._disease_queries(self.list_url)
+        response, warm = self._disease_queries(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(cold)
+        self.assertEqual(warm, [])
+        self.assertEqual(response.data["results"][0]["disease_name"], "Cholera")
+
+    def test_detail_served_from_cache_after_warm_up(self):
+        url = reverse("api:disease-detail", args=[self.disease.pk])
+        self._disease_queries(url)
+        response, warm = self._disease_queries(url)
+        self.assertEqual(warm, [])
+        self.assertEqual(response.data["disease_name"], "Cholera")
+
+    def test_save_and_delete_invalidate(self):
+        self.client.get(self.list_url)
+        Disease.objects.create(disease_name="Measles")
+        response = self.client.get(self.list_url)
+        self.assertEqual(len(response.data["results"]), 2)
+
+        self.disease.delete()
+        response = self.client.get(self.list_url)
+        self.assertEqual([d["disease_name"] for d in response.data["results"]], ["Measles"])
+
+    def test_stats_count_hits_and_misses(self):
+        self.client.get(self.list_url)
+        self.client.get(self.list_url)
+        stats = disease_cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["local_hits"], 1)
+
+    def test_stats_endpoint_requires_admin(self):
+        url = reverse("api:disease-cache-stats")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("local_hits", response.data)
+
+    def test_conditional_get_skips_cache_and_database(self):
+        etag = self.client.get(self.list_url).headers["ETag"]
+        disease_cache.reset_stats()
+        response, queries = self._disease_queries(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(queries, [])
+        self.assertEqual(disease_cache.stats()["local_hits"], 0)
+
+
+class LocationPaginationTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="pager@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.list_url = reverse("api:location-list")
+        Location.objects.bulk_create(
+            Location(district_name="Accra Metro", area_name=f"Area {i}") for i in range(5)
+        )
+
+    def test_cursor_pages_cover_every_row_once(self):
+        seen = []
+        url = f"{self.list_url}?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen.extend(row["id"] for row in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(seen, sorted(Location.objects.values_list("id", flat=True)))
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(f"{self.list_url}?page_size=100000")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 5)
+
+
+class LocationBulkImportTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="importer@example.com",
+            password="testpass123",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("api:location-bulk")
+        Location.objects.create(district_name="Ga East", area_name="Abokobi", latitude="5.7", longitude="-0.2")
+        Location.objects.create(district_name="Ga West", area_name="Amasaman")
+
+    def test_csv_upsert_reports_counts(self):
+        body = (
+            "district_name,area_name,latitude,longitude,is_active\n"
+            "Ga East,Abokobi,5.700000,-0.200000,true\n"
+            "Ga West,Amasaman,5.7,-0.3,true\n"
+            "Tema,Ashaiman,5.69,-0.03,\n"
+            "Tema,,,,\n"
+        )
+        response = self.client.post(self.url, data=body, content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {k: response.data[k] for k in ("received", "created", "updated", "unchanged")},
+            {"received": 4, "created": 2, "updated": 1, "unchanged": 1},
+        )
+        self.assertEqual(Location.objects.count(), 4)
+        self.assertTrue(Location.objects.filter(district_name="Tema", area_name__isnull=True).exists())
+        self.assertEqual(
+            str(Location.objects.get(area_name="Amasaman").longitude),
+            "-0.300000",
+        )
+
+    def test_ndjson_reports_row_errors_and_keeps_last_duplicate(self):
+        body = "\n".join([
+            '{"district_name": "Tema", "area_name": "Community 1", "latitude": 5.6}',
+            '{"district_name": "", "area_name": "Nowhere"}',
+            "not json",
+            '{"district_name": "Tema", "area_name": "Community 1", "latitude": 95}',
+            '{"district_name": "Tema", "area_name": "Community 1", "latitude": 5.65}',
+        ])
+        response = self.client.post(self.url, data=body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["error_count"], 3)
+        self.assertEqual([e["line"] for e in response.data["errors"]], [2, 3, 4])
+        self.assertIn("district_name", response.data["errors"][0]["errors"])
+        self.assertIn("latitude", response.data["errors"][2]["errors"])
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(str(Location.objects.get(area_name="Community 1").latitude), "5.650000")
+
+    def test_imports_population(self):
+        body = "district_name,area_name,population\nGa East,Abokobi,52000\nTema,,-5\n"
+        response = self.client.post(self.url, data=body, content_type="text/csv")
+        self.assertEqual(response.data["updated"], 1)
+        self.assertIn("population", response.data["errors"][0]["errors"])
+        self.assertEqual(Location.objects.get(area_name="Abokobi").population, 52000)
+
+    def test_multipart_upload(self):
+        upload = SimpleUploadedFile("gazetteer.csv", b"district_name,area_name\nTema,Sakumono\n")
+        response = self.client.post(self.url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 1)
+
+    def test_import_invalidates_location_cache(self):
+        list_url = reverse("api:location-list")
+        self.assertEqual(len(self.client.get(list_url).data["results"]), 2)
+        self.client.post(self.url, data="district_name\nTema\n", content_type="text/csv")
+        self.assertEqual(len(self.client.get(list_url).data["results"]), 3)
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.post(self.url, {"district_name": "Tema"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_requires_staff(self):
+        self.user.is_staff = False
+        self.user.save()
+        response = self.client.post(self.url, data="district_name\nTema\n", content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_management_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as handle:
+            handle.write('{"district_name": "Tema", "area_name": "Sakumono"}\n{"area_name": "x"}\n')
+        out, err = StringIO(), StringIO()
+        try:
+            call_command("import_locations", handle.name, stdout=out, stderr=err)
+        finally:
+            Path(handle.name).unlink()
+        self.assertIn("1 created", out.getvalue())
+        self.assertIn("line 2", err.getvalue())
+
+
+class DiseaseBulkUpsertTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="syncer@example.com",
+            password="testpass123",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("api:disease-bulk")
+        Disease.objects.create(disease_name="Cholera")
+        Disease.objects.create(disease_name="Measles", is_active=False)
+
+    def test_upsert_counts(self):
+        payload = [
+            {"disease_name": "Cholera"},
+            {"disease_name": "Measles", "is_active": True},
+            {"disease_name": "Mpox"},
+            {"disease_name": "Mpox", "is_active": False},
+        ]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {"received": 4, "created": 1, "updated": 1, "unchanged": 1},
+        )
+        self.assertTrue(Disease.objects.get(disease_name="Measles").is_active)
+        self.assertFalse(Disease.objects.get(disease_name="Mpox").is_active)
+
+    def test_repeated_request_is_idempotent(self):
+        payload = [{"disease_name": f"Disease {i}"} for i in range(2000)]
+        first = self.client.post(self.url, payload, format="json")
+        second = self.client.post(self.url, payload, format="json")
+        self.assertEqual(first.data["created"], 2000)
+        self.assertEqual(second.data["unchanged"], 2000)
+        self.assertEqual(Disease.objects.count(), 2002)
+
+    def test_invalid_row_rejects_whole_batch(self):
+        payload = [{"disease_name": "Typhoid"}, {"disease_name": ""}]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("disease_name", response.data[1])
+        self.assertFalse(Disease.objects.filter(disease_name="Typhoid").exists())
+
+    def test_requires_list(self):
+        response = self.client.post(self.url, {"disease_name": "Typhoid"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LocationHierarchyTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="hierarchy@example.com", password="testpass123")
+        self.client.force_authenticate(user=self.user)
+        self.region = Location.objects.create(district_name="Greater Accra", level=Location.Level.REGION)
+        self.tema = Location.objects.create(district_name="Tema", parent=self.region)
+        self.ashaiman = Location.objects.create(district_name="Tema", area_name="Ashaiman")
+
+    def test_paths_and_levels(self):
+        self.assertEqual(self.tema.level, Location.Level.DISTRICT)
+        self.assertEqual(self.ashaiman.level, Location.Level.AREA)
+        self.assertEqual(self.ashaiman.parent, self.tema)
+        self.assertEqual(self.ashaiman.path, f"{self.region.id}/{self.tema.id}/{self.ashaiman.id}/")
+
+    def test_district_adopts_existing_areas(self):
+        abokobi = Location.objects.create(district_name="Ga East", area_name="Abokobi")
+        ga_east = Location.objects.create(district_name="Ga East", parent=self.region)
+        abokobi.refresh_from_db()
+        self.assertEqual(abokobi.parent, ga_east)
+        self.assertEqual(abokobi.path, f"{ga_east.path}{abokobi.id}/")
+
+    def test_move_rewrites_descendant_paths(self):
+        other = Location.objects.create(district_name="Volta", level=Location.Level.REGION)
+        self.tema.parent = other
+        self.tema.save()
+        self.ashaiman.refresh_from_db()
+        self.assertEqual(self.ashaiman.path, f"{other.id}/{self.tema.id}/{self.ashaiman.id}/")
+
+    def test_subtree_is_a_prefix_query(self):
+        Location.objects.create(district_name="Volta", level=Location.Level.REGION)
+        with CaptureQueriesContext(connection) as ctx:
+            ids = set(Location.objects.filter(subtree_q([self.region.id])).values_list("id", flat=True))
+        self.assertEqual(ids, {self.region.id, self.tema.id, self.ashaiman.id})
+        self.assertIn("LIKE", ctx.captured_queries[-1]["sql"])
+
+    def test_sync_derives_hierarchy_from_flat_rows(self):
+        Location.objects.bulk_create([
+            Location(district_name="Ho", area_name="Sokode"),
+            Location(district_name="Ho", area_name="Klefe"),
+            Location(district_name="Keta"),
+        ])
+        sync_hierarchy()
+        ho = Location.objects.get(district_name="Ho", area_name=None)
+        self.assertEqual(ho.level, Location.Level.DISTRICT)
+        self.assertEqual(ho.path, f"{ho.id}/")
+        areas = Location.objects.filter(district_name="Ho", level=Location.Level.AREA)
+        self.assertEqual({(a.parent_id, a.path) for a in areas}, {(ho.id, f"{ho.id}/{a.id}/") for a in areas})
+        self.assertFalse(Location.objects.filter(path="").exists())
+
+    def test_api_rejects_invalid_parent(self):
+        url = reverse("api:location-detail", args=[self.region.id])
+        response = self.client.patch(url, {"parent": self.tema.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("parent", response.data)
+        response = self.client.post(
+            reverse("api:location-list"),
+            {"district_name": "Sakumono", "level": "area", "parent": self.ashaiman.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class QueryBudgetTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(email="budget@example.com", password="testpass123")
+        self.client.force_login(self.admin)
+        self.added = 0
+        self.add_rows()
+
+    def add_rows(self, count=5):
+        for _ in range(count):
+            self.added += 1
+            Disease.objects.create(disease_name=f"Disease {self.added}")
+            district = Location.objects.create(district_name=f"District {self.added}")
+            Location.objects.create(district_name=district.district_name, area_name="Centre")
+
+    def test_list_views(self):
+        for url in (
+            reverse("api:disease-list"),
+            reverse("api:location-list"),
+            reverse("admin:reference_data_disease_changelist"),
+            reverse("admin:reference_data_location_changelist"),
+        ):
+            with self.subTest(url=url):
+                assert_constant_queries(lambda url=url: self.client.get(url), self.add_rows)
+
+
+class LocationGridTests(TestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        points = [(i, rng.uniform(4.5, 6.5), rng.uniform(-1.5, 0.5)) for i in range(3000)]
+        grid = LocationGrid(points)
+        for _ in range(20):
+            lat, lon = rng.uniform(4.0, 7.0), rng.uniform(-2.0, 1.0)
+            expected = sorted((haversine_km(lat, lon, p_lat, p_lon), pk) for pk, p_lat, p_lon in points)
+            self.assertEqual(grid.nearest(lat, lon, 7), expected[:7])
+            self.assertEqual(grid.within(lat, lon, 12.5), [hit for hit in expected if hit[0] <= 12.5])
+
+    def test_empty_grid(self):
+        grid = LocationGrid([])
+        self.assertEqual(grid.nearest(5.6, -0.2, 3), [])
+        self.assertEqual(grid.within(5.6, -0.2, 10), [])
+
+
+class NearbyLocationTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="mapper@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("api:location-nearby")
+        self.osu = Location.objects.create(district_name="Accra Metro", area_name="Osu", latitude="5.556", longitude="-0.182")
+        self.madina = Location.objects.create(district_name="La Nkwantanang", area_name="Madina", latitude="5.683", longitude="-0.167")
+        Location.objects.create(district_name="Tamale", area_name="Central", latitude="9.400", longitude="-0.840")
+        Location.objects.create(district_name="Accra Metro", area_name="Closed", latitude="5.557", longitude="-0.183", is_active=False)
+        Location.objects.create(district_name="Accra Metro", area_name="Unmapped")
+
+    def test_nearest(self):
+        response = self.client.get(self.url, {"lat": 5.56, "lon": -0.18, "limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual([r["id"] for r in results], [self.osu.id, self.madina.id])
+        self.assertLess(results[0]["distance_km"], 1)
+
+    def test_within_radius(self):
+        response = self.client.get(self.url, {"lat": 5.56, "lon": -0.18, "radius_km": 20})
+        self.assertEqual([r["area_name"] for r in response.data["results"]], ["Osu", "Madina"])
+
+    def test_grid_rebuilt_after_write(self):
+        self.client.get(self.url, {"lat": 9.4, "lon": -0.84, "limit": 1})
+        nearer = Location.objects.create(district_name="Tamale", area_name="Market", latitude="9.401", longitude="-0.841")
+        response = self.client.get(self.url, {"lat": 9.401, "lon": -0.841, "limit": 1})
+        self.assertEqual(response.data["results"][0]["id"], nearer.id)
+
+    def test_validates_coordinates(self):
+        response = self.client.get(self.url, {"lat": 91, "lon": 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AutocompleteTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="clerk@example.com",
+            password="testpass123",
+        )
+        self.client.force_authenticate(user=self.user)
+        for district, area in [
+            ("Accra Metropolitan", "Osu"),
+            ("Ablekuma North", "Darkuman"),
+            ("Ga East", "Abokobi"),
+            ("Tema Metropolitan", "Community 1"),
+        ]:
+            Location.objects.create(district_name=district, area_name=area)
+        Location.objects.create(district_name="Accra Old", area_name="Closed", is_active=False)
+        for name in ("Cholera", "Measles", "Meningitis"):
+            Disease.objects.create(disease_name=name)
+
+    def _search(self, name, q, **params):
+        response = self.client.get(reverse(f"api:{name}-autocomplete"), {"q": q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_prefix_is_case_insensitive_and_ranked_first(self):
+        results = self._search("location", "acc")
+        self.assertEqual(results[0]["district_name"], "Accra Metropolitan")
+        self.assertNotIn("Closed", [r["area_name"] for r in results])
+
+    def test_misspelled_district(self):
+        results = self._search("location", "Acrra Metropolitan")
+        self.assertEqual(results[0]["district_name"], "Accra Metropolitan")
+
+    def test_matches_area_name(self):
+        results = self._search("location", "darkum")
+        self.assertEqual([r["area_name"] for r in results][:1], ["Darkuman"])
+
+    def test_disease_names(self):
+        results = self._search("disease", "mea")
+        self.assertEqual(results[0]["disease_name"], "Measles")
+        self.assertEqual(self._search("disease", "colera")[0]["disease_name"], "Cholera")
+
+    def test_limit_and_validation(self):
+        self.assertEqual(len(self._search("disease", "me", limit=1)), 1)
+        response = self.client.get(reverse("api:disease-autocomplete"), {"q": "m"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,12 +1,123 @@
-from rest_framework import viewsets
+import csv
+
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from disease_surveillance_dashboard.access_control.api.mixins import LocationScopedMixin
+from disease_surveillance_dashboard.utils.asyncviews import AsyncReadMixin
+from disease_surveillance_dashboard.utils.mixins import AtomicWriteMixin, CachedReadMixin, ConditionalGetMixin
+from disease_surveillance_dashboard.utils.parsers import CSVStreamParser, NDJSONStreamParser
+
+from .bulk import CSV, NDJSON, format_for_filename, import_locations, iter_records, upsert_diseases
+from .cache import disease_cache, location_cache
 from .models import Disease, Location
-from .serializers import DiseaseSerializer, LocationSerializer
+from .search import autocomplete
+from .serializers import (
+    AutocompleteQuerySerializer,
+    DiseaseSerializer,
+    DiseaseUpsertSerializer,
+    LocationSerializer,
+    NearbyQuerySerializer,
+)
+from .spatial import location_grid
+
+DISEASE_BULK_MAX_ROWS = 10000
+
+
+def _autocomplete_response(request, queryset, fields):
+    query = AutocompleteQuerySerializer(data=request.query_params)
+    query.is_valid(raise_exception=True)
+    matches = autocomplete(queryset, fields, query.validated_data['q'], query.validated_data['limit'])
+    return Response({'results': matches})
+
 
-class DiseaseViewSet(viewsets.ModelViewSet):
+class DiseaseViewSet(AtomicWriteMixin, ConditionalGetMixin, CachedReadMixin, AsyncReadMixin, viewsets.ModelViewSet):
     queryset = Disease.objects.all()
     serializer_class = DiseaseSerializer
+    read_cache = disease_cache
 
+    @action(detail=False, methods=['post'], url_path='bulk', permission_classes=[IsAdminUser])
+    def bulk(self, request):
+        """Idempotently create or update a list of diseases keyed on ``disease_name``."""
+        if not isinstance(request.data, list):
+            raise ParseError('Expected a list of diseases.')
+        if len(request.data) > DISEASE_BULK_MAX_ROWS:
+            raise ParseError(f'At most {DISEASE_BULK_MAX_ROWS} diseases per request.')
+        serializer = DiseaseUpsertSerializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(upsert_diseases(serializer.validated_data))
 
-class LocationViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Active diseases matching the partial or misspelled name ``q``."""
+        return _autocomplete_response(request, Disease.objects.filter(is_active=True), ['disease_name'])
+
+
+class LocationViewSet(AtomicWriteMixin, LocationScopedMixin, ConditionalGetMixin, CachedReadMixin, AsyncReadMixin, viewsets.ModelViewSet):
     queryset = Location.objects.all()
-    serializer_class = LocationSerializer
\ No newline at end of file
+    serializer_class = LocationSerializer
+    read_cache = location_cache
+    scope_field = ''
+
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='bulk',
+        permission_classes=[IsAdminUser],
+        parser_classes=[CSVStreamParser, NDJSONStreamParser, MultiPartParser],
+    )
+    def bulk(self, request):
+        """Upsert locations from a CSV/NDJSON body or a multipart ``file`` upload."""
+        upload = request.FILES.get('file')
+        if upload is not None:
+            stream, fmt = upload, format_for_filename(upload.name)
+        else:
+            stream = request.data
+            fmt = {
+                CSVStreamParser.media_type: CSV,
+                NDJSONStreamParser.media_type: NDJSON,
+            }.get(request.content_type.split(';')[0].strip())
+        if fmt is None or not hasattr(stream, 'read'):
+            raise ParseError('Send a CSV or NDJSON body, or upload a .csv/.ndjson file.')
+
+        try:
+            report = import_locations(iter_records(stream, fmt))
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise ParseError(f'Could not read input: {exc}') from exc
+        return Response(report)
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Active locations whose district or area name matches ``q``."""
+        return _autocomplete_response(
+            request,
+            self.get_queryset().filter(is_active=True),
+            ['district_name', 'area_name'],
+        )
+
+    @action(detail=False, methods=['get'])
+    def nearby(self, request):
+        """Active locations nearest to ``lat``/``lon``, optionally within ``radius_km``."""
+        query = NearbyQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        lat, lon, limit = (query.validated_data[k] for k in ('lat', 'lon', 'limit'))
+        grid = location_grid()
+        if 'radius_km' in query.validated_data:
+            hits = grid.within(lat, lon, query.validated_data['radius_km'])[:limit]
+        else:
+            hits = grid.nearest(lat, lon, limit)
+
+        # The grid spans all locations; out-of-scope hits are dropped here.
+        locations = self.get_queryset().in_bulk([pk for _, pk in hits])
+        results = []
+        for distance, pk in hits:
+            if pk in locations:
+                row = LocationSerializer(locations[pk]).data
+                row['distance_km'] = round(distance, 3)
+                results.append(row)
+        return Response({'results': results})